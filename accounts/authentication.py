@@ -1,9 +1,12 @@
+import time
 import jwt
 from functools import lru_cache
 from django.conf import settings
 from django.contrib.auth.models import User
 from rest_framework import authentication, exceptions
 from jwt import InvalidTokenError, PyJWKClient
+from jwt.exceptions import PyJWKClientConnectionError, PyJWKClientError
+from core import http_client
 from .models import Client
 
 
@@ -11,9 +14,32 @@ def _normalize_url(url: str) -> str:
     return (url or '').rstrip('/')
 
 
+class PooledJWKClient(PyJWKClient):
+    """PyJWKClient that fetches the key set through the shared HTTP session."""
+
+    def fetch_data(self):
+        try:
+            response = http_client.fetch(self.uri, max_bytes=1024 * 1024, headers=self.headers, allow_redirects=False)
+            jwk_set = response.json()
+        except Exception as e:
+            raise PyJWKClientConnectionError(f'Fail to fetch data from the url, err: "{e}"') from e
+
+        # Reject a non-object payload before it reaches the cache, as the
+        # parent does (older PyJWT releases lack _as_jwk_set_payload)
+        if hasattr(PyJWKClient, '_as_jwk_set_payload'):
+            jwk_set = self._as_jwk_set_payload(jwk_set)
+        elif not isinstance(jwk_set, dict):
+            raise PyJWKClientError('The JWKS endpoint did not return a JSON object')
+
+        if self.jwk_set_cache is not None:
+            self.jwk_set_cache.put(jwk_set)
+        self._last_successful_fetch = time.monotonic()
+        return jwk_set
+
+
 @lru_cache(maxsize=1)
 def _get_jwk_client(jwks_url: str) -> PyJWKClient:
-    return PyJWKClient(jwks_url)
+    return PooledJWKClient(jwks_url)
 
 
 def _decode_supabase_jwt(token: str) -> dict:
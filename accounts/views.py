@@ -50,12 +50,12 @@ class UploadProfileImageView(APIView):
         if 'profile_image' not in request.FILES:
             return Response({'error': 'No image provided'}, status=status.HTTP_400_BAD_REQUEST)
 
-        from core.storage_backends import supabase_storage
+        from core.storage_backends import storage
 
         profile_image = request.FILES['profile_image']
 
         try:
-            image_url = supabase_storage.upload_image(
+            image_url = storage.upload_image(
                 profile_image,
                 bucket_name='images',
                 folder='profiles'
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 import environ
 import os
+import sys
 
 # Initialize environment variables
 env = environ.Env(
@@ -108,6 +109,9 @@ NEOSCAPE_API_KEY = env('NeoScape_Api_Key', default='')
 
 
 MIDDLEWARE = [
+    # First, so its timings cover every other middleware
+    'core.middleware.PerformanceMiddleware',
+    'core.profiling.ProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -147,6 +151,7 @@ CORS_ALLOW_HEADERS = list(default_headers) + [
     'content-type',
     'x-csrftoken',
     'x-requested-with',
+    'x-profile',
 ]
 
 CSRF_TRUSTED_ORIGINS = env.list('CSRF_TRUSTED_ORIGINS', default=[
@@ -279,6 +284,86 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # File upload constraints (can be overridden by environment)
 MAX_FILE_SIZE = int(env("MAX_FILE_SIZE", default=5 * 1024 * 1024))  # 5MB
 ALLOWED_FILE_TYPES = set((env("ALLOWED_FILE_TYPES", default="jpg,jpeg,png,webp")).split(","))
+# Storage backend: "supabase" (default) or "local" to keep objects on disk and
+# serve them from LOCAL_STORAGE_URL — handy for offline work and benchmarks.
+STORAGE_BACKEND = env("STORAGE_BACKEND", default="supabase")
+LOCAL_STORAGE_ROOT = env("LOCAL_STORAGE_ROOT", default=str(MEDIA_ROOT / 'storage'))
+LOCAL_STORAGE_URL = env("LOCAL_STORAGE_URL", default=MEDIA_URL + 'storage/')
+
+# Lifetime (seconds) of the token that ties a signed direct upload to its finalize call
+SIGNED_UPLOAD_MAX_AGE = int(env("SIGNED_UPLOAD_MAX_AGE", default=15 * 60))
+
+# Fan out role-wide notifications on a background thread after commit
+NOTIFICATIONS_ASYNC = env.bool("NOTIFICATIONS_ASYNC", default=True)
+
+# How often notification polls and streams re-read the shared high-water
+# mark for rows written by other workers
+NOTIFICATION_POLL_INTERVAL = float(env("NOTIFICATION_POLL_INTERVAL", default=2))
+# Lifetime of the signed ticket an EventSource opens the notification
+# stream with (replaces passing the bearer token in the URL)
+NOTIFICATION_STREAM_TICKET_MAX_AGE = int(env("NOTIFICATION_STREAM_TICKET_MAX_AGE", default=60))
+
+# Days a *read* notification is kept, per type, before purge_notifications
+# removes it; types not listed use NOTIFICATION_RETENTION_DEFAULT_DAYS
+NOTIFICATION_RETENTION_DAYS = {
+    'general': 30,
+    'assignment': 90,
+    'rent_due': 90,
+    'rent_overdue': 180,
+    'document_review': 180,
+    'document_expiry': 180,
+}
+NOTIFICATION_RETENTION_DEFAULT_DAYS = int(env("NOTIFICATION_RETENTION_DEFAULT_DAYS", default=90))
+
+# How often each worker checks whether the public room catalog changed
+CATALOG_VERSION_CHECK_INTERVAL = float(env("CATALOG_VERSION_CHECK_INTERVAL", default=1))
+
+# Shared cache: file based so every gunicorn worker on the host sees the same
+# entries without an external service.  Keys are grouped into named regions
+# (core/cache.py) that model signals invalidate.  Entries, key prefix and
+# locks are namespaced by database so checkouts and CI steps running against
+# different databases never read each other's cached rows; test runs use a
+# per-process in-memory cache.
+CACHE_NAMESPACE = env("CACHE_NAMESPACE", default=Path(str(DATABASES['default']['NAME'])).stem)
+if sys.argv[1:2] == ['test']:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'tests',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': env("CACHE_LOCATION", default=str(BASE_DIR / '.cache' / CACHE_NAMESPACE)),
+            'KEY_PREFIX': CACHE_NAMESPACE,
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'MAX_ENTRIES': int(env("CACHE_MAX_ENTRIES", default=5000)),
+            },
+        }
+    }
+# Lock files that let one worker recompute an expired entry while the others
+# wait or serve the stale value
+CACHE_LOCK_DIR = env("CACHE_LOCK_DIR", default=str(BASE_DIR / '.cache' / CACHE_NAMESPACE / 'locks'))
+
+# N+1 query detection (core/nplusone.py): flag a query shape repeated
+# NPLUSONE_THRESHOLD times in one request; strict mode raises so tests fail
+NPLUSONE_DETECTION = env.bool("NPLUSONE_DETECTION", default=False)
+NPLUSONE_THRESHOLD = int(env("NPLUSONE_THRESHOLD", default=3))
+NPLUSONE_STRICT = env.bool("NPLUSONE_STRICT", default=False)
+
+# Per-request profiles (core/profiling.py), triggered by admins with an
+# X-Profile header or ?_profile=1; only the newest PROFILE_MAX_REPORTS are kept
+PROFILE_DIR = env("PROFILE_DIR", default=str(BASE_DIR / 'profiles'))
+PROFILE_MAX_REPORTS = int(env("PROFILE_MAX_REPORTS", default=100))
+
+# Outbound HTTP (document fetches, JWKS, storage API)
+OUTBOUND_HTTP_CONNECT_TIMEOUT = float(env("OUTBOUND_HTTP_CONNECT_TIMEOUT", default=5))
+OUTBOUND_HTTP_READ_TIMEOUT = float(env("OUTBOUND_HTTP_READ_TIMEOUT", default=30))
+OUTBOUND_HTTP_POOL_SIZE = int(env("OUTBOUND_HTTP_POOL_SIZE", default=10))
+OUTBOUND_HTTP_MAX_BYTES = int(env("OUTBOUND_HTTP_MAX_BYTES", default=25 * 1024 * 1024))
 
 # ── Logging ───────────────────────────────────────────────────────────
 LOGGING = {
@@ -304,5 +389,12 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': False,
         },
+        # One JSON line per request from core.middleware.PerformanceMiddleware;
+        # set PERFORMANCE_LOG_LEVEL=WARNING to silence it
+        'core.performance': {
+            'handlers': ['console'],
+            'level': env("PERFORMANCE_LOG_LEVEL", default='INFO'),
+            'propagate': False,
+        },
     },
 }
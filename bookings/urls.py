@@ -1,9 +1,10 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 from django.utils import timezone
+from django.views.static import serve
 from rest_framework import permissions
 
 from drf_yasg.views import get_schema_view
@@ -51,5 +52,16 @@ urlpatterns = [
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
 
+if settings.STORAGE_BACKEND == 'local':
+    # Serve locally stored uploads regardless of DEBUG so benchmarks can run
+    # with production settings.
+    urlpatterns += [
+        re_path(
+            r'^%s(?P<path>.*)$' % settings.LOCAL_STORAGE_URL.lstrip('/'),
+            serve,
+            {'document_root': settings.LOCAL_STORAGE_ROOT},
+        ),
+    ]
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
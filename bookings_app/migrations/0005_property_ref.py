@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings_app", "0004_chatchannel_chatmessage_tenancyagreement"),
+        ("rooms", "0015_property"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chatchannel",
+            name="property_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="chat_channels",
+                to="rooms.property",
+            ),
+        ),
+        migrations.AddField(
+            model_name="tenantassignment",
+            name="property_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="assignments",
+                to="rooms.property",
+            ),
+        ),
+    ]
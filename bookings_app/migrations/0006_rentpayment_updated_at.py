@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings_app", "0005_property_ref"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rentpayment",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
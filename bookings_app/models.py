@@ -1,7 +1,7 @@
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth.models import User
-from rooms.models import Room
+from rooms.models import Room, Property
 
 
 class Booking(models.Model):
@@ -53,6 +53,7 @@ class TenantAssignment(models.Model):
     tenant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='assignments')
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='tenant_assignments')
     property_name = models.CharField(max_length=255, db_index=True)  # matches Room.location
+    property_ref = models.ForeignKey(Property, on_delete=models.SET_NULL, null=True, blank=True, related_name='assignments')
     start_date = models.DateField()
     end_date = models.DateField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
@@ -116,6 +117,7 @@ class RentPayment(models.Model):
     payment_method = models.CharField(max_length=100, blank=True, default='')
     notes = models.TextField(blank=True, default='')
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-due_date']
@@ -126,6 +128,7 @@ class RentPayment(models.Model):
 
 class ChatChannel(models.Model):
     property_name = models.CharField(max_length=255)
+    property_ref = models.ForeignKey(Property, on_delete=models.SET_NULL, null=True, blank=True, related_name='chat_channels')
     tenant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tenant_chat_channels')
     admin = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='admin_chat_channels')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -1,7 +1,7 @@
-import requests
 import fitz  # PyMuPDF
 import docx
 from io import BytesIO
+from core.http_client import fetch_bytes
 
 def extract_pdf_text(file_bytes):
     """Extract raw text from PDF bytes using PyMuPDF (fitz)."""
@@ -41,17 +41,17 @@ def extract_text_from_url(file_url, file_name=None):
     if not file_url:
         return ""
     
+    # Determine extension first so unsupported files are never downloaded
+    name = file_name or file_url.split('/')[-1].split('?')[0]
+    ext = name.split('.')[-1].lower() if '.' in name else ''
+    if ext not in ('pdf', 'docx', 'doc'):
+        return f"[Unsupported file extension for extraction: {ext}]"
+
     try:
-        response = requests.get(file_url, timeout=30)
-        response.raise_for_status()
-        file_bytes = response.content
+        file_bytes = fetch_bytes(file_url)
     except Exception as e:
         return f"[Error fetching document from URL: {str(e)}]"
     
-    # Determine extension
-    name = file_name or file_url.split('/')[-1].split('?')[0]
-    ext = name.split('.')[-1].lower() if '.' in name else ''
-    
     if ext == 'pdf':
         return extract_pdf_text(file_bytes)
     elif ext in ['docx', 'doc']:
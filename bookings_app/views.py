@@ -1,4 +1,5 @@
 from django.utils import timezone
+from django.db.models import Count, Max
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -7,6 +8,7 @@ from rooms.permissions import IsAdmin, IsTenant, IsAdminOrTenant
 from rooms.models import Room
 from .models import Booking, TenantAssignment, ChatChannel, ChatMessage, TenancyAgreement
 from . import serializers
+from core.conditional import conditional, make_etag
 
 
 
@@ -242,10 +244,21 @@ class TenantAssignmentDetailView(APIView):
             return Response({'success': False, 'error': 'Assignment not found'}, status=404)
 
 
+def assignment_validators(view, request):
+    row = (
+        TenantAssignment.objects.filter(tenant=request.user, status='active')
+        .values_list('id', 'updated_at', 'room__updated_at').first()
+    )
+    if row is None:
+        return make_etag('assignment', request.user.id, None), None
+    return make_etag('assignment', request.user.id, *row), max(row[1], row[2])
+
+
 class MyAssignmentView(APIView):
     """Tenant: view own assignment (property, room, rent details)."""
     permission_classes = [IsAdminOrTenant]
 
+    @conditional(assignment_validators, cache_control='private, no-cache')
     def get(self, request):
         assignments = TenantAssignment.objects.select_related('tenant', 'room').filter(
             tenant=request.user,
@@ -272,10 +285,30 @@ class MyAssignmentView(APIView):
 # ─── Tenant Rent Views ────────────────────────────────────────────────────────
 
 
+def rent_schedule_validators(view, request):
+    from .models import RentSchedule
+
+    def summary(schedules):
+        return schedules.aggregate(
+            schedules=Count('id', distinct=True),
+            payments=Count('payment_history'),
+            schedule_changed=Max('updated_at'),
+            payment_changed=Max('payment_history__updated_at'),
+        )
+
+    # Same lookup order as the view: direct link first, then email
+    stats = summary(RentSchedule.objects.filter(tenant_user=request.user))
+    if not stats['schedules']:
+        stats = summary(RentSchedule.objects.filter(tenant_email=request.user.email))
+    changed = [ts for ts in (stats['schedule_changed'], stats['payment_changed']) if ts]
+    return make_etag('rent-schedules', request.user.id, *stats.values()), max(changed) if changed else None
+
+
 class MyRentSchedulesView(APIView):
     """Tenant: view own rent schedules."""
     permission_classes = [IsAdminOrTenant]
 
+    @conditional(rent_schedule_validators, cache_control='private, no-cache')
     def get(self, request):
         from .models import RentSchedule
         # Find schedules linked to this user directly, or by matching tenant name/email
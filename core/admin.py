@@ -1,8 +1,47 @@
 from django.contrib import admin
-from .models import Notification
+from .notifications import reset_unread_count
+from .models import Notification, NotificationArchive, UnreadNotificationCounter, StoredObject, PendingStorageDeletion, SearchEntry
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'title', 'type', 'read', 'created_at')
     list_filter = ('type', 'read', 'created_at')
     search_fields = ('user__username', 'user__email', 'title', 'message')
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        reset_unread_count(obj.user_id)
+
+    def delete_queryset(self, request, queryset):
+        user_ids = set(queryset.values_list('user_id', flat=True))
+        super().delete_queryset(request, queryset)
+        reset_unread_count(user_ids)
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'title', 'type', 'created_at', 'archived_at')
+    list_filter = ('type',)
+    search_fields = ('user__username', 'title')
+
+@admin.register(UnreadNotificationCounter)
+class UnreadNotificationCounterAdmin(admin.ModelAdmin):
+    list_display = ('user', 'unread')
+    search_fields = ('user__username',)
+
+@admin.register(StoredObject)
+class StoredObjectAdmin(admin.ModelAdmin):
+    list_display = ('id', 'bucket', 'path', 'size', 'ref_count', 'created_at')
+    list_filter = ('bucket',)
+    search_fields = ('path', 'sha256')
+
+@admin.register(PendingStorageDeletion)
+class PendingStorageDeletionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'bucket', 'path', 'attempts', 'created_at')
+    list_filter = ('bucket',)
+    search_fields = ('path',)
+
+@admin.register(SearchEntry)
+class SearchEntryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'object_id', 'title', 'property_name', 'updated_at')
+    list_filter = ('kind',)
+    search_fields = ('title',)
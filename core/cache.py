@@ -0,0 +1,226 @@
+"""
+Named cache regions.
+
+Entries live in the shared ``default`` cache (file based, so every worker on
+the host sees them), each tagged with its region's generation number, which
+is itself stored in the cache.  ``invalidate()`` moves the generation on, so
+the whole region goes stale for every worker at once without enumerating
+keys.  Model signals in ``core/signals.py`` decide which regions a write
+invalidates.
+
+``get_or_set`` is single-flight across workers: on a miss one process takes
+a file lock and computes while the others wait for its result, or, when the
+region allows it, keep serving the previous (stale) value until the new one
+lands.  Hits, misses and stale serves are counted per region for the admin
+metrics endpoint.
+"""
+import os
+import time
+import zlib
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts fall back to per-process locks
+    fcntl = None
+
+_metrics_lock = threading.Lock()
+_counts = defaultdict(lambda: {'hits': 0, 'misses': 0, 'stale': 0, 'waits': 0, 'invalidations': 0})
+
+_thread_locks = defaultdict(threading.Lock)
+LOCK_STRIPES = 1024
+LOCK_POLL_INTERVAL = 0.02
+
+REGIONS = {}
+
+
+@contextmanager
+def flight_lock(name: str, wait: float = 0):
+    """
+    Exclusive lock on ``name`` shared by every process on the host (an
+    ``flock`` on one of ``LOCK_STRIPES`` files under ``CACHE_LOCK_DIR``).
+    Waits up to ``wait`` seconds and yields whether the lock was taken.
+    """
+    stripe = zlib.crc32(name.encode()) % LOCK_STRIPES
+    deadline = time.monotonic() + wait
+
+    if fcntl is None:
+        lock = _thread_locks[stripe]
+        acquired = lock.acquire(timeout=wait) if wait > 0 else lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+        return
+
+    lock_dir = getattr(settings, 'CACHE_LOCK_DIR', None) or os.path.join(settings.BASE_DIR, '.cache', 'locks')
+    os.makedirs(lock_dir, exist_ok=True)
+    fd = os.open(os.path.join(lock_dir, f'{stripe}.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+    acquired = False
+    try:
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(LOCK_POLL_INTERVAL)
+        yield acquired
+    finally:
+        if acquired:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class CacheRegion:
+    """
+    ``timeout`` is how long an entry counts as fresh; ``stale`` is how much
+    longer it may still be served while one worker recomputes it (0 means
+    never serve stale data, e.g. for permission-sensitive lists).
+    """
+
+    def __init__(self, name: str, timeout: int = 300, stale: int = 0, lock_wait: float = 10, alias: str = 'default'):
+        self.name = name
+        self.timeout = timeout
+        self.stale = stale
+        self.lock_wait = lock_wait
+        self.alias = alias
+        REGIONS[name] = self
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def generation_key(self) -> str:
+        return f'region:{self.name}:generation'
+
+    def generation(self) -> int:
+        generation = self.cache.get(self.generation_key)
+        if generation is None:
+            # A fresh, time-based generation rather than 1, so a generation
+            # key lost to culling never revives entries written under it.
+            generation = time.time_ns()
+            if not self.cache.add(self.generation_key, generation, None):
+                generation = self.cache.get(self.generation_key, generation)
+        return generation
+
+    def make_key(self, key: str) -> str:
+        return f'region:{self.name}:{key}'
+
+    def _count(self, field: str):
+        with _metrics_lock:
+            _counts[self.name][field] += 1
+
+    def _lookup(self, key: str):
+        """``(entry, fresh)`` where ``entry`` is ``(value, generation, fresh_until)`` or None."""
+        entry = self.cache.get(self.make_key(key))
+        if entry is None:
+            return None, False
+        return entry, entry[1] == self.generation() and entry[2] > time.time()
+
+    def _store(self, key: str, value, generation: int, timeout: int = None):
+        timeout = self.timeout if timeout is None else timeout
+        self.cache.set(self.make_key(key), (value, generation, time.time() + timeout), timeout + self.stale)
+
+    def get(self, key: str, default=None):
+        entry, fresh = self._lookup(key)
+        if not fresh:
+            self._count('misses')
+            return default
+        self._count('hits')
+        return entry[0]
+
+    def set(self, key: str, value, timeout: int = None):
+        self._store(key, value, self.generation(), timeout)
+
+    def get_or_set(self, key: str, compute, timeout: int = None):
+        """
+        Return the cached value for ``key``, calling ``compute()`` to fill
+        it on a miss -- in only one process at a time.
+        """
+        return self.fetch(key, compute, timeout)[0]
+
+    def fetch(self, key: str, compute, timeout: int = None):
+        """
+        ``get_or_set`` that also says whether the value is current:
+        ``(value, False)`` when the previous value was served while another
+        process refreshes it.
+        """
+        entry, fresh = self._lookup(key)
+        if fresh:
+            self._count('hits')
+            return entry[0], True
+        self._count('misses')
+
+        lock_name = self.make_key(key)
+        if entry is not None and self.stale:
+            with flight_lock(lock_name) as acquired:
+                if acquired:
+                    latest, fresh = self._lookup(key)
+                    return (latest[0] if fresh else self._compute(key, compute, timeout)), True
+            # Someone else is already recomputing: serve the previous value
+            self._count('stale')
+            return entry[0], False
+
+        with flight_lock(lock_name, wait=self.lock_wait):
+            # Whoever held the lock has probably filled the entry meanwhile
+            entry, fresh = self._lookup(key)
+            if fresh:
+                self._count('waits')
+                return entry[0], True
+            return self._compute(key, compute, timeout), True
+
+    def _compute(self, key: str, compute, timeout: int = None):
+        # Read the generation first so an invalidation that lands while we
+        # compute leaves this value stale rather than marking it fresh.
+        generation = self.generation()
+        value = compute()
+        self._store(key, value, generation, timeout)
+        return value
+
+    def invalidate(self):
+        self.cache.set(self.generation_key, time.time_ns(), None)
+        self._count('invalidations')
+
+    def invalidate_on_commit(self):
+        """Invalidate once the current transaction commits (immediately in autocommit)."""
+        transaction.on_commit(self.invalidate)
+
+
+def region_metrics() -> dict:
+    """
+    Per-region counts for this worker: ``stale`` lookups were answered with
+    the previous value during a refresh, ``waits`` with a value another
+    process computed while this one waited on the lock.
+    """
+    with _metrics_lock:
+        snapshot = {name: dict(_counts[name]) for name in REGIONS}
+
+    result = {}
+    for name, counts in snapshot.items():
+        lookups = counts['hits'] + counts['misses']
+        result[name] = {
+            **counts,
+            'hitRate': round(counts['hits'] / lookups, 4) if lookups else None,
+        }
+    return result
+
+
+# Public room search responses (rooms/facets.py)
+catalog = CacheRegion('catalog', timeout=300, stale=60)
+# Public property landing page (rooms/views.py)
+property_summary = CacheRegion('property_summary', timeout=60 * 60, stale=5 * 60)
+# Recipient lists for role-wide notifications (core/notifications.py)
+roles = CacheRegion('roles', timeout=60 * 60)
+# Admin dashboard counters (core/views.py)
+stats = CacheRegion('stats', timeout=300, stale=60)
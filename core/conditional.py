@@ -0,0 +1,55 @@
+"""
+HTTP conditional GET for API views.
+
+``conditional(validators)`` wraps an APIView handler.  ``validators`` is a
+cheap function (typically one indexed lookup) returning the ETag and
+Last-Modified for what the handler would render; when the client's
+``If-None-Match`` / ``If-Modified-Since`` still match, a 304 is returned
+without running the handler.  Otherwise the handler runs and the response
+carries the validators -- unless the handler set ``response.stale = True``
+because it answered from an out-of-date cache: such a response goes out
+without validators, so a later revalidation can't turn it into a 304.
+"""
+import hashlib
+from functools import wraps
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts) -> str:
+    """A quoted ETag derived from ``parts`` (versions, timestamps, ids)."""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:32]
+    return quote_etag(digest)
+
+
+def conditional(validators, cache_control: str = 'no-cache'):
+    """
+    Decorate ``get(self, request, *args, **kwargs)``.  ``validators`` gets
+    the same arguments and returns ``(etag, last_modified)``; either may be
+    None.  ``last_modified`` is a datetime.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            etag, last_modified = validators(self, request, *args, **kwargs)
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = handler(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                if getattr(response, 'stale', False):
+                    if cache_control and not response.has_header('Cache-Control'):
+                        response['Cache-Control'] = cache_control
+                    return response
+
+            if etag and not response.has_header('ETag'):
+                response['ETag'] = etag
+            if timestamp and not response.has_header('Last-Modified'):
+                response['Last-Modified'] = http_date(timestamp)
+            if cache_control and not response.has_header('Cache-Control'):
+                response['Cache-Control'] = cache_control
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,140 @@
+"""
+Shared outbound HTTP client.
+
+Every worker keeps one pooled, keep-alive ``requests.Session`` (per thread)
+so repeated fetches to the same host reuse TCP/TLS connections.  Reads are
+streamed with a byte cutoff, timeouts come from settings, and per-host
+latency is recorded for the metrics endpoint.
+"""
+import time
+import threading
+import logging
+from collections import defaultdict, deque
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_metrics_lock = threading.Lock()
+_host_samples = defaultdict(lambda: deque(maxlen=500))
+_host_counts = defaultdict(lambda: {'requests': 0, 'errors': 0})
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+def get_timeout() -> tuple:
+    """``(connect, read)`` timeout used for every outbound request."""
+    return (
+        getattr(settings, 'OUTBOUND_HTTP_CONNECT_TIMEOUT', 5),
+        getattr(settings, 'OUTBOUND_HTTP_READ_TIMEOUT', 30),
+    )
+
+
+def get_session() -> requests.Session:
+    session = getattr(_local, 'session', None)
+    if session is None:
+        pool_size = getattr(settings, 'OUTBOUND_HTTP_POOL_SIZE', 10)
+        retry = Retry(total=2, connect=2, read=0, backoff_factor=0.3,
+                      status_forcelist=(502, 503, 504), allowed_methods=frozenset(['GET', 'HEAD']))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _local.session = session
+    return session
+
+
+def record_latency(host: str, seconds: float, ok: bool = True):
+    with _metrics_lock:
+        _host_samples[host].append(seconds)
+        _host_counts[host]['requests'] += 1
+        if not ok:
+            _host_counts[host]['errors'] += 1
+
+
+def host_metrics() -> dict:
+    """Per-host request counts and latency percentiles (ms) for this worker."""
+    with _metrics_lock:
+        snapshot = {host: (sorted(samples), dict(_host_counts[host])) for host, samples in _host_samples.items()}
+
+    result = {}
+    for host, (samples, counts) in snapshot.items():
+        def pct(p):
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 2) if samples else 0
+        result[host] = {
+            **counts,
+            'p50Ms': pct(0.5),
+            'p95Ms': pct(0.95),
+            'maxMs': round(samples[-1] * 1000, 2) if samples else 0,
+        }
+    return result
+
+
+def fetch(url: str, max_bytes: int = None, **kwargs) -> requests.Response:
+    """
+    GET ``url`` through the pooled session.  The body is streamed and
+    ``ResponseTooLarge`` is raised as soon as it exceeds ``max_bytes``; the
+    returned response has its ``_content`` populated with what was read.
+    """
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'OUTBOUND_HTTP_MAX_BYTES', 25 * 1024 * 1024)
+    kwargs.setdefault('timeout', get_timeout())
+
+    host = urlparse(url).netloc
+    started = time.monotonic()
+    ok = False
+    try:
+        with get_session().get(url, stream=True, **kwargs) as response:
+            response.raise_for_status()
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > max_bytes:
+                raise ResponseTooLarge(f"Response is {declared} bytes, limit is {max_bytes}")
+
+            chunks = []
+            received = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                received += len(chunk)
+                if received > max_bytes:
+                    raise ResponseTooLarge(f"Response exceeded {max_bytes} bytes")
+                chunks.append(chunk)
+            response._content = b''.join(chunks)
+            ok = True
+            return response
+    finally:
+        record_latency(host, time.monotonic() - started, ok)
+
+
+def fetch_bytes(url: str, max_bytes: int = None, **kwargs) -> bytes:
+    return fetch(url, max_bytes=max_bytes, **kwargs).content
+
+
+def build_httpx_client():
+    """
+    A pooled ``httpx.Client`` for SDKs built on httpx (supabase-py), using
+    the same timeouts and feeding the same per-host metrics.
+    """
+    import httpx
+
+    connect_timeout, read_timeout = get_timeout()
+    pool_size = getattr(settings, 'OUTBOUND_HTTP_POOL_SIZE', 10)
+
+    def on_request(request):
+        request.extensions['started'] = time.monotonic()
+
+    def on_response(response):
+        started = response.request.extensions.get('started')
+        if started is not None:
+            record_latency(response.request.url.host, time.monotonic() - started, response.status_code < 500)
+
+    return httpx.Client(
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        event_hooks={'request': [on_request], 'response': [on_response]},
+    )
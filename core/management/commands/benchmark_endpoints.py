@@ -0,0 +1,327 @@
+import os
+import json
+import time
+import logging
+import secrets
+import tracemalloc
+from statistics import median
+
+import jwt
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse, NoReverseMatch
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.cache import REGIONS
+from core.middleware import QueryRecorder
+from core.profiling import list_profiles
+from rooms.models import Property, Room, PropertyImage, PropertyDocument, BookingInterest
+from bookings_app.models import RentSchedule, TenantAssignment, ChatChannel, TenancyAgreement
+
+logger = logging.getLogger(__name__)
+
+# Never benchmarked (and listed as skipped): the Django admin needs a
+# session login and the SSE stream never finishes.
+SKIP_NAMESPACES = {'admin': 'Django admin (session login)'}
+SKIP_NAMES = {'notifications-stream': 'Server-Sent Events stream never completes'}
+
+GATES = ('status', 'latency', 'queries', 'memory')
+
+# Role to call an endpoint as, when its permission classes don't say
+ROLE_OVERRIDES = {
+    'chat-channels': 'admin',
+    'agreements-list': 'admin',
+    'chat-messages': 'tenant',
+    'agreement-detail': 'tenant',
+    'property-documents-detail': 'admin',
+    'property-document-detail-compat': 'admin',
+    'tenant-document-detail-compat': 'admin',
+    'tenant-document-review-compat': 'admin',
+}
+
+QUERY_STRINGS = {
+    'admin-search': 'q=gas+safety+certificate',
+    'public-room-search': 'amenities=WiFi&min_price=100',
+}
+
+
+def _first(queryset):
+    return queryset.values_list('pk', flat=True).first()
+
+
+# URL kwargs per route name, drawn from the seeded dataset; ``users`` maps
+# role -> User.  Returning None skips the endpoint.
+PATH_SAMPLES = {
+    'room-detail': lambda users: {'id': _first(Room.objects.order_by('pk'))},
+    'public-room-detail': lambda users: {'id': _first(Room.objects.filter(available=True).order_by('pk'))},
+    'public-property-images': lambda users: {
+        'property_name': Property.objects.filter(images__isnull=False).values_list('name', flat=True).first()
+    },
+    'property-image-detail': lambda users: {'pk': _first(PropertyImage.objects.order_by('pk'))},
+    'admin-interests-detail': lambda users: {'pk': _first(BookingInterest.objects.order_by('pk'))},
+    'rent-schedule-detail': lambda users: {'pk': _first(RentSchedule.objects.order_by('pk'))},
+    'rent-payments': lambda users: {'schedule_id': _first(RentSchedule.objects.order_by('pk'))},
+    'tenant-assignment-detail': lambda users: {'pk': _first(TenantAssignment.objects.order_by('pk'))},
+    'chat-messages': lambda users: {'channel_id': _first(ChatChannel.objects.filter(tenant=users['tenant']))},
+    'agreement-detail': lambda users: {'pk': _first(TenancyAgreement.objects.filter(tenant=users['tenant']))},
+    'admin-profile-download': lambda users: {'profile_id': next((p['id'] for p in list_profiles()), None)},
+}
+for _name in ('property-documents-detail', 'property-document-detail-compat',
+              'tenant-document-detail-compat', 'tenant-document-review-compat'):
+    PATH_SAMPLES[_name] = lambda users: {'pk': _first(PropertyDocument.objects.order_by('pk'))}
+
+
+def iter_patterns(patterns=None, prefix='', namespace=None):
+    """``(route, name, namespace, callback)`` for every URL, depth first."""
+    for entry in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(entry, URLResolver):
+            yield from iter_patterns(entry.url_patterns, prefix + str(entry.pattern), entry.namespace or namespace)
+        elif isinstance(entry, URLPattern):
+            yield prefix + str(entry.pattern), entry.name, namespace, entry.callback
+
+
+def endpoint_role(name, callback):
+    if name in ROLE_OVERRIDES:
+        return ROLE_OVERRIDES[name]
+    view_class = getattr(callback, 'cls', None)
+    if view_class is None:
+        return 'anonymous'
+    permissions = {permission.__name__ for permission in getattr(view_class, 'permission_classes', [])}
+    if 'IsAdmin' in permissions:
+        return 'admin'
+    if permissions & {'IsTenant', 'IsAdminOrTenant'}:
+        return 'tenant'
+    return 'customer' if permissions else 'anonymous'
+
+
+def http_methods(callback) -> list:
+    """Methods a view handles; plain function views are assumed to serve GET."""
+    view_class = getattr(callback, 'cls', None)
+    if view_class is None:
+        return ['GET']
+    actions = getattr(callback, 'actions', None)
+    if actions is not None:
+        return [method.upper() for method in actions]
+    return [method.upper() for method in view_class.http_method_names
+            if method not in ('head', 'options') and hasattr(view_class, method)]
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else 0
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks every GET endpoint through the test client against the current (seeded) database, '
+            'writes the results as JSON and fails when an endpoint regresses against the stored baseline. '
+            'Routes without a GET handler are listed as skipped rather than exercised, since writes would '
+            'change the dataset between runs.')
+
+    def add_arguments(self, parser):
+        benchmarks_dir = os.path.join(settings.BASE_DIR, 'benchmarks')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint first.')
+        parser.add_argument('--only', default='', help='Only endpoints whose name or route contains this text.')
+        parser.add_argument('--cold', action='store_true', help='Invalidate every cache region before each request.')
+        parser.add_argument('--baseline', default=os.path.join(benchmarks_dir, 'baseline.json'))
+        parser.add_argument('--output', default=os.path.join(benchmarks_dir, 'latest.json'))
+        parser.add_argument('--update-baseline', action='store_true', help='Store this run as the new baseline.')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Allowed relative slowdown in p50 latency or peak memory.')
+        parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                            help='Latency increases below this are treated as noise.')
+        parser.add_argument('--generate', type=float, metavar='SCALE',
+                            help='Run generate_synthetic_data at this scale first.')
+        parser.add_argument('--gate', default=','.join(GATES),
+                            help=f"Comma-separated checks that fail the run ({', '.join(GATES)}). "
+                                 "Latency and memory only compare well on the machine that recorded the baseline.")
+
+    def handle(self, *args, **options):
+        if options['generate']:
+            call_command('generate_synthetic_data', scale=options['generate'], stdout=self.stdout)
+
+        users = {
+            'admin': User.objects.filter(client__role='admin').order_by('pk').first(),
+            'tenant': User.objects.filter(client__role='tenant', assignments__status='active', tenant_agreements__isnull=False).order_by('pk').first(),
+            'customer': User.objects.filter(client__role='customer').order_by('pk').first(),
+        }
+        missing = [role for role, user in users.items() if user is None]
+        if missing:
+            raise CommandError(f"No {', '.join(missing)} users; seed the database with generate_synthetic_data first.")
+
+        # Stub SupabaseAuthentication with a throwaway HS256 secret
+        secret = secrets.token_hex(32)
+        audience = getattr(settings, 'SUPABASE_JWT_AUDIENCE', 'authenticated')
+        headers = {'anonymous': {}}
+        for role, user in users.items():
+            claims = {'sub': user.username, 'email': user.email, 'app_metadata': {'role': role},
+                      'exp': int(time.time()) + 24 * 3600}
+            if audience:
+                claims['aud'] = audience
+            headers[role] = {'HTTP_AUTHORIZATION': f"Bearer {jwt.encode(claims, secret, algorithm='HS256')}"}
+
+        performance_logger = logging.getLogger('core.performance')
+        previous_level = performance_logger.level
+        performance_logger.setLevel(logging.WARNING)
+        try:
+            with override_settings(SUPABASE_URL='', SUPABASE_JWT_SECRET=secret,
+                                   ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                results, skipped = self._run(users, headers, options)
+        finally:
+            performance_logger.setLevel(previous_level)
+
+        report = {
+            'meta': {
+                'createdAt': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'iterations': options['iterations'],
+                'cold': options['cold'],
+                'rows': {
+                    'rooms': Room.objects.count(),
+                    'tenantAssignments': TenantAssignment.objects.count(),
+                    'chatChannels': ChatChannel.objects.count(),
+                },
+            },
+            'endpoints': results,
+            'skipped': skipped,
+        }
+        self._write(options['output'], report)
+        if skipped:
+            self.stdout.write(f"Skipped {len(skipped)} routes:")
+            for key, reason in skipped.items():
+                self.stdout.write(f"  {key:<40} {reason}")
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if options['update_baseline']:
+            self._write(options['baseline'], report)
+            self.stdout.write(self.style.SUCCESS(f"Baseline updated: {options['baseline']}"))
+            return
+
+        if not os.path.exists(options['baseline']):
+            self.stdout.write(self.style.WARNING("No baseline to compare against; rerun with --update-baseline to store one."))
+            return
+
+        with open(options['baseline']) as fh:
+            baseline = json.load(fh).get('endpoints', {})
+        regressions = self._compare(baseline, results, options)
+        if regressions:
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(line))
+            logger.error(f"Endpoint benchmark found {len(regressions)} regressions")
+            raise CommandError(f"{len(regressions)} endpoint regression(s) against {options['baseline']}")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}."))
+
+    def _run(self, users, headers, options):
+        client = APIClient()
+        results, skipped = {}, {}
+        iterations = max(options['iterations'], 1)
+
+        for route, name, namespace, callback in iter_patterns():
+            key = name or route
+            if namespace in SKIP_NAMESPACES:
+                skipped[f'{namespace}:*'] = SKIP_NAMESPACES[namespace]
+                continue
+            if options['only'] and options['only'] not in key and options['only'] not in route:
+                continue
+            if name in SKIP_NAMES:
+                skipped[key] = SKIP_NAMES[name]
+                continue
+            methods = http_methods(callback)
+            if 'GET' not in methods:
+                skipped[key] = f"no GET handler ({', '.join(methods)})"
+                continue
+
+            kwargs = {}
+            if '<' in route or '(?P' in route:
+                sampler = PATH_SAMPLES.get(name)
+                kwargs = sampler(users) if sampler else None
+                if not kwargs or None in kwargs.values():
+                    skipped[key] = 'no sample value for URL parameters'
+                    continue
+            try:
+                path = reverse(name, kwargs=kwargs) if name else '/' + route
+            except NoReverseMatch:
+                skipped[key] = 'could not build URL'
+                continue
+            if name in QUERY_STRINGS:
+                path = f'{path}?{QUERY_STRINGS[name]}'
+
+            role = endpoint_role(name, callback)
+            request_headers = headers[role]
+            for _ in range(max(options['warmup'], 0)):
+                client.get(path, secure=True, **request_headers)
+
+            latencies, query_counts, statuses = [], [], set()
+            for _ in range(iterations):
+                if options['cold']:
+                    for region in REGIONS.values():
+                        region.invalidate()
+                recorder = QueryRecorder()
+                with connection.execute_wrapper(recorder):
+                    started = time.perf_counter()
+                    response = client.get(path, secure=True, **request_headers)
+                    latencies.append(time.perf_counter() - started)
+                query_counts.append(recorder.count)
+                statuses.add(response.status_code)
+            reset_queries()
+
+            tracemalloc.start()
+            try:
+                client.get(path, secure=True, **request_headers)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            results[key] = {
+                'path': path,
+                'role': role,
+                'status': sorted(statuses),
+                'p50Ms': round(percentile(latencies, 0.5) * 1000, 2),
+                'p95Ms': round(percentile(latencies, 0.95) * 1000, 2),
+                'p99Ms': round(percentile(latencies, 0.99) * 1000, 2),
+                'maxMs': round(max(latencies) * 1000, 2),
+                'queries': int(median(query_counts)),
+                'peakKb': round(peak / 1024, 1),
+            }
+            self.stdout.write(
+                f"{key:<40} {role:<9} {','.join(map(str, sorted(statuses))):<8} "
+                f"p50 {results[key]['p50Ms']:>8.2f} ms  p95 {results[key]['p95Ms']:>8.2f} ms  "
+                f"{results[key]['queries']:>4} queries  {results[key]['peakKb']:>9.1f} KB"
+            )
+        return results, skipped
+
+    def _compare(self, baseline, results, options):
+        threshold = options['threshold']
+        gates = {gate.strip() for gate in options['gate'].split(',') if gate.strip()}
+        unknown = gates - set(GATES)
+        if unknown:
+            raise CommandError(f"Unknown gate(s): {', '.join(sorted(unknown))}")
+
+        regressions = []
+        if not options['only']:
+            regressions += [f"{key}: in the baseline but not benchmarked" for key in baseline if key not in results]
+        for key, current in results.items():
+            before = baseline.get(key)
+            if before is None:
+                continue
+            if 'status' in gates and max(before['status']) < 400 <= max(current['status']):
+                regressions.append(f"{key}: status {before['status']} -> {current['status']}")
+            if ('latency' in gates and current['p50Ms'] > before['p50Ms'] * (1 + threshold)
+                    and current['p50Ms'] - before['p50Ms'] > options['min_delta_ms']):
+                regressions.append(f"{key}: p50 {before['p50Ms']} ms -> {current['p50Ms']} ms")
+            if 'queries' in gates and current['queries'] > before['queries']:
+                regressions.append(f"{key}: queries {before['queries']} -> {current['queries']}")
+            if ('memory' in gates and current['peakKb'] > before['peakKb'] * (1 + threshold)
+                    and current['peakKb'] - before['peakKb'] > 256):
+                regressions.append(f"{key}: peak memory {before['peakKb']} KB -> {current['peakKb']} KB")
+        return regressions
+
+    def _write(self, path, report):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
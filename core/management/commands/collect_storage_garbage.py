@@ -0,0 +1,108 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from core.storage_backends import storage
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Deletes storage objects that no database row references any more.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bucket', action='append', dest='buckets',
+                            help='Bucket to scan (repeatable). Defaults to the images and documents buckets.')
+        parser.add_argument('--grace-hours', type=int, default=24,
+                            help='Only delete orphans older than this, so in-flight uploads are kept.')
+        parser.add_argument('--batch-size', type=int, default=100, help='Paths per remove call.')
+        parser.add_argument('--page-size', type=int, default=1000, help='Objects per list call.')
+        parser.add_argument('--dry-run', action='store_true', help='Report orphans without deleting them.')
+
+    def handle(self, *args, **options):
+        buckets = options['buckets'] or ['images', getattr(settings, 'SUPABASE_DOCUMENTS_BUCKET', 'documents')]
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+
+        referenced = {bucket: set() for bucket in buckets}
+        for url in self._referenced_urls():
+            for bucket in buckets:
+                path = storage.path_from_url(url, bucket)
+                if path:
+                    referenced[bucket].add(path)
+
+        total_objects = total_bytes = failed_objects = failed_batches = rereferenced = 0
+        for bucket in buckets:
+            orphans = []
+            scanned = 0
+            for path, size, created_at in storage.iter_objects(bucket, page_size=options['page_size']):
+                scanned += 1
+                if path in referenced[bucket]:
+                    continue
+                if created_at is None or created_at > cutoff:
+                    continue
+                orphans.append((path, size))
+
+            if options['dry_run']:
+                reclaimed_objects, reclaimed = len(orphans), sum(size for _, size in orphans)
+            else:
+                # Only batches that were actually removed count as reclaimed
+                reclaimed_objects = reclaimed = 0
+                for i in range(0, len(orphans), options['batch_size']):
+                    batch = orphans[i:i + options['batch_size']]
+                    # The referenced set is older than the listing: an upload
+                    # deduplicated onto an orphan since then holds a reference,
+                    # and the claim blocks new ones until the remove is done.
+                    with transaction.atomic():
+                        unreferenced = storage.claim_unreferenced(bucket, [path for path, _ in batch])
+                        rereferenced += len(batch) - len(unreferenced)
+                        batch = [(path, size) for path, size in batch if path in unreferenced]
+                        if not batch:
+                            continue
+                        try:
+                            storage.remove_objects(bucket, [path for path, _ in batch])
+                        except Exception as e:
+                            failed_batches += 1
+                            failed_objects += len(batch)
+                            self.stdout.write(self.style.ERROR(f"Failed to delete batch from {bucket}: {str(e)}"))
+                            logger.error(f"Storage GC batch failed for {bucket}: {str(e)}")
+                            continue
+                        finally:
+                            storage.release_claims(bucket, unreferenced)
+                    reclaimed_objects += len(batch)
+                    reclaimed += sum(size for _, size in batch)
+
+            total_objects += reclaimed_objects
+            total_bytes += reclaimed
+            self.stdout.write(
+                f"{bucket}: scanned {scanned} objects, {len(orphans)} orphaned, "
+                f"{reclaimed_objects} {'removable' if options['dry_run'] else 'removed'} ({reclaimed} bytes)"
+            )
+
+        verb = 'Would reclaim' if options['dry_run'] else 'Reclaimed'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {total_bytes} bytes from {total_objects} objects."))
+        if rereferenced:
+            self.stdout.write(f"Kept {rereferenced} orphans that an upload still references.")
+        if failed_batches:
+            self.stdout.write(self.style.ERROR(
+                f"{failed_batches} batches ({failed_objects} objects) could not be deleted; rerun to retry them."
+            ))
+
+    def _referenced_urls(self):
+        """Stream every stored-file URL held by the database."""
+        from rooms.models import Room, PropertyImage, PropertyDocument
+        from bookings_app.models import ChatMessage
+        from accounts.models import Client
+
+        chunk = 2000
+        for images in Room.objects.values_list('images', flat=True).iterator(chunk_size=chunk):
+            if isinstance(images, list):
+                yield from (url for url in images if isinstance(url, str))
+            elif isinstance(images, str) and images:
+                yield images
+        yield from PropertyImage.objects.values_list('image_url', flat=True).iterator(chunk_size=chunk)
+        yield from PropertyDocument.objects.values_list('file_url', flat=True).iterator(chunk_size=chunk)
+        yield from ChatMessage.objects.exclude(file_url__isnull=True).exclude(file_url='') \
+            .values_list('file_url', flat=True).iterator(chunk_size=chunk)
+        yield from Client.objects.exclude(image='').values_list('image', flat=True).iterator(chunk_size=chunk)
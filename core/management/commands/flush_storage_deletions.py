@@ -0,0 +1,34 @@
+import time
+import logging
+from django.core.management.base import BaseCommand
+from core.storage_backends import storage
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Removes storage objects queued for deletion, batching one remove call per bucket.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Paths per remove call.')
+        parser.add_argument('--max-attempts', type=int, default=5, help='Give up on a path after this many failed runs.')
+        parser.add_argument('--loop', action='store_true', help='Keep running as a worker instead of exiting.')
+        parser.add_argument('--interval', type=int, default=30, help='Seconds between flushes when looping.')
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                result = storage.flush_pending_deletions(
+                    batch_size=options['batch_size'],
+                    max_attempts=options['max_attempts'],
+                )
+                self.stdout.write(self.style.SUCCESS(
+                    f"Removed {result['removed']} objects, {result['failed']} failed."
+                ))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Flush failed: {str(e)}"))
+                logger.error(f"Storage deletion flush failed: {str(e)}")
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,539 @@
+import time
+import random
+import logging
+import multiprocessing
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from accounts.models import Client
+from rooms.models import Property, Room, PropertyImage, PropertyDocument, BookingInterest
+from bookings_app.models import (
+    Booking, TenantAssignment, RentSchedule, RentPayment, ChatChannel, ChatMessage, TenancyAgreement,
+)
+from core.models import Notification, NotificationArchive, UnreadNotificationCounter, StoredObject, PendingStorageDeletion
+
+logger = logging.getLogger(__name__)
+
+# Row counts at --scale 1 (production scale)
+BASE_COUNTS = {
+    'properties': 250,
+    'rooms': 5000,
+    'admins': 20,
+    'tenants': 50000,
+    'customers': 50000,
+    'bookings': 1000000,
+    'rent_payments': 500000,
+    'chat_messages': 2000000,
+    'notifications': 1000000,
+    'archived_notifications': 100000,
+    'documents': 20000,
+    'interests': 20000,
+    'agreements': 10000,
+    'pending_deletions': 100,
+}
+IMAGES_PER_PROPERTY = 4
+# Rows sharing one random stream; chunks are whole blocks, so the data does
+# not depend on --chunk-size or --workers
+RNG_BLOCK = 500
+
+STREETS = [
+    'Maple Court', 'Harbour View', 'Kingsway House', 'Riverside Lofts', 'Oak Terrace', 'Victoria Place',
+    'Canal Wharf', 'Elm Gardens', 'Station Yard', 'Market Square', 'Priory Mews', 'Albion Works',
+]
+FIRST_NAMES = ['Amir', 'Bella', 'Chen', 'Dara', 'Elif', 'Farah', 'Gareth', 'Hana', 'Isaac', 'Jonas', 'Kemi', 'Luca',
+               'Maya', 'Nadia', 'Omar', 'Priya', 'Rhys', 'Sofia', 'Tariq', 'Uma', 'Viktor', 'Yusuf', 'Zara']
+LAST_NAMES = ['Ahmed', 'Brown', 'Clarke', 'Davies', 'Evans', 'Fischer', 'Green', 'Hughes', 'Iqbal', 'Jones', 'Khan',
+              'Lewis', 'Morgan', 'Novak', 'Okafor', 'Patel', 'Rossi', 'Smith', 'Taylor', 'Wright']
+AMENITIES = ['WiFi', 'Parking', 'Kitchen', 'Washer', 'Dryer', 'Air Conditioning', 'Heating', 'TV', 'Workspace',
+             'Gym', 'Pool', 'Balcony', 'Garden', 'Dishwasher', 'Elevator', 'Concierge', 'Bike Storage', 'Pet Friendly']
+WORDS = ('lease tenancy deposit inventory boiler repair heating window kitchen landlord agreement payment schedule '
+         'monthly rent receipt insurance certificate gas safety electrical inspection notice renewal keys access '
+         'parking contract reference viewing move furnished bedroom bathroom balcony maintenance request invoice '
+         'utility council tax meter reading damp leak plumber appointment confirm thanks please update').split()
+DOCUMENT_NAMES = {
+    'license': 'HMO Licence', 'permit': 'Building Permit', 'insurance': 'Buildings Insurance',
+    'contract': 'Tenancy Contract', 'certificate': 'Gas Safety Certificate', 'id': 'Photo ID',
+    'proof_of_address': 'Proof of Address', 'reference': 'Landlord Reference', 'other': 'Inventory Report',
+}
+NOTIFICATION_TYPES = ['general', 'rent_due', 'rent_overdue', 'document_review', 'document_expiry', 'assignment']
+
+
+def scaled_counts(scale: float, overrides: dict) -> dict:
+    counts = {name: max(1, round(count * scale)) for name, count in BASE_COUNTS.items()}
+    counts.update(overrides)
+    return counts
+
+
+# ─── Deterministic helpers shared by the row builders ─────────────────
+# Foreign keys are derived arithmetically from each table's first primary
+# key, so any chunk of any table can be built independently (and in any
+# worker process) while staying consistent with the others.
+
+def _dt(plan, days_ago: float):
+    return plan['now'] - timedelta(days=days_ago)
+
+
+def _midnight(day):
+    return datetime.combine(day, datetime.min.time(), tzinfo=dt_timezone.utc)
+
+
+def _sentence(rng, low: int, high: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize() + '.'
+
+
+def admin_pk(plan, k):
+    return plan['bases']['users'] + k % plan['counts']['admins']
+
+
+def tenant_pk(plan, k):
+    return plan['bases']['users'] + plan['counts']['admins'] + k % plan['counts']['tenants']
+
+
+def customer_pk(plan, k):
+    counts = plan['counts']
+    return plan['bases']['users'] + counts['admins'] + counts['tenants'] + k % counts['customers']
+
+
+def user_count(plan):
+    counts = plan['counts']
+    return counts['admins'] + counts['tenants'] + counts['customers']
+
+
+def property_pk(plan, k):
+    return plan['bases']['properties'] + k % plan['counts']['properties']
+
+
+def property_name(plan, k):
+    pk = property_pk(plan, k)
+    return f"{STREETS[pk % len(STREETS)]} {pk}"
+
+
+def room_property_index(plan, room_index):
+    return room_index % plan['counts']['properties']
+
+
+def room_name(plan, room_index):
+    number = room_index // plan['counts']['properties'] + 1
+    return f"{property_name(plan, room_property_index(plan, room_index))} - Room {number}"
+
+
+def room_price(room_index):
+    return 60 + (room_index * 37) % 440
+
+
+def tenant_room_index(plan, k):
+    return (k * 7) % plan['counts']['rooms']
+
+
+def tenant_rent(k):
+    return 750 + (k * 53) % 1750
+
+
+def tenancy_start(plan, k):
+    return (plan['now'] - timedelta(days=30 + (k * 97) % 870)).date()
+
+
+def person_name(k):
+    return FIRST_NAMES[k % len(FIRST_NAMES)], LAST_NAMES[(k // len(FIRST_NAMES)) % len(LAST_NAMES)]
+
+
+# ─── Row builders: (plan, rng, index) -> unsaved instance ─────────────
+
+def build_user(plan, rng, i):
+    pk = plan['bases']['users'] + i
+    first, last = person_name(i)
+    return User(
+        id=pk, username=f'synthetic-{pk}', email=f'{first}.{last}.{pk}@example.com'.lower(),
+        first_name=first, last_name=last, password='!' + '%032x' % rng.getrandbits(128),
+        date_joined=_dt(plan, rng.uniform(30, 1000)),
+    )
+
+
+def build_client(plan, rng, i):
+    counts = plan['counts']
+    role = 'admin' if i < counts['admins'] else 'tenant' if i < counts['admins'] + counts['tenants'] else 'customer'
+    return Client(
+        id=plan['bases']['clients'] + i, user_id=plan['bases']['users'] + i, role=role,
+        mobile_no=f'07{rng.randint(100000000, 999999999)}', image='',
+    )
+
+
+def build_property(plan, rng, i):
+    return Property(id=property_pk(plan, i), name=property_name(plan, i), created_at=_dt(plan, rng.uniform(400, 1500)))
+
+
+def build_room(plan, rng, i):
+    prop = room_property_index(plan, i)
+    bedrooms = rng.randint(1, 4)
+    updated = _dt(plan, rng.uniform(0, 300))
+    return Room(
+        id=plan['bases']['rooms'] + i, name=room_name(plan, i), type=rng.choice(['villa', 'apartment', 'suite']),
+        price=Decimal(room_price(i)), rating=round(rng.uniform(3.2, 5.0), 1), reviews=rng.randint(0, 400),
+        images=[f'https://images.example.com/rooms/{plan["bases"]["rooms"] + i}/{n}.jpg' for n in range(rng.randint(1, 4))],
+        amenities=rng.sample(AMENITIES, rng.randint(3, 8)), description=_sentence(rng, 12, 30),
+        location=property_name(plan, prop), property_ref_id=property_pk(plan, prop),
+        max_guests=bedrooms * 2, bedrooms=bedrooms, bathrooms=max(1, bedrooms - rng.randint(0, 1)),
+        size=25 + bedrooms * rng.randint(12, 20), available=rng.random() < 0.85, updated_at=updated,
+    )
+
+
+def build_property_image(plan, rng, i):
+    prop, n = i // IMAGES_PER_PROPERTY, i % IMAGES_PER_PROPERTY
+    created = _dt(plan, rng.uniform(0, 400))
+    return PropertyImage(
+        id=plan['bases']['property_images'] + i, property_name=property_name(plan, prop),
+        property_ref_id=property_pk(plan, prop), caption=_sentence(rng, 2, 5),
+        image_url=f'https://images.example.com/properties/{property_pk(plan, prop)}/{n}.jpg',
+        is_primary=n == 0, sort_order=n, created_at=created, updated_at=created,
+    )
+
+
+def build_assignment(plan, rng, k):
+    room = tenant_room_index(plan, k)
+    prop = room_property_index(plan, room)
+    created = _midnight(tenancy_start(plan, k))
+    ended = rng.random() < 0.1
+    return TenantAssignment(
+        id=plan['bases']['assignments'] + k, tenant_id=tenant_pk(plan, k), room_id=plan['bases']['rooms'] + room,
+        property_name=property_name(plan, prop), property_ref_id=property_pk(plan, prop),
+        start_date=tenancy_start(plan, k), end_date=(plan['now'] - timedelta(days=rng.randint(1, 29))).date() if ended else None,
+        status='ended' if ended else 'active', monthly_rent=Decimal(tenant_rent(k)), deposit=Decimal(tenant_rent(k) * 5 // 4),
+        notes='', created_at=created, updated_at=created,
+    )
+
+
+def build_schedule(plan, rng, k):
+    first, last = person_name(tenant_pk(plan, k) - plan['bases']['users'])
+    created = _midnight(tenancy_start(plan, k))
+    return RentSchedule(
+        id=plan['bases']['schedules'] + k, room_name=room_name(plan, tenant_room_index(plan, k)),
+        tenant_name=f'{first} {last}', tenant_email=f'{first}.{last}.{tenant_pk(plan, k)}@example.com'.lower(),
+        tenant_phone='', monthly_rent=Decimal(tenant_rent(k)), due_day=1 + k % 28, start_date=tenancy_start(plan, k),
+        status='active', tenant_user_id=tenant_pk(plan, k), assignment_id=plan['bases']['assignments'] + k,
+        created_at=created, updated_at=created,
+    )
+
+
+def build_payment(plan, rng, i):
+    schedules = plan['counts']['tenants']
+    k, month = i % schedules, i // schedules
+    due = tenancy_start(plan, k) + timedelta(days=30 * month)
+    amount = Decimal(tenant_rent(k))
+    if due > plan['now'].date():
+        status, paid, paid_date = 'pending', Decimal(0), None
+    else:
+        roll = rng.random()
+        status = 'paid' if roll < 0.85 else 'partial' if roll < 0.93 else 'overdue'
+        paid = amount if status == 'paid' else (amount / 2 if status == 'partial' else Decimal(0))
+        paid_date = due + timedelta(days=rng.randint(0, 6)) if paid else None
+    created = _midnight(due) - timedelta(days=30)
+    return RentPayment(
+        id=plan['bases']['rent_payments'] + i, schedule_id=plan['bases']['schedules'] + k, due_date=due,
+        paid_date=paid_date, amount=amount, paid_amount=paid, status=status,
+        payment_method=rng.choice(['bank_transfer', 'card', 'standing_order']) if paid else '', notes='',
+        created_at=created, updated_at=created,
+    )
+
+
+def build_booking(plan, rng, i):
+    room = rng.randrange(plan['counts']['rooms'])
+    check_in = (plan['now'] - timedelta(days=rng.randint(-180, 730))).date()
+    nights = rng.randint(1, 14)
+    if check_in + timedelta(days=nights) < plan['now'].date():
+        status = rng.choices(['completed', 'cancelled', 'confirmed'], weights=[80, 15, 5])[0]
+    else:
+        status = rng.choices(['confirmed', 'pending', 'cancelled'], weights=[60, 30, 10])[0]
+    user = customer_pk(plan, rng.randrange(plan['counts']['customers']))
+    created = _midnight(check_in) - timedelta(days=rng.randint(1, 90))
+    return Booking(
+        id=plan['bases']['bookings'] + i, user_id=user, room_id=plan['bases']['rooms'] + room, check_in=check_in,
+        check_out=check_in + timedelta(days=nights), guests=rng.randint(1, 4), total_price=Decimal(room_price(room) * nights),
+        status=status, guest_info={'name': ' '.join(person_name(user)), 'phone': ''}, created_at=created, updated_at=created,
+    )
+
+
+def build_channel(plan, rng, k):
+    prop = room_property_index(plan, tenant_room_index(plan, k))
+    return ChatChannel(
+        id=plan['bases']['channels'] + k, property_name=property_name(plan, prop), property_ref_id=property_pk(plan, prop),
+        tenant_id=tenant_pk(plan, k), admin_id=admin_pk(plan, k), created_at=_dt(plan, 30 + (k * 97) % 870),
+    )
+
+
+def build_message(plan, rng, i):
+    channels = plan['counts']['tenants']
+    k, n = i % channels, i // channels
+    message = ChatMessage(
+        id=plan['bases']['chat_messages'] + i, channel_id=plan['bases']['channels'] + k,
+        sender_id=tenant_pk(plan, k) if n % 2 == 0 else admin_pk(plan, k), content=_sentence(rng, 3, 25),
+        created_at=_dt(plan, 30 + (k * 97) % 870) + timedelta(minutes=n * 45 + rng.randint(0, 30)),
+    )
+    if rng.random() < 0.01:
+        message.file_url = f'https://storage.example.com/chat/{message.id}.pdf'
+        message.file_name = f'{rng.choice(WORDS)}-{message.id}.pdf'
+        message.extracted_text = ' '.join(_sentence(rng, 10, 30) for _ in range(rng.randint(2, 8)))
+    return message
+
+
+def build_agreement(plan, rng, k):
+    prop = room_property_index(plan, tenant_room_index(plan, k))
+    signed = rng.random() < 0.6
+    created = _dt(plan, 30 + (k * 97) % 870)
+    return TenancyAgreement(
+        id=plan['bases']['agreements'] + k, channel_id=plan['bases']['channels'] + k,
+        property_name=property_name(plan, prop), tenant_id=tenant_pk(plan, k),
+        room_id=plan['bases']['rooms'] + tenant_room_index(plan, k),
+        agreement_text='\n\n'.join(_sentence(rng, 20, 60) for _ in range(6)),
+        status='signed' if signed else 'draft', tenant_signed=signed, admin_signed=signed,
+        tenant_signed_at=created + timedelta(days=1) if signed else None,
+        admin_signed_at=created + timedelta(days=2) if signed else None, created_at=created,
+    )
+
+
+def build_notification(plan, rng, i):
+    kind = rng.choices(NOTIFICATION_TYPES, weights=[30, 25, 10, 15, 10, 10])[0]
+    return Notification(
+        id=plan['bases']['notifications'] + i,
+        user_id=plan['bases']['users'] + rng.randrange(user_count(plan)),
+        title=kind.replace('_', ' ').title(), message=_sentence(rng, 6, 20), type=kind,
+        read=rng.random() < 0.7, link='/dashboard', created_at=_dt(plan, rng.uniform(0, 400)),
+    )
+
+
+def build_archived_notification(plan, rng, i):
+    pk = plan['bases']['archived_notifications'] + i
+    kind = rng.choice(NOTIFICATION_TYPES)
+    created = _dt(plan, rng.uniform(200, 900))
+    return NotificationArchive(
+        id=pk, original_id=10 ** 12 + pk, user_id=plan['bases']['users'] + rng.randrange(user_count(plan)),
+        title=kind.replace('_', ' ').title(), message=_sentence(rng, 6, 20), type=kind, link='',
+        created_at=created, archived_at=created + timedelta(days=180),
+    )
+
+
+def build_document(plan, rng, i):
+    k = rng.randrange(plan['counts']['tenants'])
+    room = tenant_room_index(plan, k)
+    prop = room_property_index(plan, room)
+    kind = rng.choice(list(DOCUMENT_NAMES))
+    uploaded = (plan['now'] - timedelta(days=rng.randint(0, 700))).date()
+    expiry = uploaded + timedelta(days=rng.randint(60, 1100)) if kind in ('license', 'permit', 'insurance', 'certificate') else None
+    reminder = rng.choice([14, 30, 60])
+    today = plan['now'].date()
+    if expiry is None:
+        status = rng.choice(['active', 'pending', 'approved'])
+    elif expiry < today:
+        status = 'expired'
+    elif expiry <= today + timedelta(days=reminder):
+        status = 'expiring-soon'
+    else:
+        status = 'active'
+    pk = plan['bases']['documents'] + i
+    return PropertyDocument(
+        id=pk, property_id=property_name(plan, prop), property_ref_id=property_pk(plan, prop),
+        room_id=plan['bases']['rooms'] + room, tenant_id=tenant_pk(plan, k),
+        assignment_id=plan['bases']['assignments'] + k, uploaded_by_id=admin_pk(plan, i),
+        name=DOCUMENT_NAMES[kind], type=kind, description=_sentence(rng, 5, 15),
+        file_url=f'https://storage.example.com/documents/{pk}.pdf', upload_date=uploaded, expiry_date=expiry,
+        status=status, reminder_days=reminder, notes=_sentence(rng, 3, 12), metadata={'pages': rng.randint(1, 20)},
+    )
+
+
+def build_stored_object(plan, rng, i):
+    return StoredObject(
+        id=plan['bases']['stored_objects'] + i, bucket='documents', path=f'{plan["bases"]["documents"] + i}.pdf',
+        sha256='%064x' % rng.getrandbits(256), size=rng.randint(20000, 4000000),
+        content_type='application/pdf', ref_count=1, created_at=_dt(plan, rng.uniform(0, 700)),
+    )
+
+
+def build_pending_deletion(plan, rng, i):
+    pk = plan['bases']['pending_deletions'] + i
+    return PendingStorageDeletion(
+        id=pk, bucket='images', path=f'uploads/orphan-{pk}.jpg', attempts=rng.randint(0, 3),
+        created_at=_dt(plan, rng.uniform(0, 2)),
+    )
+
+
+def build_interest(plan, rng, i):
+    room = rng.randrange(plan['counts']['rooms'])
+    prop = room_property_index(plan, room)
+    first, last = person_name(rng.randrange(10000))
+    return BookingInterest(
+        id=plan['bases']['interests'] + i, name=f'{first} {last}', email=f'{first}.{last}@example.net'.lower(),
+        phone='', message=_sentence(rng, 8, 30), room_id=plan['bases']['rooms'] + room,
+        property_name=property_name(plan, prop), property_ref_id=property_pk(plan, prop),
+        status=rng.choices(['new', 'contacted', 'closed'], weights=[30, 40, 30])[0],
+        created_at=_dt(plan, rng.uniform(0, 500)),
+    )
+
+
+# (table, model, row count, builder), in foreign-key order
+def table_plan(counts):
+    users = counts['admins'] + counts['tenants'] + counts['customers']
+    return [
+        ('users', User, users, build_user),
+        ('clients', Client, users, build_client),
+        ('properties', Property, counts['properties'], build_property),
+        ('rooms', Room, counts['rooms'], build_room),
+        ('property_images', PropertyImage, counts['properties'] * IMAGES_PER_PROPERTY, build_property_image),
+        ('assignments', TenantAssignment, counts['tenants'], build_assignment),
+        ('schedules', RentSchedule, counts['tenants'], build_schedule),
+        ('rent_payments', RentPayment, counts['rent_payments'], build_payment),
+        ('bookings', Booking, counts['bookings'], build_booking),
+        ('channels', ChatChannel, counts['tenants'], build_channel),
+        ('chat_messages', ChatMessage, counts['chat_messages'], build_message),
+        ('agreements', TenancyAgreement, min(counts['agreements'], counts['tenants']), build_agreement),
+        ('notifications', Notification, counts['notifications'], build_notification),
+        ('archived_notifications', NotificationArchive, counts['archived_notifications'], build_archived_notification),
+        ('documents', PropertyDocument, counts['documents'], build_document),
+        ('stored_objects', StoredObject, counts['documents'], build_stored_object),
+        ('pending_deletions', PendingStorageDeletion, counts['pending_deletions'], build_pending_deletion),
+        ('interests', BookingInterest, counts['interests'], build_interest),
+    ]
+
+
+@contextmanager
+def explicit_timestamps(models):
+    """Let generated rows keep their own ``created_at``/``updated_at`` values."""
+    toggled = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            for attr in ('auto_now', 'auto_now_add'):
+                if getattr(field, attr, False):
+                    setattr(field, attr, False)
+                    toggled.append((field, attr))
+    try:
+        yield
+    finally:
+        for field, attr in toggled:
+            setattr(field, attr, True)
+
+
+def write_chunk(job):
+    """Build and insert rows ``[start, end)`` of one table; runs in the parent or a worker."""
+    plan, table, start, end = job
+    model, builder = plan['tables'][table]
+    rows = []
+    for i in range(start, end):
+        if i % RNG_BLOCK == 0:
+            rng = random.Random(f"{plan['seed']}:{table}:{i // RNG_BLOCK}")
+        rows.append(builder(plan, rng, i))
+    with transaction.atomic():
+        model.objects.bulk_create(rows, batch_size=plan['batch_size'])
+    return end - start
+
+
+class Command(BaseCommand):
+    help = ('Fills every app with a seeded, realistic dataset. --scale 1 is production scale '
+            '(5k rooms, 100k users, 1M bookings, 2M chat messages, 1M notifications).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0.01, help='Multiplier on the production-scale row counts.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed and counts give the same rows.')
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help=f'Rows built and inserted per transaction (rounded up to a multiple of {RNG_BLOCK}).')
+        parser.add_argument('--workers', type=int, default=1, help='Processes writing chunks in parallel (not on SQLite).')
+        parser.add_argument('--count', action='append', default=[], metavar='NAME=ROWS',
+                            help=f"Override one row count; names: {', '.join(BASE_COUNTS)}.")
+
+    def handle(self, *args, **options):
+        overrides = {}
+        for item in options['count']:
+            name, _, value = item.partition('=')
+            if name not in BASE_COUNTS or not value.isdigit() or int(value) < 1:
+                raise CommandError(f"Invalid --count {item!r}")
+            overrides[name] = int(value)
+        counts = scaled_counts(options['scale'], overrides)
+
+        workers = max(options['workers'], 1)
+        if workers > 1 and connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING("SQLite allows one writer at a time; using a single process."))
+            workers = 1
+
+        tables = table_plan(counts)
+        chunk_size = max(1, -(-options['chunk_size'] // RNG_BLOCK)) * RNG_BLOCK
+        plan = {
+            'seed': options['seed'],
+            'counts': counts,
+            'now': timezone.now(),
+            'batch_size': min(chunk_size, 1000),
+            # Continue after existing rows so the command can run against a live dataset
+            'bases': {name: (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1 for name, model, _, _ in tables},
+            'tables': {name: (model, builder) for name, model, _, builder in tables},
+        }
+
+        started = time.monotonic()
+        with explicit_timestamps([model for _, model, _, _ in tables]):
+            if workers > 1:
+                # Forked workers open their own connections rather than sharing ours
+                connections.close_all()
+                pool = multiprocessing.get_context('fork').Pool(workers)
+            else:
+                pool = None
+            try:
+                for name, model, rows, _ in tables:
+                    table_started = time.monotonic()
+                    jobs = [(plan, name, start, min(start + chunk_size, rows)) for start in range(0, rows, chunk_size)]
+                    written = sum(pool.imap_unordered(write_chunk, jobs) if pool else map(write_chunk, jobs))
+                    self.stdout.write(f"{name}: {written} rows in {time.monotonic() - table_started:.1f}s")
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Generation failed: {str(e)}"))
+                logger.error(f"Synthetic data generation failed: {str(e)}")
+                raise
+            finally:
+                if pool:
+                    pool.close()
+                    pool.join()
+
+        self._reset_sequences([model for _, model, _, _ in tables])
+        self._rebuild_derived(plan)
+        total = sum(rows for _, _, rows, _ in tables)
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {total} rows across {len(tables)} tables in {time.monotonic() - started:.1f}s (seed {plan['seed']})."
+        ))
+
+    def _reset_sequences(self, models):
+        # Rows were inserted with explicit ids; move Postgres sequences past them
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def _rebuild_derived(self, plan):
+        """Bulk inserts skip the signals that maintain these; rebuild them once."""
+        from rooms.amenities import rebuild_room_amenities
+        from rooms.catalog import bump_version
+        from core import search
+        from core.cache import REGIONS
+
+        step = time.monotonic()
+        links = rebuild_room_amenities()
+        self.stdout.write(f"room amenities: {links} rows in {time.monotonic() - step:.1f}s")
+
+        step = time.monotonic()
+        first_user = plan['bases']['users']
+        unread = (
+            Notification.objects.filter(read=False, user_id__gte=first_user)
+            .values('user_id').annotate(unread=Count('id')).order_by()
+        )
+        counters = [UnreadNotificationCounter(user_id=row['user_id'], unread=row['unread']) for row in unread]
+        UnreadNotificationCounter.objects.bulk_create(counters, batch_size=1000, ignore_conflicts=True)
+        self.stdout.write(f"unread counters: {len(counters)} rows in {time.monotonic() - step:.1f}s")
+
+        step = time.monotonic()
+        entries = search.rebuild()
+        self.stdout.write(f"search index: {entries} entries in {time.monotonic() - step:.1f}s")
+
+        bump_version()
+        for region in REGIONS.values():
+            region.invalidate()
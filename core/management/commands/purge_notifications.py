@@ -0,0 +1,97 @@
+import time
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q, Min, Max
+from django.utils import timezone
+from core.models import Notification, NotificationArchive
+
+logger = logging.getLogger(__name__)
+
+
+def expired_notifications_filter(now=None) -> Q:
+    """Read notifications older than their type's retention period."""
+    now = now or timezone.now()
+    retention = getattr(settings, 'NOTIFICATION_RETENTION_DAYS', {})
+    default_days = getattr(settings, 'NOTIFICATION_RETENTION_DEFAULT_DAYS', 90)
+
+    known_types = [value for value, _ in Notification.TYPES]
+    expired = Q(created_at__lt=now - timedelta(days=default_days)) & ~Q(type__in=known_types)
+    for notification_type in known_types:
+        days = retention.get(notification_type, default_days)
+        expired |= Q(type=notification_type, created_at__lt=now - timedelta(days=days))
+    return Q(read=True) & expired
+
+
+class Command(BaseCommand):
+    help = 'Deletes (or archives) read notifications past their retention period, in primary-key windows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Width of each primary-key window.')
+        parser.add_argument('--archive', action='store_true', help='Copy rows to NotificationArchive before deleting.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would be removed.')
+        parser.add_argument('--sleep', type=float, default=0, help='Seconds to pause between windows.')
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        expired = expired_notifications_filter()
+        bounds = Notification.objects.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            self.stdout.write(self.style.SUCCESS("No notifications to purge."))
+            return
+
+        removed = archived = batches = 0
+        start = bounds['low']
+        while start <= bounds['high']:
+            window = Notification.objects.filter(expired, id__gte=start, id__lt=start + batch_size)
+            start += batch_size
+
+            if options['dry_run']:
+                removed += window.count()
+                continue
+
+            try:
+                # Each window is its own short transaction so locks are held
+                # only for ``batch_size`` ids at a time.
+                with transaction.atomic():
+                    rows = list(window.values('id', 'user_id', 'title', 'message', 'type', 'link', 'created_at'))
+                    if not rows:
+                        continue
+                    if options['archive']:
+                        NotificationArchive.objects.bulk_create([
+                            NotificationArchive(
+                                original_id=row['id'],
+                                user_id=row['user_id'],
+                                title=row['title'],
+                                message=row['message'],
+                                type=row['type'],
+                                link=row['link'],
+                                created_at=row['created_at'],
+                            )
+                            for row in rows
+                        ], ignore_conflicts=True)
+                        archived += len(rows)
+                    # Read rows only, so unread counters are unaffected; with no
+                    # delete signals on Notification this is a single DELETE.
+                    deleted, _ = Notification.objects.filter(id__in=[row['id'] for row in rows]).delete()
+                    removed += deleted
+                    batches += 1
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Purge failed at id {start - batch_size}: {str(e)}"))
+                logger.error(f"Notification purge failed: {str(e)}")
+                break
+
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Would remove {removed} read notifications."))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} read notifications in {batches} batches"
+            + (f", archived {archived}." if options['archive'] else ".")
+        ))
+        logger.info(f"Purged {removed} notifications ({archived} archived)")
@@ -0,0 +1,20 @@
+import logging
+from django.core.management.base import BaseCommand
+from core import search
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index for documents and chat attachments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows read and inserted per batch.')
+
+    def handle(self, *args, **options):
+        try:
+            total = search.rebuild(chunk_size=options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(f"Indexed {total} objects."))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"Rebuild failed: {str(e)}"))
+            logger.error(f"Search index rebuild failed: {str(e)}")
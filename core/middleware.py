@@ -0,0 +1,180 @@
+"""
+Per-request performance instrumentation.
+
+``PerformanceMiddleware`` times every request end to end, counts and times
+its database queries (via ``connection.execute_wrapper``), times building
+DRF ``serializer.data`` (queries run while serializing count in both) and
+the response render, then reports them three ways: a ``Server-Timing``
+header for the browser dev tools, one JSON log line on the
+``core.performance`` logger, and per-route samples kept in memory for the
+admin metrics endpoint.  With
+``NPLUSONE_DETECTION`` on, it also runs the N+1 detector (core/nplusone.py).
+"""
+import json
+import time
+import logging
+import threading
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.db import connection
+
+from rest_framework.serializers import BaseSerializer
+
+from core.nplusone import NPlusOneDetector
+
+logger = logging.getLogger('core.performance')
+
+SAMPLE_SIZE = 500
+
+_metrics_lock = threading.Lock()
+_route_samples = defaultdict(lambda: deque(maxlen=SAMPLE_SIZE))
+_route_counts = defaultdict(lambda: {'requests': 0, 'errors': 0})
+
+# Serializer time of the request running on this thread; None outside one
+_serializer_timing = threading.local()
+
+
+def install_serializer_timing():
+    """
+    Time ``serializer.data`` (list and single-object serializers both build
+    it in ``BaseSerializer.data``).  Nested serializers count once, towards
+    the outermost one.  Idempotent.
+    """
+    original = BaseSerializer.data
+    if getattr(original.fget, '_timed', False):
+        return
+
+    def data(self):
+        if getattr(_serializer_timing, 'total', None) is None or getattr(_serializer_timing, 'depth', 0):
+            return original.fget(self)
+        _serializer_timing.depth = 1
+        started = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            _serializer_timing.total += time.perf_counter() - started
+            _serializer_timing.depth = 0
+
+    data._timed = True
+    BaseSerializer.data = property(data)
+
+
+class QueryRecorder:
+    """``execute_wrapper`` hook that counts and times every query it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+def route_name(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return f'{request.method} <unresolved>'
+    return f'{request.method} /{match.route}'
+
+
+def record_request(route: str, wall: float, db: float, queries: int, serialize: float, render: float, status: int):
+    with _metrics_lock:
+        _route_samples[route].append((wall, db, queries, serialize, render))
+        _route_counts[route]['requests'] += 1
+        if status >= 500:
+            _route_counts[route]['errors'] += 1
+
+
+def route_metrics() -> dict:
+    """Per-route request counts and wall/DB/serializer/render percentiles (ms) for this worker."""
+    with _metrics_lock:
+        snapshot = {route: (list(samples), dict(_route_counts[route])) for route, samples in _route_samples.items()}
+
+    result = {}
+    for route, (samples, counts) in snapshot.items():
+        def pct(column, p, scale=1000):
+            values = sorted(sample[column] for sample in samples)
+            return round(values[min(len(values) - 1, int(p * len(values)))] * scale, 2) if values else 0
+        result[route] = {
+            **counts,
+            'p50Ms': pct(0, 0.5),
+            'p95Ms': pct(0, 0.95),
+            'p99Ms': pct(0, 0.99),
+            'maxMs': pct(0, 1),
+            'dbP50Ms': pct(1, 0.5),
+            'dbP95Ms': pct(1, 0.95),
+            'queriesP50': pct(2, 0.5, scale=1),
+            'queriesP95': pct(2, 0.95, scale=1),
+            'serializeP95Ms': pct(3, 0.95),
+            'renderP95Ms': pct(4, 0.95),
+        }
+    return dict(sorted(result.items(), key=lambda item: -item[1]['p95Ms']))
+
+
+class PerformanceMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install_serializer_timing()
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        detector = NPlusOneDetector() if getattr(settings, 'NPLUSONE_DETECTION', False) else None
+        request._render_time = 0.0
+        _serializer_timing.total, _serializer_timing.depth = 0.0, 0
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(recorder):
+                if detector is None:
+                    response = self.get_response(request)
+                else:
+                    with connection.execute_wrapper(detector):
+                        response = self.get_response(request)
+        finally:
+            serialize, _serializer_timing.total = _serializer_timing.total, None
+        wall = time.perf_counter() - started
+
+        route = route_name(request)
+        if detector is not None:
+            detector.check(route)
+        render = request._render_time
+        size = None if response.streaming else len(response.content)
+        record_request(route, wall, recorder.duration, recorder.count, serialize, render, response.status_code)
+
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={wall * 1000:.1f}',
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"',
+            f'serialize;dur={serialize * 1000:.1f}',
+            f'render;dur={render * 1000:.1f}',
+        ])
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'event': 'request',
+                'method': request.method,
+                'path': request.path,
+                'route': route,
+                'status': response.status_code,
+                'durationMs': round(wall * 1000, 2),
+                'dbMs': round(recorder.duration * 1000, 2),
+                'queries': recorder.count,
+                'serializeMs': round(serialize * 1000, 2),
+                'renderMs': round(render * 1000, 2),
+                'bytes': size,
+            }))
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time that step
+        # with a post-render callback.
+        render_started = time.perf_counter()
+
+        def rendered(response):
+            request._render_time = time.perf_counter() - render_started
+
+        response.add_post_render_callback(rendered)
+        return response
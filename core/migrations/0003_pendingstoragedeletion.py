@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_storedobject"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingStorageDeletion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.CharField(max_length=100)),
+                ("path", models.CharField(max_length=500)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["id"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("bucket", "path"),
+                        name="unique_pending_storage_deletion",
+                    )
+                ],
+            },
+        ),
+    ]
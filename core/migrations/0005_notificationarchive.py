@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_unreadnotificationcounter"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("original_id", models.BigIntegerField(unique=True)),
+                ("title", models.CharField(max_length=255)),
+                ("message", models.TextField()),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("rent_due", "Rent Due"),
+                            ("rent_overdue", "Rent Overdue"),
+                            ("document_review", "Document Review"),
+                            ("assignment", "Assignment"),
+                            ("general", "General"),
+                        ],
+                        default="general",
+                        max_length=30,
+                    ),
+                ),
+                ("link", models.CharField(blank=True, default="", max_length=500)),
+                ("created_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_notifications",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
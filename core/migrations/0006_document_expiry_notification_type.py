@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_notificationarchive"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="notification",
+            name="type",
+            field=models.CharField(
+                choices=[
+                    ("rent_due", "Rent Due"),
+                    ("rent_overdue", "Rent Overdue"),
+                    ("document_review", "Document Review"),
+                    ("document_expiry", "Document Expiry"),
+                    ("assignment", "Assignment"),
+                    ("general", "General"),
+                ],
+                default="general",
+                max_length=30,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notificationarchive",
+            name="type",
+            field=models.CharField(
+                choices=[
+                    ("rent_due", "Rent Due"),
+                    ("rent_overdue", "Rent Overdue"),
+                    ("document_review", "Document Review"),
+                    ("document_expiry", "Document Expiry"),
+                    ("assignment", "Assignment"),
+                    ("general", "General"),
+                ],
+                default="general",
+                max_length=30,
+            ),
+        ),
+    ]
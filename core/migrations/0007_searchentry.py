@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_document_expiry_notification_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("document", "Property Document"),
+                            ("chat_attachment", "Chat Attachment"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("title", models.CharField(blank=True, default="", max_length=255)),
+                ("body", models.TextField(blank=True, default="")),
+                (
+                    "property_name",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "object_id"), name="unique_search_entry"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,77 @@
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE core_searchentry ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(property_name, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX core_searchentry_vector_idx ON core_searchentry USING GIN (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS core_searchentry_vector_idx",
+    "ALTER TABLE core_searchentry DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_searchentry_fts USING fts5(
+        title, property_name, body,
+        content='core_searchentry', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER core_searchentry_fts_ai AFTER INSERT ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(rowid, title, property_name, body)
+        VALUES (new.id, new.title, new.property_name, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_searchentry_fts_ad AFTER DELETE ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, property_name, body)
+        VALUES ('delete', old.id, old.title, old.property_name, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_searchentry_fts_au AFTER UPDATE ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, property_name, body)
+        VALUES ('delete', old.id, old.title, old.property_name, old.body);
+        INSERT INTO core_searchentry_fts(rowid, title, property_name, body)
+        VALUES (new.id, new.title, new.property_name, new.body);
+    END
+    """,
+    "INSERT INTO core_searchentry_fts(core_searchentry_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS core_searchentry_fts_au",
+    "DROP TRIGGER IF EXISTS core_searchentry_fts_ad",
+    "DROP TRIGGER IF EXISTS core_searchentry_fts_ai",
+    "DROP TABLE IF EXISTS core_searchentry_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_searchentry"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": POSTGRES_REVERSE, "sqlite": SQLITE_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def backfill_search_entries(apps, schema_editor):
+    from core import search
+
+    search.index_missing(
+        apps.get_model("rooms", "PropertyDocument"),
+        apps.get_model("bookings_app", "ChatMessage"),
+        apps.get_model("core", "SearchEntry"),
+    )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0008_searchentry_fulltext"),
+        ("rooms", "0020_updated_at"),
+        ("bookings_app", "0006_rentpayment_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_entries, migrations.RunPython.noop),
+    ]
@@ -8,6 +8,7 @@ class Notification(models.Model):
         ('rent_due', 'Rent Due'),
         ('rent_overdue', 'Rent Overdue'),
         ('document_review', 'Document Review'),
+        ('document_expiry', 'Document Expiry'),
         ('assignment', 'Assignment'),
         ('general', 'General'),
     )
@@ -22,6 +23,113 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'read', '-created_at'], name='notification_user_read_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username}: {self.title} ({'read' if self.read else 'unread'})"
+
+
+class NotificationArchive(models.Model):
+    """Read notifications moved out of the hot table by ``purge_notifications --archive``."""
+    original_id = models.BigIntegerField(unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications')
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    type = models.CharField(max_length=30, choices=Notification.TYPES, default='general')
+    link = models.CharField(max_length=500, blank=True, default='')
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.user_id}: {self.title} (archived)"
+
+
+class UnreadNotificationCounter(models.Model):
+    """
+    Per-user unread notification count, kept in step with ``Notification``
+    by atomic increments/decrements so the badge never needs a ``COUNT(*)``.
+    A missing row means the counter hasn't been initialised yet; it is
+    backfilled from the table on first read.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='unread_notification_counter')
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
+
+
+class StoredObject(models.Model):
+    """
+    A content-addressed object in storage.  The object key is derived from the
+    SHA-256 of its bytes, so identical uploads share one object and
+    ``ref_count`` tracks how many uploads still point at it.
+    """
+    bucket = models.CharField(max_length=100)
+    path = models.CharField(max_length=500)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField(default=0)
+    content_type = models.CharField(max_length=100, blank=True, default='')
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'path'], name='unique_stored_object_path'),
+        ]
+
+    def __str__(self):
+        return f"{self.bucket}/{self.path} ({self.ref_count} refs)"
+
+
+class PendingStorageDeletion(models.Model):
+    """
+    A storage object waiting to be removed by the ``flush_storage_deletions``
+    worker, so request handlers never block on storage round trips.
+    """
+    bucket = models.CharField(max_length=100)
+    path = models.CharField(max_length=500)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'path'], name='unique_pending_storage_deletion'),
+        ]
+
+    def __str__(self):
+        return f"{self.bucket}/{self.path} (attempts: {self.attempts})"
+
+
+class SearchEntry(models.Model):
+    """
+    One searchable row per indexed object (documents, chat attachments).
+    The full-text index itself is backend specific and lives outside the
+    ORM: a generated ``tsvector`` column with a GIN index on PostgreSQL, an
+    FTS5 table kept in sync by triggers on SQLite (see migration 0008).
+    """
+    KINDS = (
+        ('document', 'Property Document'),
+        ('chat_attachment', 'Chat Attachment'),
+    )
+
+    kind = models.CharField(max_length=30, choices=KINDS)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=255, blank=True, default='')
+    body = models.TextField(blank=True, default='')
+    property_name = models.CharField(max_length=255, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_entry'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.title}"
@@ -0,0 +1,193 @@
+"""
+Notification dispatch.
+
+Fans one notification out to a set of users with a single ``bulk_create``.
+Role-wide sends (e.g. "all admins") use a recipient list cached in the
+``roles`` region, which is invalidated whenever a ``Client`` changes, and by default run on a
+background thread after the surrounding transaction commits so the request
+that triggered them doesn't wait on the fan-out.
+"""
+import time
+import logging
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Max
+from django.db.models.functions import Greatest
+from django.contrib.auth.models import User
+
+from core.cache import roles
+from core.models import Notification, UnreadNotificationCounter
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notifications')
+
+
+def role_user_ids(role: str) -> list:
+    """IDs of every user with the given ``Client.role``, cached until a role changes."""
+    return roles.get_or_set(
+        f'recipients:{role}',
+        lambda: list(User.objects.filter(client__role=role).values_list('id', flat=True)),
+    )
+
+
+def send_notifications(notifications) -> int:
+    """
+    Insert prepared ``Notification`` instances with one ``bulk_create`` and
+    bump each recipient's unread counter (one UPDATE per distinct count).
+    """
+    notifications = list(notifications)
+    if not notifications:
+        return 0
+
+    per_user = Counter(n.user_id for n in notifications if not n.read)
+    users_by_delta = defaultdict(list)
+    for user_id, delta in per_user.items():
+        users_by_delta[delta].append(user_id)
+
+    with transaction.atomic():
+        Notification.objects.bulk_create(notifications, batch_size=500)
+        for delta, user_ids in users_by_delta.items():
+            adjust_unread_count(user_ids, delta)
+        announce()
+    return len(notifications)
+
+
+def notify_users(user_ids, title: str, message: str, type: str = 'general', link: str = '') -> int:
+    """Create the same notification for every user in ``user_ids`` in one query."""
+    return send_notifications(
+        Notification(user_id=user_id, title=title, message=message, type=type, link=link)
+        for user_id in set(user_ids)
+    )
+
+
+# ─── Unread counters ─────────────────────────────────────────────────
+
+def unread_count(user_id) -> int:
+    """The user's unread count, initialised from the table on first use."""
+    counter = UnreadNotificationCounter.objects.filter(user_id=user_id).values_list('unread', flat=True).first()
+    if counter is not None:
+        return counter
+    # Commit an empty row first so every adjust_unread_count from here on
+    # lands on it, then count under its lock: send_notifications bumps the
+    # counter in the same transaction as the insert, so a send still in
+    # flight either holds the lock (we wait and then see its rows) or adds
+    # its delta on top once we're done.
+    UnreadNotificationCounter.objects.get_or_create(user_id=user_id)
+    with transaction.atomic():
+        UnreadNotificationCounter.objects.select_for_update().filter(user_id=user_id).first()
+        count = Notification.objects.filter(user_id=user_id, read=False).count()
+        UnreadNotificationCounter.objects.filter(user_id=user_id).update(unread=count)
+    return count
+
+
+def adjust_unread_count(user_ids, delta: int):
+    """
+    Atomically add ``delta`` to each user's counter in one UPDATE.  Users
+    without a counter row are skipped; their count is taken from the table
+    when first read, which already includes this change.
+    """
+    if not delta or not user_ids:
+        return
+    user_ids = user_ids if isinstance(user_ids, (list, tuple, set)) else [user_ids]
+    UnreadNotificationCounter.objects.filter(user_id__in=user_ids).update(
+        unread=Greatest(F('unread') + delta, 0)
+    )
+
+
+def reset_unread_count(user_ids):
+    """Drop the counters so the next read recounts from the table."""
+    user_ids = user_ids if isinstance(user_ids, (list, tuple, set)) else [user_ids]
+    UnreadNotificationCounter.objects.filter(user_id__in=user_ids).delete()
+
+
+def _run_in_background(func, *args, **kwargs):
+    def job():
+        close_old_connections()
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            logger.exception("Background notification dispatch failed")
+        finally:
+            close_old_connections()
+
+    _executor.submit(job)
+
+
+def notify_role(role: str, title: str, message: str, type: str = 'general', link: str = '', defer: bool = None):
+    """
+    Notify every user with ``role``.  When ``defer`` is true (the default,
+    see ``NOTIFICATIONS_ASYNC``) the fan-out runs on a background thread once
+    the current transaction commits.
+    """
+    if defer is None:
+        defer = getattr(settings, 'NOTIFICATIONS_ASYNC', True)
+
+    def dispatch():
+        notify_users(role_user_ids(role), title, message, type=type, link=link)
+
+    if defer:
+        transaction.on_commit(lambda: _run_in_background(dispatch))
+    else:
+        dispatch()
+
+
+def notify_admins(title: str, message: str, type: str = 'general', link: str = '', defer: bool = None):
+    notify_role('admin', title, message, type=type, link=link, defer=defer)
+
+
+# ─── Polling and streaming ───────────────────────────────────────────
+#
+# New notifications are detected through a shared high-water mark (the
+# table's max id), refreshed at most once per NOTIFICATION_POLL_INTERVAL for
+# every poller and stream in the process, and immediately when this process
+# commits a notification.  A client whose cursor is at the mark is answered
+# without a query of its own.
+
+_high_water = {'id': 0, 'checked': 0.0}
+_high_water_lock = threading.Lock()
+
+
+def _wake():
+    with _high_water_lock:
+        _high_water['checked'] = 0.0
+
+
+def announce():
+    """Refresh the high-water mark once the current transaction commits."""
+    transaction.on_commit(_wake)
+
+
+def high_water_mark(max_age: float = None) -> int:
+    """Largest notification id seen by this process, refreshed when stale."""
+    if max_age is None:
+        max_age = getattr(settings, 'NOTIFICATION_POLL_INTERVAL', 2)
+    with _high_water_lock:
+        if time.monotonic() - _high_water['checked'] >= max_age:
+            _high_water['id'] = Notification.objects.aggregate(latest=Max('id'))['latest'] or 0
+            _high_water['checked'] = time.monotonic()
+        return _high_water['id']
+
+
+def latest_id_for(user_id) -> int:
+    return Notification.objects.filter(user_id=user_id).aggregate(latest=Max('id'))['latest'] or 0
+
+
+def notifications_after(user_id, cursor: int, limit: int = 50) -> list:
+    return list(Notification.objects.filter(user_id=user_id, id__gt=cursor).order_by('id')[:limit])
+
+
+def check_for_notifications(user_id, cursor: int, seen_high_water: int, max_age: float = None):
+    """
+    One non-blocking check.  Returns ``(notifications, high_water)``; the
+    user's rows are only queried when the high-water mark has moved past
+    both the cursor and the mark seen on the previous check.
+    """
+    high_water = high_water_mark(max_age)
+    if high_water > cursor and high_water != seen_high_water:
+        return notifications_after(user_id, cursor), high_water
+    return [], high_water
+
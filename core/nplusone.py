@@ -0,0 +1,118 @@
+"""
+N+1 query detection.
+
+Every query is reduced to a fingerprint (literals and parameter lists
+collapsed) and counted; a fingerprint seen ``NPLUSONE_THRESHOLD`` times in
+one request is reported together with the project code that issued it, which
+is almost always a per-row lookup in a serializer or loop.
+
+Off unless ``NPLUSONE_DETECTION`` is set, in which case
+``PerformanceMiddleware`` checks every request: findings are logged as
+warnings, or raise ``NPlusOneError`` with ``NPLUSONE_STRICT`` so tests fail.
+Tests can also wrap any block directly::
+
+    with detect_n_plus_one(strict=True):
+        self.client.get('/api/bookings/channels/')
+"""
+import os
+import re
+import logging
+import traceback
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_APPS = ('rooms', 'bookings_app', 'core', 'accounts')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+_SELECT_LIST = re.compile(r'^SELECT (?:DISTINCT )?.*? FROM ', re.IGNORECASE)
+_IGNORED = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT', 'BEGIN', 'COMMIT')
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def fingerprint(sql: str) -> str:
+    """The query's shape: literals become ``?`` and ``IN (...)`` lists collapse."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def _project_dirs(apps) -> tuple:
+    return tuple(os.path.join(str(settings.BASE_DIR), app) + os.sep for app in apps)
+
+
+def origin_frame(project_dirs) -> str:
+    """``path:line in function`` of the innermost project frame on the stack."""
+    own_files = (__file__, os.path.join(os.path.dirname(__file__), 'middleware.py'))
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if filename in own_files or f'{os.sep}migrations{os.sep}' in filename:
+            continue
+        if filename.startswith(project_dirs):
+            relative = os.path.relpath(filename, str(settings.BASE_DIR))
+            return f'{relative}:{frame.lineno} in {frame.name}'
+    return '<outside project code>'
+
+
+class NPlusOneDetector:
+    """``execute_wrapper`` hook that counts queries per fingerprint."""
+
+    def __init__(self, threshold: int = None, apps=None):
+        self.threshold = threshold if threshold is not None else getattr(settings, 'NPLUSONE_THRESHOLD', 3)
+        self.project_dirs = _project_dirs(apps or getattr(settings, 'NPLUSONE_APPS', DEFAULT_APPS))
+        self.counts = {}
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(_IGNORED):
+            key = fingerprint(sql)
+            count = self.counts.get(key, 0) + 1
+            self.counts[key] = count
+            # The stack is only walked once a shape repeats
+            if count == 2:
+                self.origins[key] = origin_frame(self.project_dirs)
+        return execute(sql, params, many, context)
+
+    def findings(self) -> list:
+        return [
+            {'query': key, 'count': count, 'origin': self.origins.get(key)}
+            for key, count in sorted(self.counts.items(), key=lambda item: -item[1])
+            if count >= self.threshold
+        ]
+
+    def check(self, label: str, strict: bool = None):
+        """Log (or, in strict mode, raise on) repeated same-shape queries."""
+        findings = self.findings()
+        if not findings:
+            return findings
+        if strict is None:
+            strict = getattr(settings, 'NPLUSONE_STRICT', False)
+        lines = [
+            f"{f['count']}x {_SELECT_LIST.sub('SELECT ... FROM ', f['query'], count=1)[:300]}\n    from {f['origin']}"
+            for f in findings
+        ]
+        message = f"Possible N+1 queries in {label}:\n  " + '\n  '.join(lines)
+        if strict:
+            raise NPlusOneError(message)
+        logger.warning(message)
+        return findings
+
+
+@contextmanager
+def detect_n_plus_one(threshold: int = None, strict: bool = True, label: str = 'block'):
+    """Check the queries run inside the block; raises ``NPlusOneError`` by default."""
+    detector = NPlusOneDetector(threshold=threshold)
+    with connection.execute_wrapper(detector):
+        yield detector
+    detector.check(label, strict=strict)
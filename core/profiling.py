@@ -0,0 +1,167 @@
+"""
+On-demand profiling of a single request.
+
+An admin sends ``X-Profile: 1`` (or ``?_profile=1``) and that one request
+runs under cProfile; ``X-Profile: memory`` / ``?_profile=memory`` also traces
+allocations with tracemalloc.  The report is written to ``PROFILE_DIR`` as
+``<id>.prof`` (pstats, for snakeviz and friends), ``<id>.txt`` (top functions
+and allocations) and ``<id>.json`` (request metadata), and the id comes back
+in the ``X-Profile-Id`` header.  Requests without the flag only pay for the
+header lookup.
+"""
+import io
+import os
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import logging
+import threading
+import tracemalloc
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = '_profile'
+REPORT_FUNCTIONS = 40
+REPORT_ALLOCATIONS = 25
+
+# tracemalloc is process-wide, so only one memory profile runs at a time
+_memory_lock = threading.Lock()
+
+
+def profile_dir() -> str:
+    return str(getattr(settings, 'PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+
+
+def requested_mode(request):
+    """``'cpu'``, ``'memory'`` or None, from the header or query flag."""
+    value = request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+    if not value or value.lower() in ('0', 'false', 'no'):
+        return None
+    return 'memory' if value.lower() == 'memory' else 'cpu'
+
+
+def is_admin_request(request) -> bool:
+    from accounts.authentication import SupabaseAuthentication
+    from rest_framework.exceptions import AuthenticationFailed
+
+    try:
+        result = SupabaseAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    if not result:
+        return False
+    user = result[0]
+    client = getattr(user, 'client', None)
+    return bool(user.is_staff or getattr(client, 'role', None) == 'admin')
+
+
+def list_profiles() -> list:
+    """Metadata of stored profiles, newest first."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in os.listdir(directory):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as fh:
+                profiles.append(json.load(fh))
+        except (OSError, ValueError):
+            continue
+    return sorted(profiles, key=lambda meta: meta.get('createdAt', ''), reverse=True)
+
+
+def profile_path(profile_id: str, extension: str):
+    """Path of a stored report file, or None for unknown ids and extensions."""
+    if extension not in ('prof', 'txt', 'json') or not profile_id.replace('-', '').isalnum():
+        return None
+    path = os.path.join(profile_dir(), f'{profile_id}.{extension}')
+    return path if os.path.isfile(path) else None
+
+
+def _prune(directory: str):
+    keep = getattr(settings, 'PROFILE_MAX_REPORTS', 100)
+    stale = [meta['id'] for meta in list_profiles()[keep:]]
+    for profile_id in stale:
+        for extension in ('prof', 'txt', 'json'):
+            try:
+                os.remove(os.path.join(directory, f'{profile_id}.{extension}'))
+            except FileNotFoundError:
+                pass
+
+
+def _write_report(request, response, profiler, snapshot, elapsed: float) -> str:
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    created = timezone.now()
+    profile_id = f"{created:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+    profiler.dump_stats(os.path.join(directory, f'{profile_id}.prof'))
+
+    report = io.StringIO()
+    report.write(f'{request.method} {request.get_full_path()} -> {response.status_code} in {elapsed * 1000:.1f} ms\n\n')
+    stats = pstats.Stats(profiler, stream=report)
+    stats.sort_stats('cumulative').print_stats(REPORT_FUNCTIONS)
+    if snapshot is not None:
+        report.write(f'\nTop {REPORT_ALLOCATIONS} allocation sites\n')
+        for stat in snapshot.statistics('lineno')[:REPORT_ALLOCATIONS]:
+            report.write(f'{stat}\n')
+    with open(os.path.join(directory, f'{profile_id}.txt'), 'w') as fh:
+        fh.write(report.getvalue())
+
+    with open(os.path.join(directory, f'{profile_id}.json'), 'w') as fh:
+        json.dump({
+            'id': profile_id,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'durationMs': round(elapsed * 1000, 2),
+            'memory': snapshot is not None,
+            'createdAt': created.isoformat(),
+        }, fh)
+
+    _prune(directory)
+    return profile_id
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = requested_mode(request)
+        if mode is None or not is_admin_request(request):
+            return self.get_response(request)
+
+        trace_memory = mode == 'memory' and _memory_lock.acquire(blocking=False)
+        profiler = cProfile.Profile()
+        snapshot = None
+        try:
+            if trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            elapsed = time.perf_counter() - started
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+                _memory_lock.release()
+
+        try:
+            response['X-Profile-Id'] = _write_report(request, response, profiler, snapshot, elapsed)
+        except Exception as e:
+            logger.error(f"Failed to write profile for {request.path}: {e}")
+        return response
@@ -0,0 +1,226 @@
+"""
+Full-text search over property documents and chat attachments.
+
+Each indexed object has one ``SearchEntry`` row, kept current by signals on
+save/delete.  Queries go to the backend's native full-text index: a weighted
+``tsvector`` with a GIN index on PostgreSQL, FTS5 with bm25 ranking on
+SQLite.  Other backends fall back to ``icontains``.
+"""
+import re
+import logging
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+
+from core.models import SearchEntry
+
+logger = logging.getLogger(__name__)
+
+SNIPPET_START = '<mark>'
+SNIPPET_STOP = '</mark>'
+# The database marks matches with private-use characters; the snippet is
+# HTML-escaped before they become <mark> tags, so indexed text can't inject
+# markup into clients that render snippets as HTML.
+_MATCH_START = '\ue000'
+_MATCH_STOP = '\ue001'
+
+# Extraction failures are stored on the message as bracketed notes
+_EXTRACTION_NOTE = re.compile(r'^\[(Error|Unsupported|Failed)[^\]]*\]$', re.DOTALL)
+
+
+def document_entry(doc) -> dict:
+    metadata_text = ' '.join(str(value) for value in (doc.metadata or {}).values() if isinstance(value, (str, int, float)))
+    return {
+        'title': doc.name[:255],
+        'body': '\n'.join(part for part in (doc.get_type_display(), doc.description, doc.notes, doc.admin_notes, metadata_text) if part),
+        'property_name': (doc.property_id or '')[:255],
+    }
+
+
+def chat_attachment_entry(message):
+    text = (message.extracted_text or '').strip()
+    if not message.file_url or not text or _EXTRACTION_NOTE.match(text):
+        return None
+    return {
+        'title': (message.file_name or message.file_url.rsplit('/', 1)[-1])[:255],
+        'body': text,
+        'property_name': message.channel.property_name[:255],
+    }
+
+
+def index_object(kind: str, object_id, fields):
+    """Insert/refresh the entry for one object, or drop it when ``fields`` is None."""
+    if fields is None:
+        remove_object(kind, object_id)
+        return
+    SearchEntry.objects.update_or_create(kind=kind, object_id=object_id, defaults=fields)
+
+
+def remove_object(kind: str, object_id):
+    SearchEntry.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def rename_property(property_id, name: str):
+    """Rewrite ``property_name`` on the entries of one property's documents and chat attachments."""
+    from rooms.models import PropertyDocument
+    from bookings_app.models import ChatMessage
+
+    documents = PropertyDocument.objects.filter(property_ref_id=property_id).values('pk')
+    attachments = ChatMessage.objects.filter(channel__property_ref_id=property_id).values('pk')
+    SearchEntry.objects.filter(
+        Q(kind='document', object_id__in=documents) | Q(kind='chat_attachment', object_id__in=attachments)
+    ).update(property_name=name[:255])
+
+
+# Dropped from SQLite queries, as PostgreSQL's english configuration does
+_STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the this to was were with'.split()
+)
+
+
+def _fts5_query(query: str) -> str:
+    # Quote every term so user input can't use FTS5 syntax; prefix-match the last one
+    terms = [term for term in re.findall(r'\w+', query) if term.lower() not in _STOPWORDS]
+    if not terms:
+        return ''
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search(query: str, kind: str = None, limit: int = 20) -> list:
+    """
+    Ranked matches for ``query``, best first, each with an HTML-escaped
+    snippet of the matching text, matches wrapped in ``<mark>``.
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        results = _search_postgres(query, kind, limit)
+    elif vendor == 'sqlite':
+        results = _search_sqlite(query, kind, limit)
+    else:
+        results = _search_fallback(query, kind, limit)
+    for result in results:
+        result['snippet'] = _highlight(result['snippet'] or '')
+    return results
+
+
+def _highlight(snippet: str) -> str:
+    return escape(snippet).replace(_MATCH_START, SNIPPET_START).replace(_MATCH_STOP, SNIPPET_STOP)
+
+
+def _rows(cursor) -> list:
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _search_postgres(query, kind, limit):
+    kind_filter = 'AND e.kind = %s' if kind else ''
+    # Headlines are expensive, so only build them for the rows being returned
+    sql = f"""
+        SELECT hit.id, hit.kind, hit.object_id, hit.title, hit.property_name, hit.rank,
+               ts_headline('english', hit.body, hit.q, %s) AS snippet
+        FROM (
+            SELECT e.id, e.kind, e.object_id, e.title, e.property_name, e.body, q,
+                   ts_rank_cd(e.search_vector, q) AS rank
+            FROM core_searchentry e, websearch_to_tsquery('english', %s) q
+            WHERE e.search_vector @@ q {kind_filter}
+            ORDER BY rank DESC
+            LIMIT %s
+        ) hit
+        ORDER BY hit.rank DESC
+    """
+    options = f'StartSel={_MATCH_START}, StopSel={_MATCH_STOP}, MaxFragments=2, MaxWords=20, MinWords=5'
+    params = [options, query] + ([kind] if kind else []) + [limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return _rows(cursor)
+
+
+def _search_sqlite(query, kind, limit):
+    match = _fts5_query(query)
+    if not match:
+        return []
+    kind_filter = 'AND e.kind = %s' if kind else ''
+    # bm25 weights: title, property name, body.  Lower bm25 is better.
+    sql = f"""
+        SELECT e.id, e.kind, e.object_id, e.title, e.property_name,
+               -bm25(core_searchentry_fts, 10.0, 4.0, 1.0) AS rank,
+               snippet(core_searchentry_fts, 2, %s, %s, '…', 16) AS snippet
+        FROM core_searchentry_fts
+        JOIN core_searchentry e ON e.id = core_searchentry_fts.rowid
+        WHERE core_searchentry_fts MATCH %s {kind_filter}
+        ORDER BY rank DESC
+        LIMIT %s
+    """
+    params = [_MATCH_START, _MATCH_STOP, match] + ([kind] if kind else []) + [limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return _rows(cursor)
+
+
+def _search_fallback(query, kind, limit):
+    qs = SearchEntry.objects.filter(Q(title__icontains=query) | Q(body__icontains=query))
+    if kind:
+        qs = qs.filter(kind=kind)
+    results = []
+    for entry in qs.order_by('-updated_at')[:limit]:
+        position = entry.body.lower().find(query.lower())
+        if position >= 0:
+            end = position + len(query)
+            snippet = (entry.body[max(position - 60, 0):position] + _MATCH_START + entry.body[position:end]
+                       + _MATCH_STOP + entry.body[end:end + 60])
+        else:
+            snippet = entry.body[:120]
+        results.append({
+            'id': entry.id, 'kind': entry.kind, 'object_id': entry.object_id, 'title': entry.title,
+            'property_name': entry.property_name, 'rank': 0, 'snippet': snippet,
+        })
+    return results
+
+
+def rebuild(chunk_size: int = 1000) -> int:
+    """Re-create every entry from the source tables; returns the number indexed."""
+    from rooms.models import PropertyDocument
+    from bookings_app.models import ChatMessage
+
+    SearchEntry.objects.all().delete()
+    return index_missing(PropertyDocument, ChatMessage, SearchEntry, chunk_size=chunk_size)
+
+
+def index_missing(document_model, message_model, entry_model, chunk_size: int = 1000) -> int:
+    """
+    Add entries for documents and chat attachments that have none (existing
+    entries are kept).  Takes the models so migrations can pass historical ones.
+    """
+    total = 0
+
+    def insert(batch):
+        return len(entry_model.objects.bulk_create(batch, ignore_conflicts=True))
+
+    batch = []
+    for doc in document_model.objects.order_by('id').iterator(chunk_size=chunk_size):
+        batch.append(entry_model(kind='document', object_id=doc.id, **document_entry(doc)))
+        if len(batch) >= chunk_size:
+            total += insert(batch)
+            batch = []
+
+    messages = (
+        message_model.objects.filter(file_url__isnull=False).exclude(extracted_text__isnull=True)
+        .exclude(extracted_text='').select_related('channel').order_by('id')
+    )
+    for message in messages.iterator(chunk_size=chunk_size):
+        fields = chat_attachment_entry(message)
+        if fields:
+            batch.append(entry_model(kind='chat_attachment', object_id=message.id, **fields))
+        if len(batch) >= chunk_size:
+            total += insert(batch)
+            batch = []
+
+    if batch:
+        total += insert(batch)
+    return total
@@ -0,0 +1,72 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import Client
+from rooms.models import Property, Room, PropertyImage, PropertyDocument
+from bookings_app.models import Booking, TenantAssignment, ChatMessage
+from core import cache, search
+from core.models import Notification
+from core.notifications import adjust_unread_count, reset_unread_count, announce
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, **kwargs):
+    if created:
+        if not instance.read:
+            adjust_unread_count(instance.user_id, 1)
+        announce()
+    else:
+        # Edits outside the mark-read endpoints (e.g. Django admin) may flip
+        # ``read``; recount rather than guess the previous state.
+        reset_unread_count(instance.user_id)
+
+
+# No post_delete receiver on purpose: one would make every queryset delete
+# (the windowed purge, cascades from User) load and signal row by row.
+# Code deleting unread notifications calls reset_unread_count itself.
+
+
+# ─── Search index ────────────────────────────────────────────────────
+
+@receiver(post_save, sender=PropertyDocument)
+def index_property_document(sender, instance, **kwargs):
+    search.index_object('document', instance.pk, search.document_entry(instance))
+
+
+@receiver(post_delete, sender=PropertyDocument)
+def unindex_property_document(sender, instance, **kwargs):
+    search.remove_object('document', instance.pk)
+
+
+@receiver(post_save, sender=ChatMessage)
+def index_chat_message(sender, instance, **kwargs):
+    if instance.file_url:
+        search.index_object('chat_attachment', instance.pk, search.chat_attachment_entry(instance))
+
+
+@receiver(post_delete, sender=ChatMessage)
+def unindex_chat_message(sender, instance, **kwargs):
+    if instance.file_url:
+        search.remove_object('chat_attachment', instance.pk)
+
+
+# ─── Cache regions ───────────────────────────────────────────────────
+
+REGION_INVALIDATIONS = {
+    Room: (cache.catalog, cache.property_summary, cache.stats),
+    PropertyImage: (cache.catalog, cache.property_summary),
+    Property: (cache.catalog, cache.property_summary),
+    Booking: (cache.stats,),
+    TenantAssignment: (cache.stats,),
+    Client: (cache.roles,),
+}
+
+
+def invalidate_regions(sender, **kwargs):
+    for region in REGION_INVALIDATIONS[sender]:
+        region.invalidate_on_commit()
+
+
+for model in REGION_INVALIDATIONS:
+    post_save.connect(invalidate_regions, sender=model, dispatch_uid=f'cache_regions_saved_{model.__name__}')
+    post_delete.connect(invalidate_regions, sender=model, dispatch_uid=f'cache_regions_deleted_{model.__name__}')
@@ -1,13 +1,363 @@
 import os
+import time
 import uuid
+import hashlib
 import logging
+import tempfile
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from urllib.parse import urlparse
 from django.conf import settings
-from supabase import create_client, Client
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.dateparse import parse_datetime
+from django.utils.module_loading import import_string
+from supabase import create_client, Client, ClientOptions
+
+from core import http_client
+from core.models import StoredObject, PendingStorageDeletion
 
 logger = logging.getLogger(__name__)
 
+# Object keys are content hashes, so a given URL always serves the same bytes
+# and can be cached by browsers/CDNs for a year.
+IMMUTABLE_CACHE_SECONDS = 31536000
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
+DOCUMENT_EXTENSIONS = {
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.csv',
+    '.jpg', '.jpeg', '.png', '.webp', '.gif'
+}
+
+STORAGE_BACKENDS = {
+    'supabase': 'core.storage_backends.SupabaseStorage',
+    'local': 'core.storage_backends.LocalStorage',
+}
+
+
+class BaseStorage:
+    """
+    Upload, reference-counting and deletion logic shared by every backend.
+    Subclasses only implement the object primitives (put, exists, remove,
+    list, info, public URL and signed upload URL).
+    """
+
+    # ── Backend primitives ───────────────────────────────────────────────
+
+    def _require_configured(self):
+        pass
+
+    def _ensure_bucket(self, bucket_name: str, public: bool = True):
+        pass
+
+    def _do_upload(self, bucket_name: str, file_path: str, file_content: bytes, content_type: str) -> str:
+        raise NotImplementedError
+
+    def _object_exists(self, bucket_name: str, file_path: str) -> bool:
+        raise NotImplementedError
+
+    def _object_info(self, bucket_name: str, file_path: str) -> dict:
+        """Return ``{'size': int, 'content_type': str}`` for a stored object."""
+        raise NotImplementedError
+
+    def _signed_upload_url(self, bucket_name: str, file_path: str) -> dict:
+        """Return ``{'signedUrl': str, 'token': str}`` for a direct upload."""
+        raise NotImplementedError
+
+    def public_url(self, bucket_name: str, file_path: str) -> str:
+        raise NotImplementedError
+
+    def path_from_url(self, url: str, bucket_name: str):
+        raise NotImplementedError
+
+    def remove_objects(self, bucket_name: str, paths: list):
+        raise NotImplementedError
+
+    def iter_objects(self, bucket_name: str, prefix: str = '', page_size: int = 1000):
+        """Yield ``(path, size, created_at)`` for every object in a bucket."""
+        raise NotImplementedError
+
+    # ── Uploads ──────────────────────────────────────────────────────────
+
+    def _store(self, bucket_name: str, folder: str, file_ext: str, file_content: bytes) -> str:
+        """
+        Store bytes under a content-addressed key and take a reference on it.
+        The upload is skipped when the object is already present.
+        """
+        digest = hashlib.sha256(file_content).hexdigest()
+        file_name = f"{digest}{file_ext}"
+        file_path = f"{folder}/{file_name}" if folder else file_name
+        content_type = self._get_content_type(file_ext)
+
+        self._ensure_bucket(bucket_name)
+
+        # Hold the row lock from the existence check to the new reference, so
+        # a concurrent remover either sees the reference or finishes first
+        # (and the object is uploaded again).
+        with transaction.atomic():
+            stored = self._lock_stored_object(
+                bucket_name, file_path,
+                defaults={'sha256': digest, 'size': len(file_content), 'content_type': content_type},
+            )
+            if stored.ref_count > 0 or self._object_exists(bucket_name, file_path):
+                public_url = self.public_url(bucket_name, file_path)
+            else:
+                public_url = self._do_upload(bucket_name, file_path, file_content, content_type)
+
+            StoredObject.objects.filter(pk=stored.pk).update(ref_count=F('ref_count') + 1)
+            # The object is referenced again — make sure a queued delete doesn't remove it.
+            PendingStorageDeletion.objects.filter(bucket=bucket_name, path=file_path).delete()
+        return public_url
+
+    def _lock_stored_object(self, bucket_name: str, file_path: str, defaults: dict) -> StoredObject:
+        """``get_or_create`` the tracking row and lock it; retried if a remover deletes it in between."""
+        while True:
+            try:
+                stored, _ = StoredObject.objects.get_or_create(bucket=bucket_name, path=file_path, defaults=defaults)
+            except IntegrityError:
+                continue
+            locked = StoredObject.objects.select_for_update().filter(pk=stored.pk).first()
+            if locked is not None:
+                return locked
+
+    def _upload(self, file, bucket_name: str, folder: str, allowed_extensions: set, kind: str) -> str:
+        self._require_configured()
+
+        file_ext = self.validate_file(file.name, None, allowed_extensions)
+        file_content = file.read()
+        self.validate_file(file.name, len(file_content), allowed_extensions)
+
+        try:
+            return self._store(bucket_name, folder, file_ext, file_content)
+        except Exception as e:
+            logger.exception("%s upload failed for %s", kind, file.name)
+            raise Exception(f"{kind} upload failed: {e}")
+
+    def validate_file(self, file_name: str, file_size, allowed_extensions: set) -> str:
+        """Apply the extension and size rules shared by every upload path."""
+        file_ext = os.path.splitext(file_name or '')[1].lower()
+
+        if file_ext not in allowed_extensions:
+            raise Exception(f"Unsupported file type: {file_ext}")
+
+        max_size = getattr(settings, 'MAX_FILE_SIZE', 5 * 1024 * 1024)
+
+        if file_size is not None and file_size > max_size:
+            raise Exception(f"File too large. Max size: {max_size} bytes")
+
+        return file_ext
+
+    def create_signed_upload(self, file_name: str, bucket_name: str, folder: str, allowed_extensions: set) -> dict:
+        """
+        Issue a signed URL the client can upload to directly.  The object gets
+        a random key under ``<folder>/direct/`` since its bytes are unknown here.
+        """
+        self._require_configured()
+
+        file_ext = self.validate_file(file_name, None, allowed_extensions)
+        file_path = f"{folder}/direct/{uuid.uuid4().hex}{file_ext}" if folder else f"direct/{uuid.uuid4().hex}{file_ext}"
+
+        self._ensure_bucket(bucket_name)
+        signed = self._signed_upload_url(bucket_name, file_path)
+        return {
+            'signedUrl': signed['signedUrl'],
+            'token': signed['token'],
+            'path': file_path,
+            'bucket': bucket_name,
+        }
+
+    def finalize_signed_upload(self, file_path: str, bucket_name: str, folder: str, allowed_extensions: set) -> str:
+        """
+        Check an object uploaded through a signed URL against the normal
+        extension, size and content-type rules and start tracking it.
+        Objects that fail validation are removed.
+        """
+        self._require_configured()
+
+        prefix = f"{folder}/direct/" if folder else "direct/"
+        if not file_path.startswith(prefix) or '..' in file_path:
+            raise Exception("Invalid upload path")
+
+        if StoredObject.objects.filter(bucket=bucket_name, path=file_path).exists():
+            return self.public_url(bucket_name, file_path)
+
+        try:
+            info = self._object_info(bucket_name, file_path)
+        except Exception:
+            raise Exception("Uploaded file not found")
+
+        file_size = info['size']
+        content_type = (info.get('content_type') or '').split(';')[0].strip()
+
+        try:
+            file_ext = self.validate_file(file_path, file_size, allowed_extensions)
+            expected_type = self._get_content_type(file_ext)
+            if content_type and content_type != expected_type:
+                raise Exception(f"Content type {content_type} does not match {file_ext}")
+        except Exception:
+            self.delete_image(file_path, bucket_name)
+            raise
+
+        StoredObject.objects.get_or_create(
+            bucket=bucket_name,
+            path=file_path,
+            defaults={'sha256': '', 'size': file_size, 'content_type': expected_type, 'ref_count': 1},
+        )
+        return self.public_url(bucket_name, file_path)
+
+    def upload_image(self, file, bucket_name: str = 'images', folder: str = '') -> str:
+        return self._upload(file, bucket_name, folder, IMAGE_EXTENSIONS, 'Image')
+
+    def upload_document(self, file, bucket_name: str = 'documents', folder: str = '') -> str:
+        return self._upload(file, bucket_name, folder, DOCUMENT_EXTENSIONS, 'Document')
+
+    # ── Deletes ──────────────────────────────────────────────────────────
+
+    def delete_image(self, file_path: str, bucket_name: str = 'images') -> bool:
+        self._require_configured()
+
+        try:
+            self.remove_objects(bucket_name, [file_path])
+            return True
+        except Exception as e:
+            logger.warning("Delete failed for %s: %s", file_path, e)
+            return False
+
+    def _release(self, bucket_name: str, file_path: str) -> bool:
+        """
+        Drop one reference to an object.  Returns True when nothing references
+        it any more (including legacy objects that were never tracked).
+        """
+        with transaction.atomic():
+            stored = StoredObject.objects.select_for_update().filter(
+                bucket=bucket_name, path=file_path
+            ).first()
+            if stored is None:
+                return True
+            if stored.ref_count > 1:
+                stored.ref_count -= 1
+                stored.save(update_fields=['ref_count'])
+                return False
+            stored.delete()
+            return True
+
+    def delete_file_from_url(self, url: str, bucket_name: str) -> bool:
+        file_path = self.path_from_url(url, bucket_name)
+        if not file_path:
+            return False
+        if not self._release(bucket_name, file_path):
+            # Still referenced by another upload — keep the object.
+            return True
+        return self.delete_image(file_path, bucket_name)
+
+    def queue_delete_from_url(self, url: str, bucket_name: str) -> bool:
+        """
+        Release a reference and, if it was the last one, queue the object for
+        removal by the ``flush_storage_deletions`` worker instead of deleting
+        it inline.
+        """
+        file_path = self.path_from_url(url, bucket_name)
+        if not file_path:
+            return False
+        if self._release(bucket_name, file_path):
+            PendingStorageDeletion.objects.get_or_create(bucket=bucket_name, path=file_path)
+        return True
+
+    def claim_unreferenced(self, bucket_name: str, paths: list) -> set:
+        """
+        Lock the tracking rows for ``paths`` and return those nothing
+        references.  Untracked keys get a placeholder row first, so an upload
+        of the same bytes waits on it too.  Call inside a transaction, remove
+        the objects before it commits and then ``release_claims``.
+        """
+        StoredObject.objects.bulk_create(
+            [StoredObject(bucket=bucket_name, path=path) for path in paths], ignore_conflicts=True
+        )
+        locked = StoredObject.objects.select_for_update().filter(bucket=bucket_name, path__in=paths)
+        return {path for path, ref_count in locked.values_list('path', 'ref_count') if ref_count == 0}
+
+    def release_claims(self, bucket_name: str, paths):
+        StoredObject.objects.filter(bucket=bucket_name, path__in=list(paths), ref_count=0).delete()
+
+    def flush_pending_deletions(self, batch_size: int = 100, max_attempts: int = 5, retries: int = 3) -> dict:
+        """
+        Remove queued objects with one ``remove(paths)`` call per bucket per
+        batch.  Failed batches are retried with backoff; rows that keep failing
+        are left in the queue with their attempt count and last error.
+        """
+        self._require_configured()
+
+        removed = failed = 0
+        last_id = 0
+        while True:
+            batch = list(
+                PendingStorageDeletion.objects.filter(id__gt=last_id, attempts__lt=max_attempts)[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            by_bucket = defaultdict(list)
+            for row in batch:
+                by_bucket[row.bucket].append(row)
+
+            for bucket_name, rows in by_bucket.items():
+                # The claim stays locked until the remove is done, so an
+                # upload re-referencing a key can't slip in between.
+                with transaction.atomic():
+                    unreferenced = self.claim_unreferenced(bucket_name, [r.path for r in rows])
+                    live = [r for r in rows if r.path in unreferenced]
+                    # Skip anything that was re-uploaded after being queued.
+                    stale_ids = [r.id for r in rows if r.path not in unreferenced]
+                    if stale_ids:
+                        PendingStorageDeletion.objects.filter(id__in=stale_ids).delete()
+                    if not live:
+                        continue
 
-class SupabaseStorage:
+                    error = None
+                    for attempt in range(retries):
+                        try:
+                            self.remove_objects(bucket_name, [r.path for r in live])
+                            error = None
+                            break
+                        except Exception as e:
+                            error = e
+                            if attempt < retries - 1:
+                                time.sleep(0.5 * 2 ** attempt)
+                    self.release_claims(bucket_name, unreferenced)
+
+                    ids = [r.id for r in live]
+                    if error is None:
+                        PendingStorageDeletion.objects.filter(id__in=ids).delete()
+                        removed += len(ids)
+                    else:
+                        logger.warning("Batch delete failed for bucket %s: %s", bucket_name, error)
+                        PendingStorageDeletion.objects.filter(id__in=ids).update(
+                            attempts=F('attempts') + 1, last_error=str(error)
+                        )
+                        failed += len(ids)
+
+        return {'removed': removed, 'failed': failed}
+
+    def _get_content_type(self, ext: str) -> str:
+        content_types = {
+            '.jpg': 'image/jpeg',
+            '.jpeg': 'image/jpeg',
+            '.png': 'image/png',
+            '.webp': 'image/webp',
+            '.gif': 'image/gif',
+            '.pdf': 'application/pdf',
+            '.doc': 'application/msword',
+            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+            '.xls': 'application/vnd.ms-excel',
+            '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            '.csv': 'text/csv',
+        }
+        return content_types.get(ext, 'application/octet-stream')
+
+
+class SupabaseStorage(BaseStorage):
     def __init__(self):
         self.supabase_url = getattr(settings, 'SUPABASE_URL', None)
         self.service_role_key = getattr(settings, 'SUPABASE_SERVICE_ROLE_KEY', None)
@@ -17,9 +367,18 @@ class SupabaseStorage:
     @property
     def client(self) -> Client:
         if self._client is None and self.supabase_url and self.service_role_key:
-            self._client = create_client(self.supabase_url, self.service_role_key)
+            try:
+                options = ClientOptions(httpx_client=http_client.build_httpx_client())
+            except TypeError:
+                # supabase-py releases before httpx_client support
+                options = None
+            self._client = create_client(self.supabase_url, self.service_role_key, options=options)
         return self._client
 
+    def _require_configured(self):
+        if not self.client:
+            raise Exception("Supabase client not configured. Check SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY.")
+
     def _ensure_bucket(self, bucket_name: str, public: bool = True):
         """Create the storage bucket if it doesn't already exist."""
         if bucket_name in self._ensured_buckets:
@@ -46,6 +405,12 @@ class SupabaseStorage:
         Handles supabase-py v2+ API changes gracefully.
         """
         storage = self.client.storage.from_(bucket_name)
+        file_options = {
+            "content-type": content_type,
+            "cache-control": str(IMMUTABLE_CACHE_SECONDS),
+            # Identical bytes map to the same key, so overwriting is harmless.
+            "upsert": "true",
+        }
 
         # supabase-py v2+ uses 'file' kwarg; older versions used 'data'.
         # Try the modern signature first, fall back to the legacy one.
@@ -53,117 +418,208 @@ class SupabaseStorage:
             storage.upload(
                 path=file_path,
                 file=file_content,
-                file_options={"content-type": content_type}
+                file_options=file_options
             )
         except TypeError:
             # Fallback for older supabase-py that uses 'data' parameter
             storage.upload(
                 path=file_path,
                 data=file_content,
-                file_options={"content-type": content_type}
+                file_options=file_options
             )
 
         # We already know the path we uploaded to — construct URL directly.
         # This is more reliable than parsing the upload response object,
         # which varies across supabase-py versions.
-        public_url = storage.get_public_url(file_path)
-        return public_url
+        return self.public_url(bucket_name, file_path)
 
-    def upload_image(self, file, bucket_name: str = 'images', folder: str = '') -> str:
-        if not self.client:
-            raise Exception("Supabase client not configured. Check SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY.")
+    def _object_exists(self, bucket_name: str, file_path: str) -> bool:
+        try:
+            return bool(self.client.storage.from_(bucket_name).exists(file_path))
+        except Exception as e:
+            logger.debug("Exists check failed for %s: %s", file_path, e)
+            return False
 
-        file_ext = os.path.splitext(file.name)[1].lower()
-        allowed_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
+    def _object_info(self, bucket_name: str, file_path: str) -> dict:
+        info = self.client.storage.from_(bucket_name).info(file_path) or {}
+        metadata = info.get('metadata') or {}
+        return {
+            'size': int(info.get('size') or metadata.get('size') or 0),
+            'content_type': info.get('content_type') or metadata.get('mimetype') or '',
+        }
 
-        if file_ext not in allowed_extensions:
-            raise Exception(f"Unsupported file type: {file_ext}")
+    def _signed_upload_url(self, bucket_name: str, file_path: str) -> dict:
+        signed = self.client.storage.from_(bucket_name).create_signed_upload_url(file_path)
+        return {
+            'signedUrl': signed.get('signed_url') or signed.get('signedUrl'),
+            'token': signed.get('token'),
+        }
 
-        file_content = file.read()
-        file_size = len(file_content)
-        max_size = getattr(settings, 'MAX_FILE_SIZE', 5 * 1024 * 1024)
+    def public_url(self, bucket_name: str, file_path: str) -> str:
+        return self.client.storage.from_(bucket_name).get_public_url(file_path)
 
-        if file_size > max_size:
-            raise Exception(f"File too large. Max size: {max_size} bytes")
+    def path_from_url(self, url: str, bucket_name: str):
+        if not url:
+            return None
+        marker = f"/object/public/{bucket_name}/"
+        if marker not in url:
+            return None
+        file_path = url.split(marker)[-1]
+        return file_path.split('?')[0].split('#')[0]
 
-        file_name = f"{uuid.uuid4().hex}{file_ext}"
-        file_path = f"{folder}/{file_name}" if folder else file_name
+    def remove_objects(self, bucket_name: str, paths: list):
+        self.client.storage.from_(bucket_name).remove(list(paths))
 
-        self._ensure_bucket(bucket_name)
+    def iter_objects(self, bucket_name: str, prefix: str = '', page_size: int = 1000):
+        """
+        Walk every object in a bucket page by page, yielding
+        ``(path, size, created_at)``.  Folders are descended into as they
+        are found.
+        """
+        self._require_configured()
 
-        try:
-            return self._do_upload(bucket_name, file_path, file_content, self._get_content_type(file_ext))
-        except Exception as e:
-            logger.exception("Image upload failed for %s", file.name)
-            raise Exception(f"Image upload failed: {e}")
+        storage = self.client.storage.from_(bucket_name)
+        folders = [prefix]
+        while folders:
+            folder = folders.pop()
+            offset = 0
+            while True:
+                page = storage.list(folder, {'limit': page_size, 'offset': offset}) or []
+                for entry in page:
+                    path = f"{folder}/{entry['name']}" if folder else entry['name']
+                    if entry.get('id') is None:
+                        folders.append(path)
+                        continue
+                    metadata = entry.get('metadata') or {}
+                    yield path, int(metadata.get('size') or 0), parse_datetime(entry.get('created_at') or '')
+                if len(page) < page_size:
+                    break
+                offset += page_size
 
-    def upload_document(self, file, bucket_name: str = 'documents', folder: str = '') -> str:
-        if not self.client:
-            raise Exception("Supabase client not configured. Check SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY.")
 
-        file_ext = os.path.splitext(file.name)[1].lower()
-        allowed_extensions = {
-            '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.csv',
-            '.jpg', '.jpeg', '.png', '.webp', '.gif'
-        }
+class LocalStorage(BaseStorage):
+    """
+    Stores objects on local disk under ``LOCAL_STORAGE_ROOT/<bucket>/<path>``
+    and serves them from ``LOCAL_STORAGE_URL``.  Used for offline development
+    and for benchmarking the upload paths without a Supabase project.
+    """
 
-        if file_ext not in allowed_extensions:
-            raise Exception(f"Unsupported file type: {file_ext}")
+    def __init__(self):
+        self.root = os.path.abspath(str(getattr(settings, 'LOCAL_STORAGE_ROOT', os.path.join(settings.MEDIA_ROOT, 'storage'))))
+        self.base_url = getattr(settings, 'LOCAL_STORAGE_URL', '/media/storage/')
+        if not self.base_url.endswith('/'):
+            self.base_url += '/'
 
-        file_content = file.read()
-        file_size = len(file_content)
-        max_size = getattr(settings, 'MAX_FILE_SIZE', 5 * 1024 * 1024)
+    def _full_path(self, bucket_name: str, file_path: str) -> str:
+        full_path = os.path.abspath(os.path.join(self.root, bucket_name, file_path))
+        if not full_path.startswith(os.path.join(self.root, bucket_name) + os.sep):
+            raise Exception("Invalid storage path")
+        return full_path
 
-        if file_size > max_size:
-            raise Exception(f"File too large. Max size: {max_size} bytes")
+    def write_object(self, bucket_name: str, file_path: str, file_content: bytes):
+        """Atomically write bytes so readers never see a partial file."""
+        full_path = self._full_path(bucket_name, file_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(full_path), prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(file_content)
+            os.replace(tmp_path, full_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
 
-        file_name = f"{uuid.uuid4().hex}{file_ext}"
-        file_path = f"{folder}/{file_name}" if folder else file_name
+    def write_stream(self, bucket_name: str, file_path: str, stream, max_size: int, chunk_size: int = 64 * 1024) -> int:
+        """
+        Atomically copy a file-like ``stream`` to storage in chunks, never
+        holding the whole body in memory.  Raises ``ValueError`` once more
+        than ``max_size`` bytes arrive.  Returns the number of bytes written.
+        """
+        full_path = self._full_path(bucket_name, file_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(full_path), prefix='.upload-')
+        written = 0
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    written += len(chunk)
+                    if written > max_size:
+                        raise ValueError(f'File too large. Max size: {max_size} bytes')
+                    tmp.write(chunk)
+            os.replace(tmp_path, full_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return written
 
-        self._ensure_bucket(bucket_name)
+    def _do_upload(self, bucket_name: str, file_path: str, file_content: bytes, content_type: str) -> str:
+        self.write_object(bucket_name, file_path, file_content)
+        return self.public_url(bucket_name, file_path)
 
-        try:
-            return self._do_upload(bucket_name, file_path, file_content, self._get_content_type(file_ext))
-        except Exception as e:
-            logger.exception("Document upload failed for %s", file.name)
-            raise Exception(f"Document upload failed: {e}")
+    def _object_exists(self, bucket_name: str, file_path: str) -> bool:
+        return os.path.isfile(self._full_path(bucket_name, file_path))
 
-    def delete_image(self, file_path: str, bucket_name: str = 'images') -> bool:
-        if not self.client:
-            raise Exception("Supabase client not configured.")
+    def _object_info(self, bucket_name: str, file_path: str) -> dict:
+        stat = os.stat(self._full_path(bucket_name, file_path))
+        return {
+            'size': stat.st_size,
+            'content_type': self._get_content_type(os.path.splitext(file_path)[1].lower()),
+        }
 
-        try:
-            self.client.storage.from_(bucket_name).remove([file_path])
-            return True
-        except Exception as e:
-            logger.warning("Delete failed for %s: %s", file_path, e)
-            return False
+    def _signed_upload_url(self, bucket_name: str, file_path: str) -> dict:
+        from django.urls import reverse
+        token = signing.dumps({'bucket': bucket_name, 'path': file_path}, salt='core.local-upload')
+        return {'signedUrl': reverse('upload-local', kwargs={'token': token}), 'token': token}
 
-    def delete_file_from_url(self, url: str, bucket_name: str) -> bool:
+    def load_signed_upload(self, token: str) -> tuple:
+        """Return ``(bucket, path)`` for a token issued by ``_signed_upload_url``."""
+        max_age = getattr(settings, 'SIGNED_UPLOAD_MAX_AGE', 900)
+        claims = signing.loads(token, salt='core.local-upload', max_age=max_age)
+        return claims['bucket'], claims['path']
+
+    def public_url(self, bucket_name: str, file_path: str) -> str:
+        return f"{self.base_url}{bucket_name}/{file_path}"
+
+    def path_from_url(self, url: str, bucket_name: str):
         if not url:
-            return False
-        marker = f"/object/public/{bucket_name}/"
-        if marker in url:
-            file_path = url.split(marker)[-1]
-            file_path = file_path.split('?')[0].split('#')[0]
-            return self.delete_image(file_path, bucket_name)
-        return False
+            return None
+        marker = f"{urlparse(self.base_url).path}{bucket_name}/"
+        url_path = urlparse(url).path
+        if marker not in url_path:
+            return None
+        return url_path.split(marker, 1)[-1]
+
+    def remove_objects(self, bucket_name: str, paths: list):
+        for file_path in paths:
+            try:
+                os.unlink(self._full_path(bucket_name, file_path))
+            except FileNotFoundError:
+                pass
+
+    def iter_objects(self, bucket_name: str, prefix: str = '', page_size: int = 1000):
+        bucket_root = os.path.join(self.root, bucket_name)
+        for dirpath, _, filenames in os.walk(os.path.join(bucket_root, prefix)):
+            for name in filenames:
+                if name.startswith('.upload-'):
+                    continue
+                full_path = os.path.join(dirpath, name)
+                stat = os.stat(full_path)
+                path = os.path.relpath(full_path, bucket_root).replace(os.sep, '/')
+                yield path, stat.st_size, datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc)
+
+
+def get_storage() -> BaseStorage:
+    """Build the storage backend selected by ``settings.STORAGE_BACKEND``."""
+    backend = getattr(settings, 'STORAGE_BACKEND', 'supabase')
+    return import_string(STORAGE_BACKENDS.get(backend, backend))()
 
-    def _get_content_type(self, ext: str) -> str:
-        content_types = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.webp': 'image/webp',
-            '.gif': 'image/gif',
-            '.pdf': 'application/pdf',
-            '.doc': 'application/msword',
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            '.xls': 'application/vnd.ms-excel',
-            '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            '.csv': 'text/csv',
-        }
-        return content_types.get(ext, 'application/octet-stream')
 
+storage = get_storage()
 
-supabase_storage = SupabaseStorage()
\ No newline at end of file
+# Backwards-compatible name from when Supabase was the only backend.
+supabase_storage = storage
@@ -0,0 +1,44 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import Client
+from core.nplusone import NPlusOneError, detect_n_plus_one, fingerprint
+from rooms.models import PropertyDocument
+
+
+class NPlusOneDetectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin')
+        Client.objects.create(user=cls.admin, role='admin', mobile_no='')
+        for i in range(4):
+            tenant = User.objects.create_user(username=f'tenant{i}')
+            PropertyDocument.objects.create(
+                property_id='Maple House', tenant=tenant, name=f'Lease {i}',
+                file_url=f'https://files.example.com/{i}.pdf',
+            )
+
+    def test_fingerprint_collapses_literals(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 7 AND name = 'x' AND pk IN (%s, %s, %s)"),
+            'SELECT * FROM t WHERE id = ? AND name = ? AND pk IN (...)',
+        )
+
+    def test_per_row_lookup_raises(self):
+        with self.assertRaises(NPlusOneError) as raised:
+            with detect_n_plus_one():
+                [document.tenant.username for document in PropertyDocument.objects.all()]
+        self.assertIn('core/tests.py', str(raised.exception))
+
+    def test_joined_lookup_passes(self):
+        with detect_n_plus_one() as detector:
+            [document.tenant.username for document in PropertyDocument.objects.select_related('tenant')]
+        self.assertEqual(detector.findings(), [])
+
+    @override_settings(NPLUSONE_DETECTION=True, NPLUSONE_STRICT=True)
+    def test_middleware_strict_mode(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        # The document list joins tenant and uploader, so it passes
+        self.assertEqual(client.get('/api/rooms/documents/', secure=True).status_code, 200)
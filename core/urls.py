@@ -1,16 +1,29 @@
 from django.urls import path
 from .views import (
-    UploadImagesView, AdminStatsView, VerifyTokenView, MeView,
-    NotificationListView, NotificationMarkReadView, NotificationMarkAllReadView,
+    UploadImagesView, SignedUploadView, FinalizeUploadView, LocalUploadView,
+    AdminStatsView, AdminMetricsView, AdminSearchView, AdminProfileListView, AdminProfileDownloadView, VerifyTokenView, MeView,
+    NotificationListView, NotificationMarkReadView, NotificationMarkAllReadView, NotificationUnreadCountView,
+    NotificationPollView, NotificationStreamTicketView, notification_stream,
 )
 
 urlpatterns = [
     path('upload/images', UploadImagesView.as_view(), name='upload-images'),
+    path('upload/sign', SignedUploadView.as_view(), name='upload-sign'),
+    path('upload/finalize', FinalizeUploadView.as_view(), name='upload-finalize'),
+    path('upload/local/<str:token>', LocalUploadView.as_view(), name='upload-local'),
     path('admin/stats', AdminStatsView.as_view(), name='admin-stats'),
+    path('admin/metrics', AdminMetricsView.as_view(), name='admin-metrics'),
+    path('admin/profiles', AdminProfileListView.as_view(), name='admin-profiles'),
+    path('admin/profiles/<str:profile_id>', AdminProfileDownloadView.as_view(), name='admin-profile-download'),
+    path('search/', AdminSearchView.as_view(), name='admin-search'),
     path('auth/verify', VerifyTokenView.as_view(), name='auth-verify'),
     path('me', MeView.as_view(), name='auth-me'),
     # Notifications
     path('notifications/', NotificationListView.as_view(), name='notifications'),
     path('notifications/<int:pk>/read/', NotificationMarkReadView.as_view(), name='notification-read'),
     path('notifications/read-all/', NotificationMarkAllReadView.as_view(), name='notifications-read-all'),
+    path('notifications/unread-count/', NotificationUnreadCountView.as_view(), name='notifications-unread-count'),
+    path('notifications/poll/', NotificationPollView.as_view(), name='notifications-poll'),
+    path('notifications/stream/ticket/', NotificationStreamTicketView.as_view(), name='notifications-stream-ticket'),
+    path('notifications/stream/', notification_stream, name='notifications-stream'),
 ]
@@ -1,13 +1,25 @@
+import os
+import json
+import time
+import asyncio
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import quote_etag, parse_etags
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 
 from rooms.models import Room
-from rooms.permissions import IsAdmin
-from core.storage_backends import supabase_storage
+from rooms.permissions import IsAdmin, IsAdminOrTenant
+from core.storage_backends import storage, LocalStorage, IMAGE_EXTENSIONS, DOCUMENT_EXTENSIONS
+from core import cache, notifications as notification_service
 
 
 class UploadImagesView(APIView):
@@ -27,7 +39,7 @@ class UploadImagesView(APIView):
 
         for f in files:
             try:
-                url = supabase_storage.upload_image(f, bucket_name='images', folder='uploads')
+                url = storage.upload_image(f, bucket_name='images', folder='uploads')
                 saved_urls.append(url)
             except Exception as e:
                 return Response({
@@ -39,43 +51,247 @@ class UploadImagesView(APIView):
         return Response({'success': True, 'data': {'urls': saved_urls}})
 
 
+def _upload_purposes():
+    """Where each kind of direct upload lands and who may make it."""
+    return {
+        'images': {'bucket': 'images', 'folder': 'uploads', 'extensions': IMAGE_EXTENSIONS, 'admin_only': True},
+        'profile': {'bucket': 'images', 'folder': 'profiles', 'extensions': IMAGE_EXTENSIONS, 'admin_only': True},
+        'documents': {
+            'bucket': getattr(settings, 'SUPABASE_DOCUMENTS_BUCKET', 'documents'),
+            'folder': 'documents',
+            'extensions': DOCUMENT_EXTENSIONS,
+            'admin_only': False,
+        },
+    }
+
+
+class SignedUploadView(APIView):
+    """
+    Issue a short-lived signed URL so the client uploads straight to storage
+    instead of streaming the bytes through a Django worker.
+    POST body: { "purpose": "images" | "profile" | "documents", "fileName": str, "fileSize": int }
+    """
+    permission_classes = [IsAdminOrTenant]
+
+    def post(self, request):
+        purpose = _upload_purposes().get(request.data.get('purpose'))
+        if not purpose:
+            return Response({'success': False, 'error': 'Invalid purpose'}, status=400)
+        if purpose['admin_only'] and not IsAdmin().has_permission(request, self):
+            return Response({'success': False, 'error': 'Permission denied'}, status=403)
+
+        file_name = request.data.get('fileName') or ''
+        file_size = request.data.get('fileSize')
+        try:
+            file_size = int(file_size) if file_size is not None else None
+            storage.validate_file(file_name, file_size, purpose['extensions'])
+            upload = storage.create_signed_upload(
+                file_name, bucket_name=purpose['bucket'], folder=purpose['folder'],
+                allowed_extensions=purpose['extensions'],
+            )
+        except (TypeError, ValueError):
+            return Response({'success': False, 'error': 'fileSize must be an integer'}, status=400)
+        except Exception as e:
+            return Response({'success': False, 'error': str(e)}, status=400)
+
+        max_age = getattr(settings, 'SIGNED_UPLOAD_MAX_AGE', 900)
+        upload['uploadToken'] = signing.dumps(
+            {'path': upload['path'], 'user': request.user.id, 'purpose': request.data.get('purpose')},
+            salt='core.signed-upload',
+        )
+        upload['expiresIn'] = max_age
+        return Response({'success': True, 'data': upload})
+
+
+class FinalizeUploadView(APIView):
+    """
+    Validate an object uploaded through a signed URL and return its public URL.
+    POST body: { "uploadToken": str }
+    """
+    permission_classes = [IsAdminOrTenant]
+
+    def post(self, request):
+        max_age = getattr(settings, 'SIGNED_UPLOAD_MAX_AGE', 900)
+        try:
+            claims = signing.loads(request.data.get('uploadToken') or '', salt='core.signed-upload', max_age=max_age)
+        except signing.SignatureExpired:
+            return Response({'success': False, 'error': 'Upload token expired'}, status=400)
+        except signing.BadSignature:
+            return Response({'success': False, 'error': 'Invalid upload token'}, status=400)
+
+        if claims.get('user') != request.user.id:
+            return Response({'success': False, 'error': 'Permission denied'}, status=403)
+        purpose_name = claims.get('purpose')
+        purpose = _upload_purposes()[purpose_name]
+
+        try:
+            url = storage.finalize_signed_upload(
+                claims['path'], bucket_name=purpose['bucket'], folder=purpose['folder'],
+                allowed_extensions=purpose['extensions'],
+            )
+        except Exception as e:
+            return Response({'success': False, 'error': str(e)}, status=400)
+
+        if purpose_name == 'profile':
+            from accounts.models import Client
+            client, _ = Client.objects.get_or_create(
+                user=request.user,
+                defaults={'mobile_no': '', 'role': 'admin', 'image': ''}
+            )
+            client.image = url
+            client.save()
+
+        return Response({'success': True, 'data': {'url': url}})
+
+
+class LocalUploadView(APIView):
+    """
+    Receives direct uploads when the local storage backend is active — the
+    offline counterpart of a Supabase signed upload URL.  The signed token in
+    the URL is the only credential.
+    """
+    permission_classes = []
+    authentication_classes = []
+
+    def put(self, request, token):
+        if not isinstance(storage, LocalStorage):
+            return Response({'success': False, 'error': 'Local storage is not enabled'}, status=404)
+        try:
+            bucket, path = storage.load_signed_upload(token)
+        except signing.BadSignature:
+            return Response({'success': False, 'error': 'Invalid or expired upload URL'}, status=403)
+
+        # Checked against Content-Length up front and streamed to disk:
+        # request.body would trip DATA_UPLOAD_MAX_MEMORY_SIZE (2.5MB) well
+        # below MAX_FILE_SIZE.
+        max_size = getattr(settings, 'MAX_FILE_SIZE', 5 * 1024 * 1024)
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > max_size:
+            return Response({'success': False, 'error': f'File too large. Max size: {max_size} bytes'}, status=400)
+
+        try:
+            storage.write_stream(bucket, path, request, max_size)
+        except ValueError as e:
+            return Response({'success': False, 'error': str(e)}, status=400)
+        return Response({'success': True, 'data': {'path': path}})
+
+    post = put
+
+
+def dashboard_stats(today) -> dict:
+    from bookings_app.models import Booking, TenantAssignment
+    from django.db.models import Sum
+
+    total_rooms = Room.objects.count()
+    total_bookings = Booking.objects.count()
+    total_revenue = Booking.objects.filter(status__in=['confirmed', 'completed']).aggregate(Sum('total_price'))['total_price__sum'] or 0
+
+    # Calculate occupancy (very simple version: booked rooms / total rooms)
+    occupied_rooms = Booking.objects.filter(
+        status__in=['pending', 'confirmed'],
+        check_in__lte=today,
+        check_out__gte=today
+    ).values('room').distinct().count()
+
+    occupancy_rate = (occupied_rooms / total_rooms * 100) if total_rooms > 0 else 0
+
+    # New: tenant stats
+    total_tenants = TenantAssignment.objects.filter(status='active').count()
+
+    return {
+        'totalRooms': total_rooms,
+        'totalBookings': total_bookings,
+        'totalRevenue': float(total_revenue),
+        'occupancyRate': round(occupancy_rate, 2),
+        'totalActiveTenants': total_tenants,
+    }
+
+
 class AdminStatsView(APIView):
-    """Admin-only dashboard statistics."""
+    """Admin-only dashboard statistics, cached in the ``stats`` region."""
     permission_classes = [IsAdmin]
 
     def get(self, request):
-        total_rooms = Room.objects.count()
-
-        from bookings_app.models import Booking, TenantAssignment
-        from django.db.models import Sum
-
-        total_bookings = Booking.objects.count()
-        total_revenue = Booking.objects.filter(status__in=['confirmed', 'completed']).aggregate(Sum('total_price'))['total_price__sum'] or 0
-        
-        # Calculate occupancy (very simple version: booked rooms / total rooms)
-        occupied_rooms = Booking.objects.filter(
-            status__in=['pending', 'confirmed'],
-            check_in__lte=timezone.now().date(),
-            check_out__gte=timezone.now().date()
-        ).values('room').distinct().count()
-        
-        occupancy_rate = (occupied_rooms / total_rooms * 100) if total_rooms > 0 else 0
-
-        # New: tenant stats
-        total_tenants = TenantAssignment.objects.filter(status='active').count()
+        today = timezone.now().date()
+        data = cache.stats.get_or_set(f'dashboard:{today.isoformat()}', lambda: dashboard_stats(today))
+        return Response({'success': True, 'data': data})
+
 
+class AdminMetricsView(APIView):
+    """Admin-only runtime metrics for this worker process."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        from core.http_client import host_metrics
+        from core.middleware import route_metrics
         return Response({
             'success': True,
             'data': {
-                'totalRooms': total_rooms,
-                'totalBookings': total_bookings,
-                'totalRevenue': float(total_revenue),
-                'occupancyRate': round(occupancy_rate, 2),
-                'totalActiveTenants': total_tenants,
+                'routes': route_metrics(),
+                'outboundHttp': host_metrics(),
+                'cacheRegions': cache.region_metrics(),
             }
         })
 
 
+class AdminProfileListView(APIView):
+    """Admin-only list of stored request profiles (see core/profiling.py)."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        from core.profiling import list_profiles
+        return Response({'success': True, 'data': list_profiles()})
+
+
+class AdminProfileDownloadView(APIView):
+    """Admin-only download of one profile: ``?file=txt`` (default), ``prof`` or ``json``."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request, profile_id):
+        from core.profiling import profile_path
+        extension = request.query_params.get('file', 'txt')
+        path = profile_path(profile_id, extension)
+        if path is None:
+            return Response({'success': False, 'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(open(path, 'rb'), as_attachment=extension == 'prof', filename=os.path.basename(path),
+                            content_type={'txt': 'text/plain', 'json': 'application/json'}.get(extension, 'application/octet-stream'))
+
+
+class AdminSearchView(APIView):
+    """
+    Admin full-text search over property documents and chat attachments.
+    ``?q=`` is the query; ``?kind=document|chat_attachment`` narrows it.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        from core.search import search
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'success': False, 'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        kind = request.query_params.get('kind') or None
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            limit = 20
+
+        results = search(query, kind=kind, limit=limit)
+        return Response({
+            'success': True,
+            'data': [{
+                'kind': hit['kind'],
+                'id': hit['object_id'],
+                'title': hit['title'],
+                'propertyName': hit['property_name'],
+                'snippet': hit['snippet'],
+                'rank': float(hit['rank'] or 0),
+            } for hit in results],
+        })
+
+
 class VerifyTokenView(APIView):
     """
     Auth plumbing — returns the authenticated user's identity and role.
@@ -129,6 +345,18 @@ class MeView(APIView):
 # ─── Notification Views ──────────────────────────────────────────────────────
 
 
+def _serialize_notification(n):
+    return {
+        'id': n.id,
+        'title': n.title,
+        'message': n.message,
+        'type': n.type,
+        'read': n.read,
+        'link': n.link,
+        'createdAt': n.created_at.isoformat(),
+    }
+
+
 class NotificationListView(APIView):
     """List notifications for the authenticated user."""
     permission_classes = [IsAuthenticated]
@@ -141,17 +369,9 @@ class NotificationListView(APIView):
             qs = qs.filter(read=False)
         qs = qs[:50]  # Limit to last 50
 
-        data = [{
-            'id': n.id,
-            'title': n.title,
-            'message': n.message,
-            'type': n.type,
-            'read': n.read,
-            'link': n.link,
-            'createdAt': n.created_at.isoformat(),
-        } for n in qs]
+        data = [_serialize_notification(n) for n in qs]
 
-        unread_count = Notification.objects.filter(user=request.user, read=False).count()
+        unread_count = notification_service.unread_count(request.user.id)
 
         return Response({
             'success': True,
@@ -166,13 +386,13 @@ class NotificationMarkReadView(APIView):
 
     def patch(self, request, pk):
         from core.models import Notification
-        try:
-            notification = Notification.objects.get(pk=pk, user=request.user)
-            notification.read = True
-            notification.save(update_fields=['read'])
-            return Response({'success': True})
-        except Notification.DoesNotExist:
-            return Response({'success': False, 'error': 'Notification not found'}, status=404)
+        with transaction.atomic():
+            updated = Notification.objects.filter(pk=pk, user=request.user, read=False).update(read=True)
+            if updated:
+                notification_service.adjust_unread_count(request.user.id, -updated)
+            elif not Notification.objects.filter(pk=pk, user=request.user).exists():
+                return Response({'success': False, 'error': 'Notification not found'}, status=404)
+        return Response({'success': True})
 
 
 class NotificationMarkAllReadView(APIView):
@@ -181,5 +401,166 @@ class NotificationMarkAllReadView(APIView):
 
     def post(self, request):
         from core.models import Notification
-        Notification.objects.filter(user=request.user, read=False).update(read=True)
+        with transaction.atomic():
+            updated = Notification.objects.filter(user=request.user, read=False).update(read=True)
+            notification_service.adjust_unread_count(request.user.id, -updated)
         return Response({'success': True, 'message': 'All notifications marked as read'})
+
+
+class NotificationUnreadCountView(APIView):
+    """
+    Badge count for the authenticated user.  Served from the maintained
+    counter; clients that send back the ETag get a 304 while it's unchanged.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        count = notification_service.unread_count(request.user.id)
+        etag = quote_etag(f'{request.user.id}-{count}')
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({'success': True, 'data': {'unreadCount': count}})
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+def _parse_cursor(value):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class NotificationPollView(APIView):
+    """
+    Short poll for notifications newer than ``?cursor=`` (a notification id).
+    Answers immediately with any new notifications and the cursor to send
+    next time.  When there are none the cursor moves up to the process-wide
+    high-water mark, and a client sending back the ETag gets a 304 without a
+    query of its own until some notification is written.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        cursor = _parse_cursor(request.query_params.get('cursor'))
+        high_water = notification_service.high_water_mark()
+        if cursor is None:
+            return Response({
+                'success': True,
+                'data': [],
+                'cursor': max(high_water, notification_service.latest_id_for(request.user.id)),
+            })
+
+        found = notification_service.notifications_after(request.user.id, cursor) if high_water > cursor else []
+        if found:
+            return Response({
+                'success': True,
+                'data': [_serialize_notification(n) for n in found],
+                'cursor': found[-1].id,
+                'unreadCount': notification_service.unread_count(request.user.id),
+            })
+
+        cursor = max(cursor, high_water)
+        etag = quote_etag(f'{request.user.id}-{cursor}')
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({'success': True, 'data': [], 'cursor': cursor})
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+STREAM_TICKET_SALT = 'core.notification-stream'
+
+
+class NotificationStreamTicketView(APIView):
+    """
+    A short-lived signed ticket for opening the notification stream.
+    ``EventSource`` can't send an Authorization header, and a bearer token
+    in the URL would end up in access and proxy logs.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response({
+            'success': True,
+            'data': {
+                'ticket': signing.dumps({'user': request.user.id}, salt=STREAM_TICKET_SALT),
+                'expiresIn': getattr(settings, 'NOTIFICATION_STREAM_TICKET_MAX_AGE', 60),
+            },
+        })
+
+
+def _stream_user(request):
+    """
+    Authenticate a plain Django request the way DRF would, or from a
+    ``?ticket=`` issued by ``NotificationStreamTicketView``.
+    """
+    from django.contrib.auth.models import User
+    from accounts.authentication import SupabaseAuthentication
+    from rest_framework.exceptions import AuthenticationFailed
+
+    ticket = request.GET.get('ticket')
+    if ticket:
+        max_age = getattr(settings, 'NOTIFICATION_STREAM_TICKET_MAX_AGE', 60)
+        try:
+            claims = signing.loads(ticket, salt=STREAM_TICKET_SALT, max_age=max_age)
+        except signing.BadSignature:
+            return None
+        return User.objects.filter(pk=claims.get('user'), is_active=True).first()
+
+    try:
+        result = SupabaseAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+async def notification_stream(request):
+    """
+    Server-Sent Events stream of new notifications.  Only served under ASGI:
+    on WSGI each open stream would hold a worker thread indefinitely, so it
+    answers 501 and clients fall back to the poll endpoint.  Browsers
+    authenticate with ``?ticket=`` from the stream-ticket endpoint.  Resumes
+    from ``Last-Event-ID`` or ``?cursor=`` and sends a comment every 15s to
+    keep proxies from closing the connection.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({
+            'success': False,
+            'error': 'Notification streaming needs an ASGI server; use the poll endpoint.',
+            'poll': reverse('notifications-poll'),
+        }, status=501)
+
+    user = await sync_to_async(_stream_user)(request)
+    if user is None:
+        return JsonResponse({'success': False, 'error': 'Authentication credentials were not provided.'}, status=401)
+
+    cursor = _parse_cursor(request.headers.get('Last-Event-ID') or request.GET.get('cursor'))
+    if cursor is None:
+        cursor = await sync_to_async(notification_service.latest_id_for)(user.id)
+    interval = getattr(settings, 'NOTIFICATION_POLL_INTERVAL', 2)
+
+    async def events():
+        nonlocal cursor
+        yield 'retry: 5000\n\n'
+        seen = None
+        last_sent = time.monotonic()
+        while True:
+            found, seen = await sync_to_async(notification_service.check_for_notifications)(user.id, cursor, seen)
+            for n in found:
+                cursor = n.id
+                yield f'id: {n.id}\nevent: notification\ndata: {json.dumps(_serialize_notification(n))}\n\n'
+                last_sent = time.monotonic()
+            if time.monotonic() - last_sent >= 15:
+                yield ': keep-alive\n\n'
+                last_sent = time.monotonic()
+            await asyncio.sleep(interval)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
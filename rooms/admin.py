@@ -1,5 +1,24 @@
 from django.contrib import admin
-from .models import Room, PropertyDocument, PropertyImage, BookingInterest
+from .models import Property, Amenity, Room, PropertyDocument, PropertyImage, BookingInterest
+
+@admin.register(Property)
+class PropertyAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'created_at')
+    search_fields = ('name',)
+
+    def save_model(self, request, obj, form, change):
+        if change and 'name' in form.changed_data:
+            # Rename through the model so the denormalised name columns follow
+            new_name = obj.name
+            obj.name = form.initial['name']
+            obj.rename(new_name)
+        else:
+            super().save_model(request, obj, form, change)
+
+@admin.register(Amenity)
+class AmenityAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name')
+    search_fields = ('name',)
 
 @admin.register(Room)
 class RoomAdmin(admin.ModelAdmin):
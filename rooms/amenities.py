@@ -0,0 +1,101 @@
+"""
+Indexed amenity lookups.
+
+``Room.amenities`` (a JSON list) stays the editable source; every save
+mirrors it into ``RoomAmenity`` rows so filters and facet counts are
+indexed joins instead of JSON scans.
+"""
+from django.db import transaction
+from django.db.models import Count
+
+from core.cache import catalog, property_summary
+from .models import Amenity, Room, RoomAmenity
+
+
+def normalize_amenities(values) -> list:
+    if not isinstance(values, list):
+        return []
+    seen = []
+    for value in values:
+        name = str(value).strip()[:100] if value is not None else ''
+        if name and name not in seen:
+            seen.append(name)
+    return seen
+
+
+def amenity_ids(names, create: bool = False) -> dict:
+    """``{name: id}`` for ``names``, registering unknown names when ``create``."""
+    names = list(names)
+    if not names:
+        return {}
+    known = dict(Amenity.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = [name for name in names if name not in known]
+    if missing and create:
+        Amenity.objects.bulk_create([Amenity(name=name) for name in missing], ignore_conflicts=True)
+        known.update(Amenity.objects.filter(name__in=missing).values_list('name', 'id'))
+    return known
+
+
+def sync_room_amenities(room):
+    """Make the room's ``RoomAmenity`` rows match its ``amenities`` list."""
+    wanted = set(amenity_ids(normalize_amenities(room.amenities), create=True).values())
+    current = set(RoomAmenity.objects.filter(room=room).values_list('amenity_id', flat=True))
+    if wanted == current:
+        return
+    with transaction.atomic():
+        if current - wanted:
+            RoomAmenity.objects.filter(room=room, amenity_id__in=current - wanted).delete()
+        RoomAmenity.objects.bulk_create(
+            [RoomAmenity(room=room, amenity_id=amenity_id) for amenity_id in wanted - current],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_room_amenities(chunk_size: int = 1000) -> int:
+    """Recreate every ``RoomAmenity`` row from ``Room.amenities``; returns the row count."""
+    RoomAmenity.objects.all().delete()
+    total = 0
+    last_pk = 0
+    while True:
+        rooms = list(Room.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'amenities')[:chunk_size])
+        if not rooms:
+            break
+        last_pk = rooms[-1][0]
+        names_by_room = {pk: normalize_amenities(values) for pk, values in rooms}
+        ids = amenity_ids({name for names in names_by_room.values() for name in names}, create=True)
+        links = [RoomAmenity(room_id=pk, amenity_id=ids[name]) for pk, names in names_by_room.items() for name in names]
+        RoomAmenity.objects.bulk_create(links, batch_size=chunk_size, ignore_conflicts=True)
+        total += len(links)
+    # Bulk writes skip the model signals that normally drop these regions
+    catalog.invalidate()
+    property_summary.invalidate()
+    return total
+
+
+def filter_rooms_with_all(queryset, names):
+    """
+    Rooms having every amenity in ``names``: one grouped subquery over the
+    amenity index rather than a JSON containment test per amenity.
+    """
+    names = normalize_amenities(names)
+    if not names:
+        return queryset
+    matching = (
+        RoomAmenity.objects.filter(amenity__name__in=names)
+        .values('room_id')
+        .annotate(matched=Count('amenity_id'))
+        .filter(matched=len(names))
+        .values('room_id')
+    )
+    return queryset.filter(pk__in=matching)
+
+
+def amenity_facets(queryset) -> list:
+    """``[{'name', 'count'}]`` for the rooms in ``queryset``, most common first, in one query."""
+    rows = (
+        RoomAmenity.objects.filter(room__in=queryset.values('pk'))
+        .values('amenity__name')
+        .annotate(count=Count('room_id'))
+        .order_by('-count', 'amenity__name')
+    )
+    return [{'name': row['amenity__name'], 'count': row['count']} for row in rows]
@@ -0,0 +1,145 @@
+"""
+Per-worker columnar snapshot of the public room catalog.
+
+Available rooms are loaded once into NumPy columns (price, guests, type and
+location codes, an amenity matrix) alongside each room's pre-rendered JSON.
+Public list filters become vectorised masks and responses are assembled
+from the cached bytes, so serving the catalog touches neither the ORM nor
+DRF serialisation.  A ``CatalogVersion`` row, bumped on every ``Room``,
+``PropertyImage`` or ``Property`` write, tells workers when to rebuild.
+"""
+import time
+import threading
+
+import numpy as np
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from .models import CatalogVersion, Room
+
+CATALOG_KEY = 'rooms'
+
+_lock = threading.Lock()
+_state = {'snapshot': None, 'version': None, 'updated_at': None, 'checked_at': 0.0}
+
+
+def bump_version():
+    """Record a catalog change; every worker rebuilds on its next version check."""
+    if not CatalogVersion.objects.filter(key=CATALOG_KEY).update(version=F('version') + 1, updated_at=timezone.now()):
+        CatalogVersion.objects.get_or_create(key=CATALOG_KEY, defaults={'version': 1})
+    # This worker re-reads the version on its next request
+    _state['checked_at'] = 0.0
+
+
+def current_state() -> tuple:
+    """
+    ``(version, updated_at)`` of the catalog, read from the database (one
+    primary-key lookup) at most once per ``CATALOG_VERSION_CHECK_INTERVAL``
+    seconds per worker.  ``updated_at`` is None until the first change.
+    """
+    interval = getattr(settings, 'CATALOG_VERSION_CHECK_INTERVAL', 1)
+    now = time.monotonic()
+    if _state['version'] is None or now - _state['checked_at'] >= interval:
+        row = CatalogVersion.objects.filter(key=CATALOG_KEY).values_list('version', 'updated_at').first()
+        _state['version'], _state['updated_at'] = row or (0, None)
+        _state['checked_at'] = now
+    return _state['version'], _state['updated_at']
+
+
+def current_version() -> int:
+    return current_state()[0]
+
+
+class CatalogSnapshot:
+    def __init__(self, version: int, rooms: list):
+        from .amenities import normalize_amenities
+        from .serializers import PublicRoomSerializer
+
+        self.version = version
+        rows = PublicRoomSerializer(rooms, many=True).data
+        renderer = JSONRenderer()
+        self.rows_json = [renderer.render(row) for row in rows]
+
+        self.ids = np.array([room.id for room in rooms], dtype=np.int64)
+        self.index_by_id = {room.id: i for i, room in enumerate(rooms)}
+        self.price = np.array([float(room.price) for room in rooms], dtype=np.float64)
+        self.guests = np.array([room.max_guests for room in rooms], dtype=np.int32)
+
+        self.type_names, self.type_codes = self._encode([room.type.lower() for room in rooms])
+        self.locations, self.location_codes = self._encode([room.location.lower() for room in rooms])
+
+        amenity_lists = [normalize_amenities(room.amenities) for room in rooms]
+        self.amenity_names = sorted({name for names in amenity_lists for name in names})
+        column = {name: i for i, name in enumerate(self.amenity_names)}
+        self.amenities = np.zeros((len(rooms), len(self.amenity_names)), dtype=bool)
+        for i, names in enumerate(amenity_lists):
+            self.amenities[i, [column[name] for name in names]] = True
+
+    @staticmethod
+    def _encode(values):
+        names, codes = np.unique(np.array(values, dtype=object), return_inverse=True) if values else ([], [])
+        return list(names), np.asarray(codes, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.rows_json)
+
+    def mask(self, location=None, room_type=None, min_price=None, max_price=None, guests=None, amenities=None):
+        """Boolean row mask for the public list filters (same semantics as the ORM filters)."""
+        mask = np.ones(len(self), dtype=bool)
+        if location:
+            needle = location.lower()
+            matching = [code for code, name in enumerate(self.locations) if needle in name]
+            mask &= np.isin(self.location_codes, matching)
+        if room_type:
+            room_type = room_type.lower()
+            mask &= self.type_codes == (self.type_names.index(room_type) if room_type in self.type_names else -1)
+        if min_price is not None:
+            mask &= self.price >= min_price
+        if max_price is not None:
+            mask &= self.price <= max_price
+        if guests is not None:
+            mask &= self.guests >= guests
+        if amenities:
+            if any(name not in self.amenity_names for name in amenities):
+                return np.zeros(len(self), dtype=bool)
+            columns = [self.amenity_names.index(name) for name in amenities]
+            mask &= self.amenities[:, columns].all(axis=1)
+        return mask
+
+    def list_json(self, mask=None) -> bytes:
+        indexes = range(len(self)) if mask is None else np.flatnonzero(mask)
+        return b'{"success":true,"data":[' + b','.join(self.rows_json[i] for i in indexes) + b']}'
+
+    def detail_json(self, room_id):
+        index = self.index_by_id.get(room_id)
+        if index is None:
+            return None
+        return b'{"success":true,"data":' + self.rows_json[index] + b'}'
+
+
+def get_snapshot() -> CatalogSnapshot:
+    """
+    This worker's snapshot, rebuilt (by one thread) when the catalog version
+    has moved; other threads keep serving the old snapshot meanwhile.
+    """
+    version = current_version()
+    snapshot = _state['snapshot']
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    if snapshot is not None and not _lock.acquire(blocking=False):
+        # Another thread is already rebuilding; serve the previous version
+        # rather than queueing every request behind it.
+        return snapshot
+    if snapshot is None:
+        _lock.acquire()
+    try:
+        snapshot = _state['snapshot']
+        if snapshot is None or snapshot.version != version:
+            rooms = list(Room.objects.filter(available=True).order_by('id'))
+            snapshot = CatalogSnapshot(version, rooms)
+            _state['snapshot'] = snapshot
+    finally:
+        _lock.release()
+    return snapshot
@@ -0,0 +1,141 @@
+"""
+Faceted public room search.
+
+One call returns a page of available rooms plus counts per room type,
+price bucket, guest capacity, property and amenity for the same filters.
+Facets are grouped aggregates (price and guest buckets share a single
+conditional ``aggregate``), and whole responses are cached per normalised
+query in the ``catalog`` cache region, which room changes invalidate.
+"""
+import json
+import hashlib
+from django.db.models import Count, Q
+
+from core.cache import catalog
+
+from .models import Room
+from .amenities import filter_rooms_with_all, normalize_amenities, amenity_facets
+
+SEARCH_CACHE_TIMEOUT = 300
+
+PRICE_BUCKETS = [(0, 100), (100, 200), (200, 300), (300, 500), (500, None)]
+GUEST_THRESHOLDS = [1, 2, 4, 6, 8]
+SORTS = {
+    'price': ('price', 'id'),
+    '-price': ('-price', 'id'),
+    'rating': ('-rating', 'id'),
+    'newest': ('-id',),
+}
+MAX_PAGE_SIZE = 50
+
+
+def _number(value, cast):
+    try:
+        return cast(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_query(params) -> dict:
+    """Parse and canonicalise query params so equivalent searches share a cache entry."""
+    getlist = params.getlist if hasattr(params, 'getlist') else (lambda key: params.get(key) or [])
+    page_size = _number(params.get('page_size'), int) or 20
+    return {
+        'location': (params.get('location') or '').strip().lower(),
+        'property': (params.get('property') or '').strip(),
+        'room_type': (params.get('room_type') or '').strip().lower(),
+        'min_price': _number(params.get('min_price'), float),
+        'max_price': _number(params.get('max_price'), float),
+        'guests': _number(params.get('guests'), int),
+        'amenities': sorted(normalize_amenities(getlist('amenities'))),
+        'sort': params.get('sort') if params.get('sort') in SORTS else 'price',
+        'page': max(_number(params.get('page'), int) or 1, 1),
+        'page_size': min(max(page_size, 1), MAX_PAGE_SIZE),
+    }
+
+
+def filtered_rooms(query: dict):
+    qs = Room.objects.filter(available=True)
+    if query['location']:
+        qs = qs.filter(location__icontains=query['location'])
+    if query['property']:
+        qs = qs.filter(property_ref__name=query['property'])
+    if query['room_type']:
+        qs = qs.filter(type__iexact=query['room_type'])
+    if query['min_price'] is not None:
+        qs = qs.filter(price__gte=query['min_price'])
+    if query['max_price'] is not None:
+        qs = qs.filter(price__lte=query['max_price'])
+    if query['guests'] is not None:
+        qs = qs.filter(max_guests__gte=query['guests'])
+    if query['amenities']:
+        qs = filter_rooms_with_all(qs, query['amenities'])
+    return qs
+
+
+def _bucket_label(low, high):
+    return f'{low}-{high}' if high is not None else f'{low}+'
+
+
+def compute_facets(qs) -> dict:
+    # Total plus every price and guest bucket in one conditional aggregate
+    buckets = {'total': Count('id')}
+    for low, high in PRICE_BUCKETS:
+        condition = Q(price__gte=low) & (Q(price__lt=high) if high is not None else Q())
+        buckets[f'price_{low}'] = Count('id', filter=condition)
+    for threshold in GUEST_THRESHOLDS:
+        buckets[f'guests_{threshold}'] = Count('id', filter=Q(max_guests__gte=threshold))
+    counts = qs.aggregate(**buckets)
+
+    types = qs.values('type').annotate(count=Count('id')).order_by('-count', 'type')
+    properties = (
+        qs.filter(property_ref__isnull=False)
+        .values('property_ref__name').annotate(count=Count('id')).order_by('-count', 'property_ref__name')
+    )
+    return {
+        'total': counts['total'],
+        'facets': {
+            'type': [{'value': row['type'], 'count': row['count']} for row in types],
+            'price': [
+                {'value': _bucket_label(low, high), 'min': low, 'max': high, 'count': counts[f'price_{low}']}
+                for low, high in PRICE_BUCKETS
+            ],
+            'guests': [
+                {'value': f'{threshold}+', 'min': threshold, 'count': counts[f'guests_{threshold}']}
+                for threshold in GUEST_THRESHOLDS
+            ],
+            'location': [{'value': row['property_ref__name'], 'count': row['count']} for row in properties],
+            'amenities': [{'value': row['name'], 'count': row['count']} for row in amenity_facets(qs)],
+        },
+    }
+
+
+def search_rooms(params, serialize) -> dict:
+    """
+    A page of rooms (rendered with ``serialize(queryset)``) plus facet counts,
+    served from the ``catalog`` region when the same normalised query was
+    answered since the catalog last changed.
+    """
+    query = normalize_query(params)
+    digest = hashlib.sha1(json.dumps(query, sort_keys=True).encode()).hexdigest()
+
+    def compute():
+        qs = filtered_rooms(query)
+        summary = compute_facets(qs)
+        total = summary['total']
+        page, page_size = query['page'], query['page_size']
+        offset = (page - 1) * page_size
+        rows = qs.order_by(*SORTS[query['sort']])[offset:offset + page_size] if offset < total else []
+
+        return {
+            'data': serialize(rows),
+            'pagination': {
+                'page': page,
+                'pageSize': page_size,
+                'total': total,
+                'totalPages': (total + page_size - 1) // page_size,
+            },
+            'facets': summary['facets'],
+        }
+
+    return catalog.get_or_set(f'search:{digest}', compute, SEARCH_CACHE_TIMEOUT)
@@ -0,0 +1,123 @@
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rooms.models import PropertyDocument
+
+logger = logging.getLogger(__name__)
+
+# Only the expiry lifecycle is managed here; review states (pending,
+# approved, rejected) and 'renewed' are left alone.
+LIFECYCLE_STATUSES = ('active', 'expiring-soon', 'expired')
+
+
+def advance_document_statuses(today=None) -> dict:
+    """
+    Move documents between active / expiring-soon / expired with set-based
+    UPDATEs.  A document is expiring soon from ``expiry_date - reminder_days``
+    until its expiry date and expired after it.  The window depends on the
+    row's ``reminder_days``, so the range updates run once per distinct value
+    (a handful in practice) rather than once per document.
+
+    Returns the number of rows moved into each status and the documents that
+    have just become expiring-soon.
+    """
+    today = today or timezone.localdate()
+    lifecycle = PropertyDocument.objects.filter(status__in=LIFECYCLE_STATUSES)
+    counts = {'expired': 0, 'expiring-soon': 0, 'active': 0}
+    newly_expiring = []
+
+    with transaction.atomic():
+        counts['expired'] = lifecycle.filter(expiry_date__lt=today).exclude(status='expired').update(status='expired')
+        counts['active'] = lifecycle.filter(expiry_date__isnull=True).exclude(status='active').update(status='active')
+
+        reminder_values = lifecycle.filter(expiry_date__gte=today).values_list('reminder_days', flat=True).distinct()
+        for reminder_days in list(reminder_values):
+            window_end = today + timedelta(days=max(reminder_days, 0))
+            same_reminder = lifecycle.filter(reminder_days=reminder_days)
+
+            expiring = same_reminder.filter(expiry_date__gte=today, expiry_date__lte=window_end).exclude(status='expiring-soon')
+            newly_expiring.extend(expiring.values('id', 'name', 'tenant_id', 'property_id', 'expiry_date'))
+            counts['expiring-soon'] += expiring.update(status='expiring-soon')
+
+            # Expiry pushed back out of the reminder window (e.g. renewed dates)
+            counts['active'] += same_reminder.filter(expiry_date__gt=window_end).exclude(status='active').update(status='active')
+
+    return {'counts': counts, 'newly_expiring': newly_expiring}
+
+
+def notify_expiring(documents) -> int:
+    """One notice per tenant listing their expiring documents, plus one admin summary."""
+    from core.models import Notification
+    from core.notifications import send_notifications, notify_admins
+
+    if not documents:
+        return 0
+
+    by_tenant = defaultdict(list)
+    for doc in documents:
+        if doc['tenant_id']:
+            by_tenant[doc['tenant_id']].append(doc)
+
+    tenant_notices = []
+    for tenant_id, docs in by_tenant.items():
+        if len(docs) == 1:
+            message = f'Your document "{docs[0]["name"]}" expires on {docs[0]["expiry_date"].isoformat()}.'
+        else:
+            names = ', '.join(f'"{doc["name"]}"' for doc in docs[:5])
+            more = f' and {len(docs) - 5} more' if len(docs) > 5 else ''
+            message = f'{len(docs)} of your documents are expiring soon: {names}{more}.'
+        tenant_notices.append(Notification(
+            user_id=tenant_id,
+            title='Document Expiring Soon',
+            message=message,
+            type='document_expiry',
+            link='/tenant/documents',
+        ))
+    sent = send_notifications(tenant_notices)
+
+    properties = {doc['property_id'] for doc in documents}
+    notify_admins(
+        title='Documents Expiring Soon',
+        message=f'{len(documents)} document(s) across {len(properties)} propert{"y" if len(properties) == 1 else "ies"} entered their reminder window.',
+        type='document_expiry',
+        link='/admin/management',
+        defer=False,
+    )
+    return sent
+
+
+class Command(BaseCommand):
+    help = 'Advances PropertyDocument expiry statuses and notifies tenants and admins about newly expiring documents.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Evaluate as of this date (YYYY-MM-DD) instead of today.')
+        parser.add_argument('--no-notify', action='store_true', help='Update statuses without sending notifications.')
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            today = date.fromisoformat(options['date'])
+
+        try:
+            result = advance_document_statuses(today)
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"Status update failed: {str(e)}"))
+            logger.error(f"Document status update failed: {str(e)}")
+            return
+
+        counts = result['counts']
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {counts['expired']}, expiring soon {counts['expiring-soon']}, back to active {counts['active']}."
+        ))
+
+        if options['no_notify']:
+            return
+        try:
+            sent = notify_expiring(result['newly_expiring'])
+            self.stdout.write(self.style.SUCCESS(f"Sent {sent} tenant notifications."))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"Notification failed: {str(e)}"))
+            logger.error(f"Document expiry notifications failed: {str(e)}")
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings_app", "0004_chatchannel_chatmessage_tenancyagreement"),
+        ("rooms", "0013_delete_propertyleveldocument_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="propertydocument",
+            index=models.Index(
+                fields=["status", "expiry_date"], name="propdoc_status_expiry_idx"
+            ),
+        ),
+    ]
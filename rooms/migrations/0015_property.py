@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0014_propertydocument_status_expiry_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Property",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name_plural": "properties",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.AddField(
+            model_name="bookinginterest",
+            name="property_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="interests",
+                to="rooms.property",
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertydocument",
+            name="property_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="documents",
+                to="rooms.property",
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="property_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="images",
+                to="rooms.property",
+            ),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="property_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="rooms",
+                to="rooms.property",
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+from django.db import migrations
+
+# (app_label, model, name column, creates properties) for every table that
+# names a property.  Free-text columns only link to names seen elsewhere.
+PROPERTY_COLUMNS = [
+    ("rooms", "Room", "location", True),
+    ("rooms", "PropertyImage", "property_name", True),
+    ("rooms", "PropertyDocument", "property_id", True),
+    ("bookings_app", "TenantAssignment", "property_name", True),
+    ("rooms", "BookingInterest", "property_name", False),
+    ("bookings_app", "ChatChannel", "property_name", False),
+]
+
+CHUNK_SIZE = 2000
+
+
+def populate_property_refs(apps, schema_editor):
+    Property = apps.get_model("rooms", "Property")
+
+    names = set()
+    for app_label, model_name, column, creates in PROPERTY_COLUMNS:
+        if not creates:
+            continue
+        model = apps.get_model(app_label, model_name)
+        names.update(
+            name.strip()
+            for name in model.objects.values_list(column, flat=True).distinct()
+            if name and name.strip()
+        )
+    Property.objects.bulk_create(
+        [Property(name=name) for name in sorted(names)],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    property_ids = dict(Property.objects.values_list("name", "id"))
+
+    # Walk each table in primary-key windows so no single UPDATE holds
+    # locks on the whole table.
+    for app_label, model_name, column, _ in PROPERTY_COLUMNS:
+        model = apps.get_model(app_label, model_name)
+        pending = model.objects.filter(property_ref__isnull=True)
+        last_pk = 0
+        while True:
+            rows = list(
+                pending.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", column)[:CHUNK_SIZE]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            by_property = {}
+            for pk, name in rows:
+                property_id = property_ids.get((name or "").strip())
+                if property_id:
+                    by_property.setdefault(property_id, []).append(pk)
+            for property_id, pks in by_property.items():
+                model.objects.filter(pk__in=pks).update(property_ref_id=property_id)
+
+
+def clear_property_refs(apps, schema_editor):
+    for app_label, model_name, _, _ in PROPERTY_COLUMNS:
+        apps.get_model(app_label, model_name).objects.update(property_ref=None)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0015_property"),
+        ("bookings_app", "0005_property_ref"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_property_refs, clear_property_refs),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0016_populate_property_refs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Amenity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                "verbose_name_plural": "amenities",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="RoomAmenity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "amenity",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="room_links",
+                        to="rooms.amenity",
+                    ),
+                ),
+                (
+                    "room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="amenity_links",
+                        to="rooms.room",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="amenity_index",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="rooms",
+                through="rooms.RoomAmenity",
+                to="rooms.amenity",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="roomamenity",
+            index=models.Index(
+                fields=["amenity", "room"], name="roomamenity_amenity_room_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="roomamenity",
+            constraint=models.UniqueConstraint(
+                fields=("room", "amenity"), name="unique_room_amenity"
+            ),
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations
+
+CHUNK_SIZE = 1000
+
+
+def _names(values):
+    if not isinstance(values, list):
+        return []
+    names = []
+    for value in values:
+        name = str(value).strip()[:100] if value is not None else ""
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def populate_room_amenities(apps, schema_editor):
+    Room = apps.get_model("rooms", "Room")
+    Amenity = apps.get_model("rooms", "Amenity")
+    RoomAmenity = apps.get_model("rooms", "RoomAmenity")
+
+    last_pk = 0
+    while True:
+        rooms = list(
+            Room.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", "amenities")[:CHUNK_SIZE]
+        )
+        if not rooms:
+            break
+        last_pk = rooms[-1][0]
+
+        names_by_room = {pk: _names(values) for pk, values in rooms}
+        all_names = {name for names in names_by_room.values() for name in names}
+        Amenity.objects.bulk_create(
+            [Amenity(name=name) for name in all_names], ignore_conflicts=True
+        )
+        ids = dict(Amenity.objects.filter(name__in=all_names).values_list("name", "id"))
+        RoomAmenity.objects.bulk_create(
+            [
+                RoomAmenity(room_id=pk, amenity_id=ids[name])
+                for pk, names in names_by_room.items()
+                for name in names
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def clear_room_amenities(apps, schema_editor):
+    apps.get_model("rooms", "RoomAmenity").objects.all().delete()
+    apps.get_model("rooms", "Amenity").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0017_amenity"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_room_amenities, clear_room_amenities),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0018_populate_room_amenities"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogVersion",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=50, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0019_catalogversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="catalogversion",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
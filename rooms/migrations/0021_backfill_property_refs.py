@@ -0,0 +1,21 @@
+from importlib import import_module
+
+from django.db import migrations
+
+# Same pass as 0016 (it only touches rows whose property_ref is still NULL):
+# links rows written since then without the FK, so filters can rely on
+# property_ref alone.
+populate = import_module("rooms.migrations.0016_populate_property_refs")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0020_updated_at"),
+        ("bookings_app", "0006_rentpayment_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate.populate_property_refs, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,79 @@ from django.db import models
 from django.contrib.auth.models import User
 
 
+class Property(models.Model):
+    """
+    A property (building/site).  Rooms, images, documents, assignments, chat
+    channels and interests point at it through ``property_ref``.  The older
+    string columns (``Room.location``, ``*.property_name``,
+    ``PropertyDocument.property_id``) are still written alongside the FK
+    while clients move over; ``rooms.signals`` keeps the two in step.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = 'properties'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def for_name(cls, name, create: bool = True):
+        """The property called ``name`` (created on first use if ``create``); None for blank names."""
+        name = (name or '').strip()
+        if not name:
+            return None
+        prop = cls.objects.filter(name=name).first()
+        if prop is None and create:
+            prop, _ = cls.objects.get_or_create(name=name)
+        return prop
+
+    def rename(self, new_name: str):
+        """Rename the property and rewrite every denormalised name column that points at it."""
+        from django.db import transaction
+        from django.utils import timezone
+        from bookings_app.models import TenantAssignment, ChatChannel, TenancyAgreement
+        from core import cache, search
+        from .catalog import bump_version
+
+        new_name = new_name.strip()
+        old_name = self.name
+        if not new_name or new_name == old_name:
+            return
+        with transaction.atomic():
+            self.name = new_name
+            self.save(update_fields=['name'])
+            now = timezone.now()
+            Room.objects.filter(property_ref=self).update(location=new_name, updated_at=now)
+            PropertyImage.objects.filter(property_ref=self).update(property_name=new_name, updated_at=now)
+            PropertyDocument.objects.filter(property_ref=self).update(property_id=new_name)
+            BookingInterest.objects.filter(property_ref=self).update(property_name=new_name)
+            TenantAssignment.objects.filter(property_ref=self).update(property_name=new_name, updated_at=now)
+            ChatChannel.objects.filter(property_ref=self).update(property_name=new_name)
+            TenancyAgreement.objects.filter(property_name=old_name).update(property_name=new_name)
+
+            # update() sends no post_save, so do what the Room/PropertyImage
+            # and document receivers would have done
+            bump_version()
+            for region in (cache.catalog, cache.property_summary, cache.stats):
+                region.invalidate_on_commit()
+            search.rename_property(self.pk, new_name)
+
+
+class Amenity(models.Model):
+    """Amenity vocabulary; ``RoomAmenity`` is the indexed form of ``Room.amenities``."""
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        verbose_name_plural = 'amenities'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
 class Room(models.Model):
     ROOM_TYPES = (
         ('villa', 'Villa'),
@@ -16,18 +89,39 @@ class Room(models.Model):
     reviews = models.IntegerField(default=0)
     images = models.JSONField(default=list, blank=True)  # list of image URLs
     amenities = models.JSONField(default=list, blank=True)  # list of strings
+    # Normalised copy of ``amenities`` for indexed filtering; synced on save
+    amenity_index = models.ManyToManyField(Amenity, through='RoomAmenity', related_name='rooms', blank=True)
     description = models.TextField(blank=True, default='')
     location = models.CharField(max_length=255)
+    property_ref = models.ForeignKey(Property, on_delete=models.SET_NULL, null=True, blank=True, related_name='rooms')
     max_guests = models.IntegerField()
     bedrooms = models.IntegerField()
     bathrooms = models.IntegerField()
     size = models.IntegerField()  # in square meters
     available = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
 
 
+class RoomAmenity(models.Model):
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='amenity_links')
+    amenity = models.ForeignKey(Amenity, on_delete=models.CASCADE, related_name='room_links')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'amenity'], name='unique_room_amenity'),
+        ]
+        indexes = [
+            # Amenity-first lookups: "rooms having X" and facet counts
+            models.Index(fields=['amenity', 'room'], name='roomamenity_amenity_room_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.room_id}: {self.amenity_id}"
+
+
 class PropertyDocument(models.Model):
     DOCUMENT_TYPES = (
         ('license', 'License'),
@@ -52,6 +146,7 @@ class PropertyDocument(models.Model):
     )
 
     property_id = models.CharField(max_length=255, db_index=True)  # Required consolidated field
+    property_ref = models.ForeignKey(Property, on_delete=models.SET_NULL, null=True, blank=True, related_name='documents')
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='property_documents', null=True, blank=True)
     tenant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='property_documents', null=True, blank=True)
     assignment = models.ForeignKey(
@@ -75,6 +170,9 @@ class PropertyDocument(models.Model):
 
     class Meta:
         ordering = ['-upload_date']
+        indexes = [
+            models.Index(fields=['status', 'expiry_date'], name='propdoc_status_expiry_idx'),
+        ]
 
     def __str__(self):
         return f"{self.property_id} - {self.name} ({self.type})"
@@ -84,11 +182,13 @@ class PropertyDocument(models.Model):
 class PropertyImage(models.Model):
     """Property-level images (not room-level). Identified by property_name which matches Room.location."""
     property_name = models.CharField(max_length=255, db_index=True)
+    property_ref = models.ForeignKey(Property, on_delete=models.SET_NULL, null=True, blank=True, related_name='images')
     image_url = models.TextField()
     caption = models.CharField(max_length=255, blank=True, default='')
     is_primary = models.BooleanField(default=False)
     sort_order = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['sort_order', '-created_at']
@@ -111,6 +211,7 @@ class BookingInterest(models.Model):
     message = models.TextField(blank=True, default='')
     room = models.ForeignKey(Room, null=True, blank=True, on_delete=models.SET_NULL, related_name='interests')
     property_name = models.CharField(max_length=255, blank=True, default='')
+    property_ref = models.ForeignKey(Property, on_delete=models.SET_NULL, null=True, blank=True, related_name='interests')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new')
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -119,3 +220,17 @@ class BookingInterest(models.Model):
 
     def __str__(self):
         return f"Interest from {self.name} - {self.property_name or 'General'}"
+
+
+class CatalogVersion(models.Model):
+    """
+    Monotonic change counter for a cached data set (e.g. the public room
+    catalog).  Writers bump it; per-worker caches compare it with the
+    version they were built from.
+    """
+    key = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
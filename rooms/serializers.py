@@ -50,6 +50,15 @@ class PublicRoomSerializer(serializers.ModelSerializer):
         return data
 
 
+# Large text/JSON columns the document list leaves out unless asked for via
+# ``?include=``; maps the API field name to the model field.
+DOCUMENT_HEAVY_FIELDS = {
+    'notes': 'notes',
+    'adminNotes': 'admin_notes',
+    'metadata': 'metadata',
+}
+
+
 class PropertyDocumentSerializer(serializers.ModelSerializer):
     propertyId = serializers.CharField(source='property_id', required=False, allow_blank=True)
     roomId = serializers.IntegerField(write_only=True, required=False, allow_null=True)
@@ -74,6 +83,14 @@ class PropertyDocumentSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'uploadDate', 'reviewedAt']
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # Fields the view deferred on the queryset; reading them here would
+        # cost one query per row.
+        for name in self.context.get('omit_fields', ()):
+            fields.pop(name, None)
+        return fields
+
     def to_representation(self, instance):
         ret = super().to_representation(instance)
         # Add read-only representation for relations
@@ -121,6 +138,24 @@ class PropertyDocumentSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class PropertyDocumentSummarySerializer(serializers.ModelSerializer):
+    """Compact row for the admin document grid (``?view=summary``)."""
+    propertyId = serializers.CharField(source='property_id')
+    roomId = serializers.IntegerField(source='room_id')
+    tenantId = serializers.IntegerField(source='tenant_id')
+    tenantUsername = serializers.CharField(source='tenant.username', default=None)
+    expiryDate = serializers.DateField(source='expiry_date')
+    uploadDate = serializers.DateField(source='upload_date')
+
+    # Columns loaded for the summary queryset
+    QUERY_FIELDS = ('id', 'property_id', 'room_id', 'tenant', 'tenant__username', 'name', 'type', 'status', 'expiry_date', 'upload_date')
+
+    class Meta:
+        model = PropertyDocument
+        fields = ['id', 'propertyId', 'roomId', 'tenantId', 'tenantUsername', 'name', 'type', 'status', 'expiryDate', 'uploadDate']
+        read_only_fields = fields
+
+
 class PropertyImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = PropertyImage
@@ -0,0 +1,74 @@
+"""
+Dual-write for the ``Property`` transition: whenever a row is saved with a
+property name, point its ``property_ref`` at the matching ``Property``
+(creating it if needed), and link existing rows when a ``Property`` is
+created.  Reads filter on ``property_ref``; the string columns are kept for
+clients that still send or display names.
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from bookings_app.models import TenantAssignment, ChatChannel
+from .models import Property, Room, PropertyImage, PropertyDocument, BookingInterest
+from .amenities import sync_room_amenities
+from .catalog import bump_version
+
+PROPERTY_NAME_FIELDS = {
+    Room: 'location',
+    PropertyImage: 'property_name',
+    PropertyDocument: 'property_id',
+    BookingInterest: 'property_name',
+    TenantAssignment: 'property_name',
+    ChatChannel: 'property_name',
+}
+
+# Free-text names (public interest forms, "General Inquiry" chats) only link
+# to properties that already exist rather than creating new ones.
+LINK_ONLY = {BookingInterest, ChatChannel}
+
+
+def sync_property_ref(sender, instance, update_fields=None, **kwargs):
+    name_field = PROPERTY_NAME_FIELDS[sender]
+    if update_fields is not None and name_field not in update_fields:
+        return
+    instance.property_ref = Property.for_name(getattr(instance, name_field), create=sender not in LINK_ONLY)
+    # save(update_fields=[...]) won't write the FK unless it was listed
+    instance._property_ref_pending = update_fields is not None and 'property_ref' not in update_fields
+
+
+def write_pending_property_ref(sender, instance, **kwargs):
+    if getattr(instance, '_property_ref_pending', False):
+        sender.objects.filter(pk=instance.pk).update(property_ref=instance.property_ref)
+        instance._property_ref_pending = False
+
+
+for model in PROPERTY_NAME_FIELDS:
+    pre_save.connect(sync_property_ref, sender=model, dispatch_uid=f'sync_property_ref_{model.__name__}')
+    post_save.connect(write_pending_property_ref, sender=model, dispatch_uid=f'write_property_ref_{model.__name__}')
+
+
+def link_named_rows(sender, instance, created, **kwargs):
+    # Link-only rows saved before their property existed; reads filter on
+    # property_ref alone.
+    if created:
+        for model, name_field in PROPERTY_NAME_FIELDS.items():
+            model.objects.filter(property_ref__isnull=True, **{name_field: instance.name}).update(property_ref=instance)
+
+
+post_save.connect(link_named_rows, sender=Property, dispatch_uid='link_named_rows')
+
+
+def index_room_amenities(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'amenities' in update_fields:
+        sync_room_amenities(instance)
+
+
+post_save.connect(index_room_amenities, sender=Room, dispatch_uid='index_room_amenities')
+
+
+def room_catalog_changed(sender, **kwargs):
+    bump_version()
+
+
+for model in (Room, PropertyImage, Property):
+    post_save.connect(room_catalog_changed, sender=model, dispatch_uid=f'room_catalog_saved_{model.__name__}')
+    post_delete.connect(room_catalog_changed, sender=model, dispatch_uid=f'room_catalog_deleted_{model.__name__}')
@@ -1,3 +1,56 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import Client
+from .models import Property, PropertyDocument
+
+
+class PropertyDocumentListQueryTests(TestCase):
+    """The document list must not run per-row queries for tenant/uploader."""
+
+    URL = '/api/rooms/documents/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', email='admin@example.com')
+        Client.objects.create(user=cls.admin, role='admin', mobile_no='')
+        cls.property = Property.objects.create(name='Maple House')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def create_documents(self, count):
+        for i in range(count):
+            tenant = User.objects.create_user(username=f'tenant{PropertyDocument.objects.count()}-{i}')
+            PropertyDocument.objects.create(
+                property_id=self.property.name, property_ref=self.property, tenant=tenant,
+                uploaded_by=self.admin, name=f'Lease {i}', file_url=f'https://files.example.com/{i}.pdf',
+                notes='n' * 1000, admin_notes='a' * 1000, metadata={'pages': i},
+            )
+
+    def assertListQueries(self, expected, query=''):
+        # The same number of queries for 2 documents as for 12
+        for count in (2, 10):
+            self.create_documents(count)
+            with self.assertNumQueries(expected):
+                response = self.client.get(self.URL + query, secure=True)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()['data']), PropertyDocument.objects.count())
+        return response.json()['data']
+
+    def test_default_list(self):
+        rows = self.assertListQueries(1)
+        self.assertEqual(rows[0]['uploadedBy'], 'admin')
+        self.assertTrue(rows[0]['tenantUsername'].startswith('tenant'))
+        self.assertNotIn('notes', rows[0])
+
+    def test_summary_view(self):
+        rows = self.assertListQueries(1, '?view=summary')
+        self.assertTrue(rows[0]['tenantUsername'].startswith('tenant'))
+
+    def test_include_heavy_fields(self):
+        rows = self.assertListQueries(1, '?include=notes,adminNotes,metadata')
+        self.assertEqual(len(rows[0]['notes']), 1000)
+        self.assertIn('pages', rows[0]['metadata'])
@@ -3,7 +3,7 @@ from .views import (
     RoomListAPIView, RoomDetailAPIView,
     PropertyDocumentListView, PropertyDocumentDetailView, PropertyDocumentUploadView,
     PropertyImageListView, PropertyImageDetailView,
-    PublicRoomListView, PublicRoomDetailView, PublicPropertyListView, PublicPropertyImagesView,
+    PublicRoomListView, PublicRoomSearchView, PublicRoomDetailView, PublicPropertyListView, PublicPropertyImagesView,
     BookingInterestView,
     AdminBookingInterestListView, AdminBookingInterestDetailView,
 )
@@ -33,6 +33,7 @@ urlpatterns = [
     
     # Public endpoints (no auth)
     path('public/', PublicRoomListView.as_view(), name='public-room-list'),
+    path('public/search/', PublicRoomSearchView.as_view(), name='public-room-search'),
     path('public/<int:id>/', PublicRoomDetailView.as_view(), name='public-room-detail'),
     path('public/properties/', PublicPropertyListView.as_view(), name='public-property-list'),
     path('public/properties/<str:property_name>/images/', PublicPropertyImagesView.as_view(), name='public-property-images'),
@@ -4,18 +4,32 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
-from .models import Room, PropertyDocument, PropertyImage, BookingInterest
+from .models import Property, Room, RoomAmenity, PropertyDocument, PropertyImage, BookingInterest
+from .amenities import filter_rooms_with_all, normalize_amenities
 from .serializers import (
     RoomSerializer, PublicRoomSerializer,
-    PropertyDocumentSerializer,
+    PropertyDocumentSerializer, PropertyDocumentSummarySerializer, DOCUMENT_HEAVY_FIELDS,
     PropertyImageSerializer,
     BookingInterestSerializer, BookingInterestCreateSerializer,
 )
-from django.db.models import Q
+from django.db.models import Q, Count, Min, Max, Prefetch, Subquery
 from .permissions import IsAdmin, IsTenant, IsAdminOrTenant
 from django.utils import timezone
 from django.conf import settings
-from core.storage_backends import supabase_storage
+from django.http import HttpResponse, Http404
+from core.storage_backends import storage
+from core.conditional import conditional, make_etag
+from core.cache import property_summary
+
+
+def filter_by_property(queryset, name):
+    """
+    Rows linked to the property called ``name`` (none if it doesn't exist).
+    The name is resolved in a scalar subquery, so the outer query filters on
+    the indexed ``property_ref_id`` without a separate round trip.
+    """
+    property_id = Property.objects.filter(name=(name or '').strip()).order_by().values('pk')[:1]
+    return queryset.filter(property_ref_id=Subquery(property_id))
 
 
 # ─── Admin Room Views (existing) ──────────────────────────────────────────────
@@ -56,11 +70,7 @@ class RoomListAPIView(generics.ListCreateAPIView):
         if room_type:
             queryset = queryset.filter(type__iexact=room_type)
         if amenities:
-            for amenity in amenities:
-                try:
-                    queryset = queryset.filter(amenities__contains=[amenity])
-                except Exception:
-                    pass
+            queryset = filter_rooms_with_all(queryset, amenities)
         return queryset
 
     def list(self, request, *args, **kwargs):
@@ -120,24 +130,31 @@ class RoomDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
 
         new_images = serializer.validated_data.get('images', old_images)
         removed_images = set(old_images) - set(new_images)
-        for url in removed_images:
-            supabase_storage.delete_file_from_url(url, 'images')
 
         self.perform_update(serializer)
+        for url in removed_images:
+            storage.queue_delete_from_url(url, 'images')
         return Response({'success': True, 'data': serializer.data})
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        if instance.images:
-            for url in instance.images:
-                supabase_storage.delete_file_from_url(url, 'images')
+        images = instance.images or []
         self.perform_destroy(instance)
+        for url in images:
+            storage.queue_delete_from_url(url, 'images')
         return Response({'success': True, 'message': 'Room deleted successfully'})
 
 
 # ─── Public Room/Property Views ───────────────────────────────────────────────
 
 
+def catalog_validators(view, request, *args, **kwargs):
+    """ETag/Last-Modified for anything derived from rooms, property images and properties."""
+    from .catalog import current_state
+    version, updated_at = current_state()
+    return make_etag('catalog', version, request.get_full_path()), updated_at
+
+
 class PublicRoomListView(generics.ListAPIView):
     """Public: browse available rooms. No auth required."""
     serializer_class = PublicRoomSerializer
@@ -152,11 +169,14 @@ class PublicRoomListView(generics.ListAPIView):
         min_price = params.get('min_price')
         max_price = params.get('max_price')
         guests = params.get('guests')
+        amenities = params.getlist('amenities') if hasattr(params, 'getlist') else []
 
         if location:
             queryset = queryset.filter(location__icontains=location)
         if room_type:
             queryset = queryset.filter(type__iexact=room_type)
+        if amenities:
+            queryset = filter_rooms_with_all(queryset, amenities)
         if min_price:
             try:
                 queryset = queryset.filter(price__gte=float(min_price))
@@ -174,10 +194,50 @@ class PublicRoomListView(generics.ListAPIView):
                 pass
         return queryset
 
+    @conditional(catalog_validators, cache_control='public, no-cache')
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({'success': True, 'data': serializer.data})
+        # Served from the per-worker catalog snapshot; get_queryset() keeps
+        # the equivalent ORM filters for schema generation and reuse.
+        from .catalog import get_snapshot, current_version
+        params = request.query_params
+
+        def number(key, cast):
+            try:
+                return cast(params.get(key)) if params.get(key) else None
+            except (TypeError, ValueError):
+                return None
+
+        snapshot = get_snapshot()
+        mask = snapshot.mask(
+            location=params.get('location'),
+            room_type=params.get('room_type'),
+            min_price=number('min_price', float),
+            max_price=number('max_price', float),
+            guests=number('guests', int),
+            amenities=normalize_amenities(params.getlist('amenities')),
+        )
+        response = HttpResponse(snapshot.list_json(mask), content_type='application/json')
+        response.stale = snapshot.version != current_version()
+        return response
+
+
+class PublicRoomSearchView(APIView):
+    """
+    Public: faceted room search.  Accepts the same filters as the public room
+    list plus ``property``, ``amenities`` (repeatable), ``sort``, ``page`` and
+    ``page_size``; returns one page of rooms with counts per type, price
+    bucket, guest capacity, property and amenity.  No auth required.
+    """
+    permission_classes = []
+    authentication_classes = []
+
+    def get(self, request):
+        from .facets import search_rooms
+        result = search_rooms(
+            request.query_params,
+            serialize=lambda rows: list(PublicRoomSerializer(rows, many=True).data),
+        )
+        return Response({'success': True, **result})
 
 
 class PublicRoomDetailView(generics.RetrieveAPIView):
@@ -188,10 +248,79 @@ class PublicRoomDetailView(generics.RetrieveAPIView):
     queryset = Room.objects.filter(available=True)
     lookup_field = 'id'
 
+    @conditional(catalog_validators, cache_control='public, no-cache')
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response({'success': True, 'data': serializer.data})
+        from .catalog import get_snapshot, current_version
+        snapshot = get_snapshot()
+        body = snapshot.detail_json(self.kwargs[self.lookup_field])
+        if body is None:
+            raise Http404
+        response = HttpResponse(body, content_type='application/json')
+        response.stale = snapshot.version != current_version()
+        return response
+
+
+def property_summaries() -> list:
+    """Landing-page cards: one per property with available rooms."""
+    # Properties with at least one available room, aggregated in the
+    # database; rooms and images come from two prefetch queries.
+    available = Q(rooms__available=True)
+    props = (
+        Property.objects
+        .annotate(
+            room_count=Count('rooms', filter=available),
+            min_price=Min('rooms__price', filter=available),
+            max_price=Max('rooms__price', filter=available),
+        )
+        .filter(room_count__gt=0)
+        .prefetch_related(
+            Prefetch('rooms', queryset=Room.objects.filter(available=True).order_by('pk').only(
+                'id', 'property_ref', 'type', 'images',
+            ), to_attr='available_rooms'),
+            Prefetch('images', queryset=PropertyImage.objects.only(
+                'id', 'property_ref', 'image_url', 'is_primary', 'sort_order', 'created_at',
+            ), to_attr='image_list'),
+        )
+    )
+    # Distinct amenities per property from the amenity index, one query
+    amenities_by_property = {}
+    for row in (
+        RoomAmenity.objects.filter(room__available=True, room__property_ref__isnull=False)
+        .values_list('room__property_ref', 'amenity__name').distinct()
+    ):
+        amenities_by_property.setdefault(row[0], set()).add(row[1])
+
+    properties = []
+
+    for prop in props:
+        loc_rooms = prop.available_rooms
+        images = prop.image_list
+
+        # Get primary image or first image
+        primary_image = next((img for img in images if img.is_primary), None)
+        image_url = primary_image.image_url if primary_image else (
+            images[0].image_url if images else None
+        )
+        # Also collect first room image as fallback
+        if not image_url and loc_rooms:
+            first_room = loc_rooms[0]
+            if first_room.images:
+                image_url = first_room.images[0] if isinstance(first_room.images, list) else None
+
+        all_amenities = amenities_by_property.get(prop.id, set())
+
+        properties.append({
+            'name': prop.name,
+            'roomCount': prop.room_count,
+            'minPrice': float(prop.min_price or 0),
+            'maxPrice': float(prop.max_price or 0),
+            'imageUrl': image_url,
+            'allImages': [img.image_url for img in images[:6]],
+            'amenities': sorted(list(all_amenities))[:10],
+            'roomTypes': sorted({r.type for r in loc_rooms}),
+        })
+
+    return properties
 
 
 class PublicPropertyListView(APIView):
@@ -199,45 +328,12 @@ class PublicPropertyListView(APIView):
     permission_classes = []
     authentication_classes = []
 
+    @conditional(catalog_validators, cache_control='public, no-cache')
     def get(self, request):
-        # Get all unique property locations that have available rooms
-        rooms = Room.objects.filter(available=True).values('location').distinct()
-        properties = []
-
-        for loc_entry in rooms:
-            location = loc_entry['location']
-            loc_rooms = Room.objects.filter(location=location, available=True)
-            images = PropertyImage.objects.filter(property_name=location)
-
-            # Get primary image or first image
-            primary_image = images.filter(is_primary=True).first()
-            image_url = primary_image.image_url if primary_image else (
-                images.first().image_url if images.exists() else None
-            )
-            # Also collect first room image as fallback
-            if not image_url and loc_rooms.exists():
-                first_room = loc_rooms.first()
-                if first_room.images:
-                    image_url = first_room.images[0] if isinstance(first_room.images, list) else None
-
-            # Collect all unique amenities across rooms
-            all_amenities = set()
-            for r in loc_rooms:
-                if isinstance(r.amenities, list):
-                    all_amenities.update(r.amenities)
-
-            properties.append({
-                'name': location,
-                'roomCount': loc_rooms.count(),
-                'minPrice': float(loc_rooms.order_by('price').first().price) if loc_rooms.exists() else 0,
-                'maxPrice': float(loc_rooms.order_by('-price').first().price) if loc_rooms.exists() else 0,
-                'imageUrl': image_url,
-                'allImages': [img.image_url for img in images[:6]],
-                'amenities': sorted(list(all_amenities))[:10],
-                'roomTypes': sorted(list(set(loc_rooms.values_list('type', flat=True)))),
-            })
-
-        return Response({'success': True, 'data': properties})
+        properties, fresh = property_summary.fetch('list', property_summaries)
+        response = Response({'success': True, 'data': properties})
+        response.stale = not fresh
+        return response
 
 
 class PublicPropertyImagesView(APIView):
@@ -245,8 +341,9 @@ class PublicPropertyImagesView(APIView):
     permission_classes = []
     authentication_classes = []
 
+    @conditional(catalog_validators, cache_control='public, no-cache')
     def get(self, request, property_name):
-        images = PropertyImage.objects.filter(property_name=property_name)
+        images = filter_by_property(PropertyImage.objects.all(), property_name)
         serializer = PropertyImageSerializer(images, many=True)
         return Response({'success': True, 'data': serializer.data})
 
@@ -263,18 +360,13 @@ class BookingInterestView(APIView):
 
             # Send notification to admins
             try:
-                from core.models import Notification
-                from django.contrib.auth.models import User
-                from accounts.models import Client
-                admin_users = User.objects.filter(client__role='admin')
-                for admin_user in admin_users:
-                    Notification.objects.create(
-                        user=admin_user,
-                        title='New Booking Interest',
-                        message=f'{interest.name} ({interest.email}) is interested in {interest.property_name or "a property"}.',
-                        type='general',
-                        link='/admin/management?tab=interests',
-                    )
+                from core.notifications import notify_admins
+                notify_admins(
+                    title='New Booking Interest',
+                    message=f'{interest.name} ({interest.email}) is interested in {interest.property_name or "a property"}.',
+                    type='general',
+                    link='/admin/management?tab=interests',
+                )
             except Exception:
                 pass  # Don't fail if notification creation fails
 
@@ -317,7 +409,7 @@ class PropertyDocumentListView(generics.ListCreateAPIView):
             is_tenant_level = self.request.query_params.get('is_tenant_level') == 'true'
 
             if property_id:
-                qs = qs.filter(property_id=property_id)
+                qs = filter_by_property(qs, property_id)
             if room_id:
                 qs = qs.filter(room_id=room_id)
             if tenant_id:
@@ -341,7 +433,21 @@ class PropertyDocumentListView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+
+        if request.query_params.get('view') == 'summary':
+            queryset = queryset.select_related('tenant').only(*PropertyDocumentSummarySerializer.QUERY_FIELDS)
+            serializer = PropertyDocumentSummarySerializer(queryset, many=True)
+            return Response({'success': True, 'data': serializer.data})
+
+        # Join the users the serializer reads, and leave the large text/JSON
+        # columns out unless ``?include=notes,adminNotes,metadata`` asks for them.
+        include = {name.strip() for name in request.query_params.get('include', '').split(',') if name.strip()}
+        omit = [name for name in DOCUMENT_HEAVY_FIELDS if name not in include]
+        queryset = queryset.select_related('tenant', 'uploaded_by')
+        if omit:
+            queryset = queryset.defer(*(DOCUMENT_HEAVY_FIELDS[name] for name in omit))
+
+        serializer = self.get_serializer(queryset, many=True, context={**self.get_serializer_context(), 'omit_fields': omit})
         return Response({'success': True, 'data': serializer.data})
 
     def create(self, request, *args, **kwargs):
@@ -371,17 +477,13 @@ class PropertyDocumentListView(generics.ListCreateAPIView):
 
                 # Send notification to admins
                 try:
-                    from core.models import Notification
-                    from django.contrib.auth.models import User
-                    admin_users = User.objects.filter(client__role='admin')
-                    for admin_user in admin_users:
-                        Notification.objects.create(
-                            user=admin_user,
-                            title='New Document Uploaded',
-                            message=f'Tenant {user.username} uploaded a new document: "{doc.name}".',
-                            type='general',
-                            link='/admin/management',
-                        )
+                    from core.notifications import notify_admins
+                    notify_admins(
+                        title='New Document Uploaded',
+                        message=f'Tenant {user.username} uploaded a new document: "{doc.name}".',
+                        type='general',
+                        link='/admin/management',
+                    )
                 except Exception:
                     pass
             else:
@@ -462,10 +564,10 @@ class PropertyDocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
                     instance.save(update_fields=['reviewed_at'])
 
                     try:
-                        from core.models import Notification
+                        from core.notifications import notify_users
                         status_text = 'approved' if new_status == 'approved' else 'rejected'
-                        Notification.objects.create(
-                           user=instance.tenant,
+                        notify_users(
+                           [instance.tenant_id],
                            title=f'Document {status_text.title()}',
                            message=f'Your document "{instance.name}" has been {status_text}.' + (
                                f' Notes: {instance.admin_notes}' if instance.admin_notes else ''
@@ -481,10 +583,11 @@ class PropertyDocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        if instance.file_url:
-            bucket = getattr(settings, 'SUPABASE_DOCUMENTS_BUCKET', 'documents')
-            supabase_storage.delete_file_from_url(instance.file_url, bucket)
+        file_url = instance.file_url
         instance.delete()
+        if file_url:
+            bucket = getattr(settings, 'SUPABASE_DOCUMENTS_BUCKET', 'documents')
+            storage.queue_delete_from_url(file_url, bucket)
         return Response({'success': True, 'message': 'Document deleted'})
 
 
@@ -500,7 +603,7 @@ class PropertyDocumentUploadView(APIView):
         bucket = getattr(settings, 'SUPABASE_DOCUMENTS_BUCKET', 'documents')
 
         try:
-            url = supabase_storage.upload_document(file, bucket_name=bucket, folder='documents')
+            url = storage.upload_document(file, bucket_name=bucket, folder='documents')
             return Response({'success': True, 'data': {'url': url}})
         except Exception as exc:
             return Response({'success': False, 'error': str(exc)}, status=500)
@@ -516,7 +619,7 @@ class PropertyImageListView(generics.ListCreateAPIView):
         property_name = self.request.query_params.get('property_name')
         qs = PropertyImage.objects.all()
         if property_name:
-            qs = qs.filter(property_name=property_name)
+            qs = filter_by_property(qs, property_name)
         return qs
 
     def list(self, request, *args, **kwargs):
@@ -549,9 +652,10 @@ class PropertyImageDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        if instance.image_url:
-            supabase_storage.delete_file_from_url(instance.image_url, 'images')
+        image_url = instance.image_url
         instance.delete()
+        if image_url:
+            storage.queue_delete_from_url(image_url, 'images')
         return Response({'success': True, 'message': 'Property image deleted'})
 
 
@@ -568,7 +672,7 @@ class AdminBookingInterestListView(APIView):
         property_name = request.query_params.get('propertyName')
         qs = BookingInterest.objects.all().order_by('-created_at')
         if property_name:
-            qs = qs.filter(property_name=property_name)
+            qs = filter_by_property(qs, property_name)
         serializer = BookingInterestSerializer(qs, many=True)
         return Response({'success': True, 'data': serializer.data})
 